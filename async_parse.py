@@ -0,0 +1,204 @@
+"""Background Markdown parsing with main-thread widget construction.
+
+``BackgroundParser`` moves mistune parsing off the Kivy main thread. Texts
+are parsed on a thread pool (or, with ``use_processes=True``, a process
+pool that avoids the GIL) and the results are put into the shared parse
+cache. Once a text is parsed, the callbacks waiting on it are run on the
+main thread through Clock, a few per frame within a time budget, so they
+only have to build widgets: the ``MarkdownLabel`` they create finds its
+tokens in the cache.
+
+Before the first label has parsed, workers use ``parse_cache``'s guess of
+the label configuration (``create_parser()``); a label parsing differently
+is reported by ``parse_cache``. Worker processes can only parse with that
+guess, so once labels are known to parse differently, texts are parsed on
+the thread pool with the labels' own parsers instead.
+
+``MarkdownSlot`` reserves an estimated height for a label until its text has
+been parsed and the label is built.
+"""
+
+import math
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+
+import parse_cache
+from markdown_blocks import DEFAULT_FRAME_BUDGET
+
+# Rough metrics used to size placeholders before a label exists
+ESTIMATED_LINE_HEIGHT = 24
+ESTIMATED_CHAR_WIDTH = 8
+ESTIMATED_WIDTH = 1380
+
+
+def estimate_markdown_height(text, width=ESTIMATED_WIDTH):
+    """Estimate the rendered height of ``text`` from its wrapped line count.
+
+    Args:
+        text: Markdown source
+        width: Available width in pixels
+
+    Returns:
+        Estimated height in pixels
+    """
+    chars_per_line = max(int(width // ESTIMATED_CHAR_WIDTH), 1)
+    lines = sum(max(1, math.ceil(len(line) / chars_per_line)) for line in text.splitlines())
+    return max(lines, 1) * ESTIMATED_LINE_HEIGHT
+
+
+def _parse_tokens(text):
+    """Parse ``text`` in a worker process and return the token list."""
+    return parse_cache.create_parser()(text)
+
+
+class MarkdownSlot(BoxLayout):
+    """Placeholder that reserves space for a label until it is built."""
+
+    def __init__(self, estimated_height, **kwargs):
+        """Create an empty slot.
+
+        Args:
+            estimated_height: Height reserved until the label arrives
+        """
+        kwargs.setdefault('orientation', 'vertical')
+        super().__init__(size_hint_y=None, height=estimated_height, **kwargs)
+        self.content = None
+
+    def fill(self, widget):
+        """Show ``widget`` in the slot and follow its height."""
+        self.content = widget
+        self.add_widget(widget)
+        self.height = widget.height
+        widget.bind(height=self.setter('height'))
+
+
+class BackgroundParser:
+    """Parse Markdown on a worker pool and run callbacks on the main thread."""
+
+    def __init__(self, max_workers=None, use_processes=False, frame_budget=DEFAULT_FRAME_BUDGET):
+        """Start the worker pool.
+
+        Parsed tokens reach the labels only through the shared parse cache,
+        so it is installed here; without it every label would parse its text
+        again on the main thread and the background parse would be wasted.
+
+        Args:
+            max_workers: Pool size (executor default when None)
+            use_processes: Parse in worker processes instead of threads
+            frame_budget: Seconds of main-thread callbacks run per frame
+        """
+        parse_cache.install()
+        self.use_processes = use_processes
+        self.frame_budget = frame_budget
+        if use_processes:
+            self._executor = ProcessPoolExecutor(max_workers=max_workers)
+            # Tokens from workers are keyed with the configuration they were parsed with
+            self._process_parser = parse_cache.guessed_parser()
+            self._thread_executor = None
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="markdown-parse")
+            self._thread_executor = self._executor
+        self.max_workers = max_workers
+        self._futures = {}
+        self._ready = deque()
+        self._drain_trigger = Clock.create_trigger(self._drain)
+
+    def submit(self, text):
+        """Start parsing ``text`` unless it is already being parsed.
+
+        Args:
+            text: Markdown source
+
+        Returns:
+            Future that completes once the tokens are in the parse cache
+        """
+        key = parse_cache.text_digest(text)
+        future = self._futures.get(key)
+        if future is None:
+            if self._processes_match():
+                future = self._executor.submit(_parse_tokens, text)
+            else:
+                future = self._threads().submit(parse_cache.warm, text)
+            self._futures[key] = future
+        return future
+
+    def _processes_match(self):
+        """True if worker processes parse like the labels (as far as known)."""
+        if not self.use_processes:
+            return False
+        known = parse_cache.label_signatures()
+        return not known or parse_cache.parser_signature(self._process_parser) in known
+
+    def _threads(self):
+        """Return the thread pool, created on first use in process mode."""
+        if self._thread_executor is None:
+            self._thread_executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="markdown-parse"
+            )
+        return self._thread_executor
+
+    def when_parsed(self, text, callback):
+        """Run ``callback()`` on the main thread once ``text`` is parsed.
+
+        The callback also runs if parsing failed; the label then parses the
+        text itself.
+        """
+        future = self.submit(text)
+
+        def on_done(done):
+            """Queue the finished parse for ``_drain`` on the main thread."""
+            # Runs on a worker (or the submitting) thread; only queue work here.
+            # schedule_once is safe to call from other threads.
+            self._ready.append((text, done, callback))
+            Clock.schedule_once(self._drain, 0)
+
+        future.add_done_callback(on_done)
+
+    def slot(self, text, factory):
+        """Return a placeholder that is filled with ``factory()`` after parsing.
+
+        Args:
+            text: Markdown source the widget will display
+            factory: Callable building the widget on the main thread
+
+        Returns:
+            MarkdownSlot sized from an estimate of the text's height
+        """
+        slot = MarkdownSlot(estimate_markdown_height(text))
+        self.when_parsed(text, lambda: slot.fill(factory()))
+        return slot
+
+    def _drain(self, *args):
+        """Run ready callbacks until the frame budget is spent."""
+        deadline = time.perf_counter() + self.frame_budget
+        while self._ready:
+            text, future, callback = self._ready.popleft()
+            self._futures.pop(parse_cache.text_digest(text), None)
+            if future.cancelled():
+                continue
+            exc = future.exception()
+            if exc is not None:
+                print(f"Background parse failed, parsing on main thread: {exc}")
+            elif future.result() is not None and self._processes_match():
+                # Process results are token lists; thread parses (None) are already cached
+                parse_cache.store(text, future.result(), md=self._process_parser)
+            callback()
+            if time.perf_counter() >= deadline:
+                break
+        if self._ready:
+            self._drain_trigger()
+
+    def shutdown(self):
+        """Stop the worker pool, dropping texts that have not started parsing."""
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9
+        for future in self._futures.values():
+            future.cancel()
+        self._futures.clear()
+        self._executor.shutdown(wait=False)
+        if self._thread_executor not in (None, self._executor):
+            self._thread_executor.shutdown(wait=False)
+        self._ready.clear()
@@ -0,0 +1,244 @@
+"""Headless benchmark for MarkdownDemoApp build and first frames.
+
+Usage (after activating the venv):
+    python3 bench.py --doc-size 200000 --variations 4 --frames 60 -o bench.json
+
+Options:
+  --doc-size: bytes of Markdown shown in the full sample section; the
+      contents of sample_markdown.md are repeated to reach this size
+      (0 keeps the file as is). Accepts units such as 10KB or 50MB
+  --mix: generate the document from these block-type weights (see
+      stress.py) instead of repeating sample_markdown.md
+  --variations: number of copies of every property section
+  --frames: number of frames timed after the first frame
+  --output/-o: JSON output path ("-" prints to stdout)
+
+The app runs with a hidden window. Set ``KIVY_WINDOW`` and
+``KIVY_GL_BACKEND`` (e.g. ``KIVY_GL_BACKEND=mock``) to pick another window
+provider on machines without a display. The report contains the time spent
+in ``build()``, per-section construction times, frame times, widget counts,
+peak RSS (where the ``resource`` module exists, i.e. not on Windows) and the
+versions of kivy, mistune and markdownlabel. The first frame is timed when
+the window first flips its buffers, so it includes the first draw; the
+following frames are timed per Clock tick (Kivy only flips after a redraw).
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+from contextlib import contextmanager
+from importlib import metadata
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Prevent Kivy from consuming custom CLI args and logging to the console.
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from kivy.config import Config
+
+# Keep the benchmark window off screen (must be set before Window import).
+Config.set("graphics", "window_state", "hidden")
+
+from kivy.clock import Clock  # noqa: E402  (must follow Config)
+from kivy.core.window import Window  # noqa: E402
+
+from main import MarkdownDemoApp  # noqa: E402
+from stress import generate_markdown, parse_mix, parse_size  # noqa: E402
+
+SAMPLE_PATH = Path(__file__).with_name("sample_markdown.md")
+
+
+def parse_args(argv=None):
+    """Parse benchmark command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--doc-size", type=parse_size, default=0, help="Bytes of Markdown in the full sample section")
+    parser.add_argument("--mix", type=parse_mix, help="Block-type weights of a generated document")
+    parser.add_argument("--variations", type=int, default=1, help="Copies of every property section")
+    parser.add_argument("--frames", type=int, default=60, help="Frames timed after the first frame")
+    parser.add_argument("--output", "-o", default="-", help="JSON output path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def make_document(size, mix=None):
+    """Return a document of at least ``size`` bytes.
+
+    Args:
+        size: Target size in bytes; 0 returns sample_markdown.md unchanged
+        mix: If given, generate the document from these block-type weights
+            instead of repeating sample_markdown.md
+    """
+    sample = SAMPLE_PATH.read_text(encoding="utf-8")
+    if size <= 0:
+        return sample
+    if mix is not None:
+        return generate_markdown(size, mix=mix)
+    copies = -(-size // len(sample.encode("utf-8")))
+    return "\n\n".join([sample] * copies)
+
+
+def package_version(name):
+    """Return the installed version of ``name`` or None."""
+    try:
+        return metadata.version(name)
+    except metadata.PackageNotFoundError:
+        return None
+
+
+def peak_rss_bytes():
+    """Return the peak resident set size of this process in bytes, or None if unknown."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def count_widgets(root):
+    """Return (total widgets, MarkdownLabel widgets) in the tree under ``root``."""
+    from kivy_garden.markdownlabel import MarkdownLabel
+
+    total = 0
+    labels = 0
+    for widget in root.walk(restrict=True):
+        total += 1
+        if isinstance(widget, MarkdownLabel):
+            labels += 1
+    return total, labels
+
+
+class BenchmarkApp(MarkdownDemoApp):
+    """MarkdownDemoApp that records build, section and frame timings."""
+
+    def __init__(self, frames=60, **kwargs):
+        """Create the app.
+
+        Args:
+            frames: Frames timed after the first frame before the app stops
+            **kwargs: Options passed to MarkdownDemoApp
+        """
+        super().__init__(**kwargs)
+        self.frames_to_time = frames
+        self.results = {"sections": [], "frame_times": []}
+        self._run_started = None
+        self._last_frame = None
+        self.add_section_hook(self._time_section)
+
+    @contextmanager
+    def _time_section(self, title):
+        """Section hook recording how long building section ``title`` took."""
+        started = time.perf_counter()
+        yield
+        self.results["sections"].append({"title": title, "seconds": time.perf_counter() - started})
+
+    def run(self):
+        """Run the app, remembering when it started for the first-frame time."""
+        self._run_started = time.perf_counter()
+        super().run()
+
+    def build(self):
+        """Build the demo and record how long ``build()`` took."""
+        started = time.perf_counter()
+        root = super().build()
+        self.results["build_seconds"] = time.perf_counter() - started
+        return root
+
+    def on_start(self):
+        """Wait for the first drawn frame once the app is running."""
+        super().on_start()
+        Window.bind(on_flip=self._time_first_frame)
+
+    def _time_first_frame(self, *args):
+        """Record the first frame's time and start timing the following frames."""
+        Window.unbind(on_flip=self._time_first_frame)
+        self._last_frame = time.perf_counter()
+        self.results["first_frame_seconds"] = self._last_frame - self._run_started
+        Clock.schedule_interval(self._on_frame, 0)
+
+    def _on_frame(self, dt):
+        """Record the time of a frame; stop after ``frames_to_time`` frames.
+
+        Args:
+            dt: Time since the previous Clock tick (unused)
+
+        Returns:
+            False once enough frames are timed, which unschedules the callback
+        """
+        now = time.perf_counter()
+        self.results["frame_times"].append(now - self._last_frame)
+        self._last_frame = now
+
+        if len(self.results["frame_times"]) >= self.frames_to_time:
+            self.stop()
+            return False
+
+
+def run_benchmark(doc_size=0, variations=1, frames=60, mix=None):
+    """Run the demo headlessly and return the benchmark report.
+
+    Args:
+        doc_size: Bytes of Markdown in the full sample section
+        mix: Block-type weights of a generated document (None repeats
+            sample_markdown.md)
+        variations: Copies of every property section
+        frames: Frames timed after the first frame
+
+    Returns:
+        Dict of timings, counts and environment details
+    """
+    document = make_document(doc_size, mix)
+    app = BenchmarkApp(frames=frames, section_copies=variations, sample_text=document)
+    app.run()
+
+    results = app.results
+    frame_times = sorted(results["frame_times"])
+    total_widgets, markdown_labels = count_widgets(app.root)
+    return {
+        "parameters": {
+            "doc_size": doc_size,
+            "mix": mix,
+            "document_bytes": len(document.encode("utf-8")),
+            "variations": variations,
+            "frames": frames,
+        },
+        "build_seconds": results.get("build_seconds"),
+        "sections": results["sections"],
+        "first_frame_seconds": results.get("first_frame_seconds"),
+        "frames": {
+            "count": len(frame_times),
+            "mean_seconds": sum(frame_times) / len(frame_times) if frame_times else None,
+            "p50_seconds": frame_times[len(frame_times) // 2] if frame_times else None,
+            "max_seconds": frame_times[-1] if frame_times else None,
+            "times": results["frame_times"],
+        },
+        "widgets": {"total": total_widgets, "markdown_labels": markdown_labels},
+        "peak_rss_bytes": peak_rss_bytes(),
+        "versions": {
+            "python": platform.python_version(),
+            "kivy": package_version("kivy"),
+            "mistune": package_version("mistune"),
+            "markdownlabel": package_version("kivy_garden.markdownlabel"),
+        },
+    }
+
+
+def main(argv=None):
+    """Run the benchmark with command-line options and write its report."""
+    args = parse_args(argv)
+    report = run_benchmark(doc_size=args.doc_size, variations=args.variations, frames=args.frames, mix=args.mix)
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
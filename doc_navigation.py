@@ -0,0 +1,273 @@
+"""In-place navigation between linked local Markdown files.
+
+Clicking a relative link to a ``.md`` file opens it in the document section
+instead of only printing it. ``DocumentNavigator`` keeps the back and
+forward history and a ``DocumentCache``: an LRU of opened documents holding
+their text, file modification time and the widget they were rendered into,
+so going back to a visited document reattaches its widget instead of
+reading, parsing and laying it out again. Entries whose file changed on disk
+are dropped on the next lookup.
+
+Whenever a document is shown, the local Markdown files it links to are read
+and parsed on a worker thread (into the shared parse cache) and added to the
+cache, so following one of those links only builds widgets. The parsed texts
+are the ones the document's labels will render (``render_texts``), e.g. the
+chunks of a block-split document rather than the whole file.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+from kivy.clock import Clock
+
+import parse_cache
+
+DEFAULT_CACHE_SIZE = 16
+MARKDOWN_SUFFIXES = (".md", ".markdown")
+
+_INLINE_LINK_RE = re.compile(r"\]\(\s*<?([^)\s>]+)>?")
+_REF_DEF_LINK_RE = re.compile(r"^ {0,3}\[[^\]\n]+\]:[ \t]*<?([^\s>]+)>?", re.MULTILINE)
+
+
+def resolve_link(ref, base_path):
+    """Return the local Markdown file a link points to.
+
+    Args:
+        ref: Link target as clicked (e.g. "guide/setup.md#install")
+        base_path: File containing the link; relative targets start at its directory
+
+    Returns:
+        Resolved Path, or None for URLs, anchors and non-Markdown targets
+    """
+    parts = urlsplit(ref)
+    if parts.scheme or parts.netloc:
+        return None
+    path = unquote(parts.path)
+    if not path.lower().endswith(MARKDOWN_SUFFIXES):
+        return None
+    return (Path(base_path).parent / path).resolve()
+
+
+def local_links(text, base_path):
+    """Return the existing local Markdown files linked from ``text``, in order.
+
+    Args:
+        text: Markdown source
+        base_path: File ``text`` was read from
+    """
+    targets = _INLINE_LINK_RE.findall(text) + _REF_DEF_LINK_RE.findall(text)
+    paths = (resolve_link(target, base_path) for target in targets)
+    return list(dict.fromkeys(path for path in paths if path is not None and path.is_file()))
+
+
+def file_mtime(path):
+    """Return the modification time of ``path``, or None if it cannot be read."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class CachedDocument:
+    """Text of an opened document and the widget it is rendered in."""
+
+    def __init__(self, path, text, mtime):
+        """Create an entry not rendered yet.
+
+        Args:
+            path: Resolved file path
+            text: Document text
+            mtime: File modification time in ns, or None if not read from disk
+        """
+        self.path = path
+        self.text = text
+        self.mtime = mtime
+        self.widget = None
+
+
+class DocumentCache:
+    """LRU of documents keyed by resolved path."""
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE, on_evict=None):
+        """Create an empty cache.
+
+        Args:
+            maxsize: Documents kept before the least recently used is dropped
+            on_evict: Optional callable receiving every dropped CachedDocument
+        """
+        self.maxsize = maxsize
+        self.on_evict = on_evict
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """Return the number of cached documents."""
+        return len(self._entries)
+
+    def __contains__(self, path):
+        """Return True if a document is cached at ``path`` (without checking its mtime)."""
+        return path in self._entries
+
+    def documents(self):
+        """Return the cached documents, least recently used first."""
+        return list(self._entries.values())
+
+    def get(self, path):
+        """Return the cached document at ``path``, or None if missing or changed on disk."""
+        entry = self._entries.get(path)
+        if entry is not None and entry.mtime is not None and file_mtime(path) != entry.mtime:
+            self._drop(path)
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(path)
+        self.hits += 1
+        return entry
+
+    def put(self, path, text, mtime=None):
+        """Store ``text`` as the document at ``path`` and return its entry."""
+        if path in self._entries:
+            self._drop(path)
+        entry = CachedDocument(path, text, mtime)
+        self._entries[path] = entry
+        while len(self._entries) > self.maxsize:
+            self._drop(next(iter(self._entries)))
+        return entry
+
+    def _drop(self, path):
+        """Remove the entry at ``path`` and report it to ``on_evict``."""
+        entry = self._entries.pop(path)
+        if self.on_evict is not None:
+            self.on_evict(entry)
+
+    def stats(self):
+        """Return counters of hits, misses and cached documents."""
+        return {"hits": self.hits, "misses": self.misses, "documents": len(self._entries)}
+
+
+class DocumentNavigator:
+    """Back/forward history over cached documents with link prefetching."""
+
+    def __init__(self, start_path, start_text, maxsize=DEFAULT_CACHE_SIZE, on_evict=None,
+                 render_texts=None):
+        """Start at an already loaded document.
+
+        Args:
+            start_path: File shown first
+            start_text: Its text (may differ from the file, e.g. generated content)
+            maxsize: Documents kept in the cache
+            on_evict: Optional callable receiving every dropped CachedDocument
+            render_texts: Optional callable returning the texts a document is
+                rendered as (parsed when prefetching); the whole text by default
+        """
+        self.cache = DocumentCache(maxsize, on_evict=on_evict)
+        self.render_texts = render_texts
+        self.current = Path(start_path).resolve()
+        self.cache.put(self.current, start_text)
+        self.back_stack = []
+        self.forward_stack = []
+        self.prefetched = 0
+        self._executor = None
+        # Path -> Future of the prefetches that have not been cached yet
+        self._prefetching = {}
+
+    def document(self, path=None):
+        """Return the CachedDocument at ``path`` (the current one by default), reading it if needed."""
+        path = self.current if path is None else Path(path).resolve()
+        entry = self.cache.get(path)
+        if entry is None:
+            mtime = file_mtime(path)
+            entry = self.cache.put(path, path.read_text(encoding="utf-8"), mtime)
+        return entry
+
+    def open(self, path):
+        """Make ``path`` the current document and record it in the history.
+
+        Returns:
+            The CachedDocument of ``path``
+
+        Raises:
+            OSError: If the file cannot be read
+        """
+        path = Path(path).resolve()
+        entry = self.document(path)
+        if path != self.current:
+            self.back_stack.append(self.current)
+            self.forward_stack.clear()
+            self.current = path
+        return entry
+
+    def back(self):
+        """Go to the previous document; return its CachedDocument or None."""
+        return self._step(self.back_stack, self.forward_stack)
+
+    def forward(self):
+        """Go to the next document after going back; return it or None."""
+        return self._step(self.forward_stack, self.back_stack)
+
+    def _step(self, source, target):
+        """Move from the top of ``source`` to the current document, recording it on ``target``.
+
+        Entries that can no longer be read are skipped.
+        """
+        while source:
+            path = source.pop()
+            try:
+                entry = self.document(path)
+            except OSError as exc:
+                print(f"Skipping {path} in history: {exc}")
+                continue
+            target.append(self.current)
+            self.current = path
+            return entry
+        return None
+
+    def prefetch_links(self, entry):
+        """Read and parse the local files linked from ``entry`` in the background.
+
+        At most half the cache is filled this way, so prefetching never
+        evicts the document that is being shown.
+        """
+        for path in local_links(entry.text, entry.path)[:max(self.cache.maxsize // 2, 1)]:
+            if path in self.cache or path in self._prefetching:
+                continue
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="doc-prefetch")
+            future = self._prefetching[path] = self._executor.submit(self._read_and_parse, path)
+            future.add_done_callback(lambda done, path=path: Clock.schedule_once(
+                lambda dt: self._prefetched(path, done), 0
+            ))
+
+    def _read_and_parse(self, path):
+        """Read ``path`` and put its tokens into the parse cache (runs on a worker)."""
+        mtime = file_mtime(path)
+        text = path.read_text(encoding="utf-8")
+        if parse_cache.is_installed():
+            for render_text in (self.render_texts(text) if self.render_texts else [text]):
+                parse_cache.warm(render_text)
+        return text, mtime
+
+    def _prefetched(self, path, future):
+        """Cache a prefetched document on the main thread."""
+        self._prefetching.pop(path, None)
+        if future.cancelled() or future.exception() is not None:
+            return
+        if path not in self.cache:
+            text, mtime = future.result()
+            self.cache.put(path, text, mtime)
+            self.prefetched += 1
+
+    def shutdown(self):
+        """Stop prefetching."""
+        # Executor.shutdown(cancel_futures=True) needs Python 3.9
+        for future in self._prefetching.values():
+            future.cancel()
+        self._prefetching.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
@@ -0,0 +1,196 @@
+"""Font preloading and glyph warm-up before the fonts are first used.
+
+The first label that uses a font pays for reading the font file, opening it
+at each size and rasterizing its glyphs. ``FontWarmup`` moves that cost off
+the frames that show content:
+
+1. a worker thread reads every font file of the configured families
+   (regular, bold, italic and bold italic where the family has them), so
+   the file contents are in the OS cache before a label opens them;
+2. once a family's files are read, the main thread renders the document's
+   characters with it, one ``CoreLabel`` per face, size and chunk of
+   characters, a few per frame within a time budget. This opens the fonts
+   at the sizes the demo uses and fills the text provider's glyph caches.
+
+Rendering stays on the main thread because it creates textures.
+
+Kivy has no public API listing the files of a registered font family, so
+``registered_fonts`` reads ``LabelBase._fonts`` (family -> regular, italic,
+bold and bold italic files, filled by ``LabelBase.register``). If a Kivy
+version drops that attribute, families are resolved like plain file names.
+"""
+
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from kivy import kivy_data_dir
+from kivy.clock import Clock
+from kivy.core.text import Label as CoreLabel, LabelBase
+from kivy.resources import resource_find
+
+from markdown_blocks import DEFAULT_FRAME_BUDGET
+
+# (bold, italic) combinations rendered for every family
+FACES = ((False, False), (True, False), (False, True), (True, True))
+# Family used for `inline code` and code blocks
+MONOSPACE_FONT = "RobotoMono-Regular"
+# Characters prerendered with every face in addition to the document's
+BASE_GLYPHS = "".join(chr(code) for code in range(0x20, 0x7F))
+CHUNK_CHARS = 200
+
+
+def registered_fonts():
+    """Return Kivy's registered font families (private ``LabelBase._fonts``)."""
+    return getattr(LabelBase, "_fonts", {})
+
+
+def font_files(font_name):
+    """Return the files behind a font name (every registered face of it).
+
+    Args:
+        font_name: Registered family (e.g. "Roboto") or font file name
+
+    Returns:
+        List of existing file paths, empty if the font cannot be found
+    """
+    registered = registered_fonts().get(font_name)
+    if registered:
+        return [path for path in dict.fromkeys(registered) if os.path.isfile(path)]
+    for candidate in (font_name, f"{font_name}.ttf"):
+        path = resource_find(candidate)
+        if path:
+            return [path]
+        # Kivy's bundled fonts (e.g. DejaVuSans) live in data/fonts
+        path = os.path.join(kivy_data_dir, "fonts", candidate)
+        if os.path.isfile(path):
+            return [path]
+    return []
+
+
+def render_font_name(font_name):
+    """Return the font name to render ``font_name``'s glyphs with.
+
+    Registered families keep their name, so bold and italic pick the
+    matching face; other fonts are rendered from their resolved file, which
+    is also what Kivy's font caches are keyed by.
+    """
+    if font_name in registered_fonts():
+        return font_name
+    files = font_files(font_name)
+    return files[0] if files else None
+
+
+def document_glyphs(*texts):
+    """Return the printable characters used by ``texts`` plus ASCII, sorted."""
+    glyphs = set(BASE_GLYPHS)
+    for text in texts:
+        glyphs.update(text)
+    return "".join(sorted(char for char in glyphs if char.isprintable()))
+
+
+class FontWarmup:
+    """Read font files in the background and prerender glyphs per frame."""
+
+    def __init__(self, font_names, font_sizes, text="", frame_budget=DEFAULT_FRAME_BUDGET, on_complete=None):
+        """Describe the fonts to warm up.
+
+        Args:
+            font_names: Font families or files used by the app
+            font_sizes: Font sizes in pixels the fonts are opened at
+            text: Document text whose characters are prerendered
+            frame_budget: Seconds of main-thread rendering per frame
+            on_complete: Called on the main thread once every font is warm
+        """
+        self.font_names = list(dict.fromkeys(font_names))
+        self.font_sizes = sorted(set(font_sizes))
+        self.glyphs = document_glyphs(text)
+        self.frame_budget = frame_budget
+        self.on_complete = on_complete
+        self.bytes_read = 0
+        self.renders = 0
+        self.seconds = 0.0
+        self._pending_fonts = set()
+        self._jobs = deque()
+        self._executor = None
+        self._completed = False
+        self._render_trigger = Clock.create_trigger(self._render_slice)
+
+    @property
+    def done(self):
+        """True once every font has been read and prerendered."""
+        return self._executor is not None and not self._pending_fonts and not self._jobs
+
+    def start(self):
+        """Start reading the font files on a worker thread."""
+        if self._executor is not None:
+            return
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="font-warmup")
+        for font_name in self.font_names:
+            self._pending_fonts.add(font_name)
+            future = self._executor.submit(self._read_files, font_name)
+            future.add_done_callback(lambda done, name=font_name: Clock.schedule_once(
+                lambda dt: self._font_loaded(name, done), 0
+            ))
+        self._executor.shutdown(wait=False)
+
+    def _read_files(self, font_name):
+        """Read a family's font files (runs on the worker thread)."""
+        total = 0
+        for path in font_files(font_name):
+            total += len(Path(path).read_bytes())
+        return total
+
+    def _font_loaded(self, font_name, future):
+        """Queue the prerender jobs of a family whose files are read."""
+        self._pending_fonts.discard(font_name)
+        if not future.cancelled() and future.exception() is None:
+            self.bytes_read += future.result()
+            render_name = render_font_name(font_name)
+            if render_name is not None:
+                chunks = [self.glyphs[i:i + CHUNK_CHARS] for i in range(0, len(self.glyphs), CHUNK_CHARS)]
+                for size in self.font_sizes:
+                    for bold, italic in FACES:
+                        for chunk in chunks:
+                            self._jobs.append((render_name, size, bold, italic, chunk))
+        self._render_trigger()
+
+    def _render_slice(self, *args):
+        """Prerender queued glyph chunks until the frame budget is spent."""
+        started = time.perf_counter()
+        deadline = started + self.frame_budget
+        while self._jobs:
+            font_name, size, bold, italic, chunk = self._jobs.popleft()
+            label = CoreLabel(text=chunk, font_name=font_name, font_size=size, bold=bold, italic=italic)
+            try:
+                label.refresh()
+            except Exception as exc:
+                # A font that cannot be rendered here fails the same way in a label later
+                print(f"Font warm-up skipped {font_name}: {exc}")
+                self._drop_jobs(font_name)
+                continue
+            self.renders += 1
+            if time.perf_counter() >= deadline:
+                break
+        self.seconds += time.perf_counter() - started
+        if self._jobs:
+            self._render_trigger()
+        elif not self._pending_fonts and not self._completed:
+            self._completed = True
+            if self.on_complete is not None:
+                self.on_complete(self)
+
+    def _drop_jobs(self, font_name):
+        """Remove the queued jobs of ``font_name``."""
+        self._jobs = deque(job for job in self._jobs if job[0] != font_name)
+
+    def stats(self):
+        """Return counters of bytes read, glyph renders and main-thread time."""
+        return {
+            "fonts": len(self.font_names),
+            "bytes_read": self.bytes_read,
+            "renders": self.renders,
+            "main_thread_seconds": self.seconds,
+        }
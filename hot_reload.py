@@ -0,0 +1,81 @@
+"""Polling file watcher used by the demo's --watch mode.
+
+``FileWatcher`` checks a file's modification time and size on a Clock
+interval and calls back with the new contents when either changes. Polling
+keeps the demo free of extra dependencies and works the same on every
+platform Kivy runs on; at the default interval the cost is one ``stat`` call
+every half second.
+
+The callback is expected to hand the text to
+``BlockMarkdownView.update_text``, which re-renders only the blocks that
+changed.
+"""
+
+from pathlib import Path
+
+from kivy.clock import Clock
+
+DEFAULT_INTERVAL = 0.5
+
+
+class FileWatcher:
+    """Call back with a file's new text whenever it changes on disk."""
+
+    def __init__(self, path, callback, interval=DEFAULT_INTERVAL):
+        """Create a stopped watcher.
+
+        Args:
+            path: File to watch
+            callback: Called as ``callback(text)`` after each change
+            interval: Seconds between checks
+        """
+        self.path = Path(path)
+        self.callback = callback
+        self.interval = interval
+        self._signature = None
+        self._event = None
+
+    def _read_signature(self):
+        """Return (mtime_ns, size) of the file, or None if it is missing."""
+        try:
+            stat = self.path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def start(self):
+        """Remember the current file state and start polling."""
+        self._signature = self._read_signature()
+        if self._event is None:
+            self._event = Clock.schedule_interval(self._poll, self.interval)
+
+    def stop(self):
+        """Stop polling."""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+
+    def _poll(self, dt):
+        """Clock callback checking the file once per interval."""
+        # Clock unschedules interval callbacks that return False, so don't
+        # pass check()'s result through
+        self.check()
+
+    def check(self):
+        """Compare the file state with the last check and report changes.
+
+        Returns:
+            True if the file changed and the callback was called
+        """
+        signature = self._read_signature()
+        if signature is None or signature == self._signature:
+            return False
+        try:
+            text = self.path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError) as exc:
+            # Editors may leave the file briefly unreadable mid-save; retry next poll
+            print(f"Error reloading {self.path.name}: {exc}")
+            return False
+        self._signature = signature
+        self.callback(text)
+        return True
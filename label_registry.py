@@ -0,0 +1,141 @@
+"""Index of the MarkdownLabels shown by the demo.
+
+``LabelRegistry`` records every MarkdownLabel the app puts into the section
+tree together with the title of its section and the properties of its
+variation. Lookups by section title and by property values intersect small
+index sets, so "every label of section X" or "every label with
+``halign='center'``" costs O(k) for k results instead of a walk over the
+whole widget tree.
+
+The app registers labels when it creates (or re-acquires from the widget
+pool) them and unregisters the labels of every subtree that leaves the tree
+(released virtualized sections, rebuilds, replaced document blocks, cached
+documents that are navigated away from). Only that subtree is walked.
+"""
+
+from collections import defaultdict
+
+
+def _hashable(value):
+    """Return ``value`` usable as a dict key (lists become tuples)."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_hashable(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _hashable(item)) for key, item in value.items()))
+    return value
+
+
+class LabelRegistry:
+    """MarkdownLabels indexed by section title and variation properties."""
+
+    def __init__(self, is_label):
+        """Create an empty registry.
+
+        Args:
+            is_label: Predicate telling whether a widget is a MarkdownLabel,
+                used when whole subtrees are (un)registered
+        """
+        self.is_label = is_label
+        # label -> (section title, {property: hashable value})
+        self._entries = {}
+        # Dicts rather than sets keep the labels in registration order
+        self._by_section = defaultdict(dict)
+        self._by_property = defaultdict(dict)
+
+    def __len__(self):
+        """Return the number of registered labels."""
+        return len(self._entries)
+
+    def __contains__(self, label):
+        """Return True if ``label`` is registered."""
+        return label in self._entries
+
+    def __iter__(self):
+        """Iterate over a snapshot of the registered labels, in registration order."""
+        return iter(list(self._entries))
+
+    def register(self, label, section, properties=None):
+        """Record ``label`` as shown in ``section`` with ``properties``.
+
+        Registering a label again (e.g. after it was recycled into another
+        section) replaces its previous entry.
+
+        Args:
+            label: MarkdownLabel widget
+            section: Title of the section showing the label
+            properties: Variation properties the label was created with
+        """
+        if label in self._entries:
+            self.unregister(label)
+        keys = {name: _hashable(value) for name, value in (properties or {}).items()}
+        self._entries[label] = (section, keys)
+        self._by_section[section][label] = None
+        for name, value in keys.items():
+            self._by_property[(name, value)][label] = None
+
+    def unregister(self, label):
+        """Forget ``label``; unknown labels are ignored."""
+        entry = self._entries.pop(label, None)
+        if entry is None:
+            return
+        section, keys = entry
+        self._discard(self._by_section, section, label)
+        for name, value in keys.items():
+            self._discard(self._by_property, (name, value), label)
+
+    def register_tree(self, widget, section):
+        """Register every MarkdownLabel under ``widget`` in ``section``.
+
+        Labels that are already registered keep their entry.
+        """
+        for child in widget.walk(restrict=True):
+            if child not in self._entries and self.is_label(child):
+                self.register(child, section)
+
+    def unregister_tree(self, widget):
+        """Forget every registered label under ``widget`` (which left the tree)."""
+        if not self._entries:
+            return
+        for child in widget.walk(restrict=True):
+            if child in self._entries:
+                self.unregister(child)
+
+    def labels(self, section=None, **properties):
+        """Return the registered labels matching every given criterion.
+
+        Args:
+            section: Only labels of the section with this title
+            **properties: Only labels created with these property values
+
+        Returns:
+            List of labels in registration order
+        """
+        candidates = []
+        if section is not None:
+            candidates.append(self._by_section.get(section, {}))
+        for name, value in properties.items():
+            candidates.append(self._by_property.get((name, _hashable(value)), {}))
+        if not candidates:
+            return list(self._entries)
+        candidates.sort(key=len)
+        smallest, others = candidates[0], candidates[1:]
+        return [label for label in smallest if all(label in other for other in others)]
+
+    def section_of(self, label):
+        """Return the section title ``label`` was registered in, or None."""
+        entry = self._entries.get(label)
+        return entry[0] if entry is not None else None
+
+    def sections(self):
+        """Return the titles of the sections with registered labels."""
+        return list(self._by_section)
+
+    @staticmethod
+    def _discard(index, key, label):
+        """Remove ``label`` from ``index[key]``, dropping the key once it is empty."""
+        labels = index.get(key)
+        if labels is None:
+            return
+        labels.pop(label, None)
+        if not labels:
+            del index[key]
@@ -0,0 +1,158 @@
+"""Per-frame coalescing of height and background-rectangle updates.
+
+Every level of the demo (labels, variations, sections, the main layout)
+binds ``minimum_height`` to ``setter('height')``, and the padding section's
+backgrounds update on both ``pos`` and ``size``. A single resize therefore
+sets heights and moves rectangles many times within one frame, once per
+intermediate value.
+
+``LayoutCoordinator`` replaces those bindings with dirty flags. Changes only
+mark the widget, and a Clock trigger scheduled before the next frame
+resolves the marked widgets: heights are applied deepest first, so widgets
+marked together are handled in one flush, and background rectangles are
+moved once, after the heights are settled.
+
+A parent's ``minimum_height`` only follows its children's new heights once
+its own layout trigger has run, so a change climbs the tree one level every
+one or two before-frame iterations: each flush that leaves widgets marked
+triggers itself again. Kivy repeats before-frame triggers up to
+``Clock.max_iteration`` times per frame (10 by default), which covers the
+demo's nesting (label, variation, section, main layout); deeper cascades
+finish over the following frames.
+
+Widgets that leave the tree for good are dropped with ``forget`` (or
+``forget_tree`` for a detached subtree), which removes the bindings and the
+coordinator's references to them.
+"""
+
+from kivy.clock import Clock
+
+
+def widget_depth(widget):
+    """Return the number of ancestors of ``widget``."""
+    depth = 0
+    parent = widget.parent
+    # The Window is its own parent
+    while parent is not None and parent is not widget:
+        depth += 1
+        widget, parent = parent, parent.parent
+    return depth
+
+
+class LayoutCoordinator:
+    """Collect height and rectangle invalidations and apply them once per frame."""
+
+    def __init__(self, on_rect_update=None):
+        """Create a coordinator tracking no widgets.
+
+        Args:
+            on_rect_update: Optional callable receiving every widget whose
+                background rectangle a flush moved
+        """
+        self.on_rect_update = on_rect_update
+        # dicts keep insertion order and drop duplicate marks within a frame
+        self._dirty_heights = {}
+        self._dirty_rects = {}
+        self._heights = {}
+        self._backgrounds = {}
+        self.passes = 0
+        self.height_updates = 0
+        self.rect_updates = 0
+        # timeout -1 runs the flush before the next frame is drawn
+        self._trigger = Clock.create_trigger(self.flush, -1)
+
+    def track_height(self, widget):
+        """Keep ``widget.height`` equal to its ``minimum_height``.
+
+        Args:
+            widget: Layout or label with a ``minimum_height`` property
+        """
+        self._heights[widget] = None
+        widget.fbind('minimum_height', self._on_minimum_height)
+        self._on_minimum_height(widget, widget.minimum_height)
+
+    def track_background(self, widget, rect):
+        """Keep ``rect`` covering ``widget``.
+
+        Args:
+            widget: Widget the rectangle belongs to
+            rect: Canvas Rectangle drawn behind the widget
+        """
+        self._backgrounds[widget] = rect
+        widget.fbind('pos', self._on_geometry)
+        widget.fbind('size', self._on_geometry)
+        self._on_geometry(widget)
+
+    def forget(self, widget):
+        """Stop tracking ``widget``; untracked widgets are ignored."""
+        if self._heights.pop(widget, False) is None:
+            widget.funbind('minimum_height', self._on_minimum_height)
+            self._dirty_heights.pop(widget, None)
+        if self._backgrounds.pop(widget, None) is not None:
+            widget.funbind('pos', self._on_geometry)
+            widget.funbind('size', self._on_geometry)
+            self._dirty_rects.pop(widget, None)
+
+    def forget_tree(self, widget, keep=None):
+        """Stop tracking the widgets of a subtree that left the tree.
+
+        Args:
+            widget: Root of the detached subtree
+            keep: Optional predicate for widgets that stay tracked (e.g.
+                pooled widgets that will be shown again)
+        """
+        if not self._heights and not self._backgrounds:
+            return
+        for child in list(widget.walk(restrict=True)):
+            if keep is None or not keep(child):
+                self.forget(child)
+
+    def _on_minimum_height(self, widget, value):
+        """Mark ``widget``'s height for the next flush."""
+        self._dirty_heights[widget] = None
+        self._trigger()
+
+    def _on_geometry(self, widget, *args):
+        """Mark ``widget``'s background rectangle for the next flush."""
+        self._dirty_rects[widget] = None
+        self._trigger()
+
+    def flush(self, *args):
+        """Apply the pending height updates, then the rectangle updates.
+
+        Rectangles are only moved by a flush that leaves no height pending;
+        otherwise the flush triggers itself again for the next before-frame
+        iteration (see the module docstring).
+        """
+        self.passes += 1
+        dirty = list(self._dirty_heights)
+        self._dirty_heights.clear()
+        for widget in sorted(dirty, key=widget_depth, reverse=True):
+            if widget.height != widget.minimum_height:
+                widget.height = widget.minimum_height
+                self.height_updates += 1
+
+        # Heights set above re-trigger the parents' layouts, which mark the
+        # parents once their minimum_height changes; those are handled by a
+        # later before-frame flush. Rectangles wait until the heights are settled.
+        if self._dirty_heights:
+            self._trigger()
+            return
+
+        dirty = list(self._dirty_rects)
+        self._dirty_rects.clear()
+        for widget in dirty:
+            rect = self._backgrounds[widget]
+            rect.pos = widget.pos
+            rect.size = widget.size
+            self.rect_updates += 1
+            if self.on_rect_update is not None:
+                self.on_rect_update(widget)
+
+    def stats(self):
+        """Return counters of flush passes and applied updates."""
+        return {
+            "passes": self.passes,
+            "height_updates": self.height_updates,
+            "rect_updates": self.rect_updates,
+        }
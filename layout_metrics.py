@@ -0,0 +1,192 @@
+"""Counters for property dispatches, layout passes and canvas updates.
+
+``LayoutMetrics`` shows how many events a single change sets off, grouped by
+the demo section the widget belongs to (the nearest ancestor with a
+``section_title``). It counts:
+
+- property dispatches of the properties involved in the demo's binding
+  chains (``minimum_height``, ``height``, ``pos``, ``size``, ``text_size``)
+- layout recomputations, by wrapping ``do_layout`` of the layout classes
+- canvas updates: Label texture changes, plus background rectangle moves
+  that the app reports through ``count`` (including the ones applied by the
+  layout coordinator with ``--coalesce-layout``)
+
+Counts are collected per frame; ``report()`` summarizes the totals, the
+number of frames with activity and the busiest frame per section since the
+previous report, and ``start_reporting`` prints or appends that report as
+JSON lines on an interval. The biggest numbers point at binding storms.
+"""
+
+import json
+import time
+import weakref
+from collections import Counter, defaultdict
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.gridlayout import GridLayout
+from kivy.uix.stacklayout import StackLayout
+
+COUNTED_PROPERTIES = ('minimum_height', 'height', 'pos', 'size', 'text_size')
+LAYOUT_CLASSES = (BoxLayout, GridLayout, StackLayout)
+UNSECTIONED = "(unsectioned)"
+
+_active_metrics = None
+_original_layouts = {}
+
+
+def section_of(widget):
+    """Return the ``section_title`` of the nearest section containing ``widget``."""
+    node = widget
+    while node is not None:
+        title = getattr(node, 'section_title', None)
+        if title is not None:
+            return title
+        parent = node.parent
+        if parent is node:
+            break
+        node = parent
+    return UNSECTIONED
+
+
+def _wrap_layout(cls):
+    """Return a do_layout replacement for ``cls`` that counts passes."""
+    original = cls.__dict__['do_layout']
+
+    def do_layout(self, *args):
+        """Count the pass for the layout's section, then lay out as ``cls`` does."""
+        if _active_metrics is not None:
+            _active_metrics.count(self, 'layout_passes')
+        return original(self, *args)
+
+    do_layout.__doc__ = original.__doc__
+    return original, do_layout
+
+
+class LayoutMetrics:
+    """Per-frame event counters grouped by section title."""
+
+    def __init__(self):
+        """Create counters that are not installed yet."""
+        # Section title -> counts of the current frame
+        self._frame = defaultdict(Counter)
+        self._totals = defaultdict(Counter)
+        self._frames_active = Counter()
+        self._max_frame = defaultdict(Counter)
+        self._watched = weakref.WeakSet()
+        self._frame_event = None
+        self._report_event = None
+        self._report_started = time.perf_counter()
+
+    def install(self):
+        """Start counting layout passes and closing frames.
+
+        Layouts only count passes if they are created after this call, since
+        each layout binds its own ``do_layout`` when it is constructed.
+        """
+        global _active_metrics
+        _active_metrics = self
+        for cls in LAYOUT_CLASSES:
+            if cls not in _original_layouts:
+                original, wrapped = _wrap_layout(cls)
+                _original_layouts[cls] = original
+                cls.do_layout = wrapped
+        if self._frame_event is None:
+            self._frame_event = Clock.schedule_interval(self.end_frame, 0)
+
+    def uninstall(self):
+        """Stop counting and restore the layout classes."""
+        global _active_metrics
+        if _active_metrics is self:
+            _active_metrics = None
+        for cls, original in _original_layouts.items():
+            cls.do_layout = original
+        _original_layouts.clear()
+        for event in (self._frame_event, self._report_event):
+            if event is not None:
+                event.cancel()
+        self._frame_event = None
+        self._report_event = None
+
+    def watch(self, widget):
+        """Count property dispatches and texture updates of ``widget``."""
+        if widget in self._watched:
+            return
+        self._watched.add(widget)
+        for name in COUNTED_PROPERTIES:
+            if widget.property(name, quiet=True) is not None:
+                widget.fbind(name, self._on_property, name)
+        if widget.property('texture', quiet=True) is not None:
+            widget.fbind('texture', self._on_property, 'canvas_updates')
+
+    def watch_tree(self, root):
+        """Watch ``root`` and every widget below it (already watched ones are skipped)."""
+        for widget in root.walk(restrict=True):
+            self.watch(widget)
+
+    def _on_property(self, name, instance, value):
+        """Count a dispatch of property (or counter) ``name`` of ``instance``."""
+        self.count(instance, name)
+
+    def count(self, widget, name, amount=1):
+        """Add ``amount`` to counter ``name`` of ``widget``'s section for this frame."""
+        self._frame[section_of(widget)][name] += amount
+
+    def end_frame(self, *args):
+        """Fold this frame's counts into the totals (scheduled every frame by ``install``)."""
+        for section, counts in self._frame.items():
+            self._totals[section].update(counts)
+            self._frames_active[section] += 1
+            busiest = self._max_frame[section]
+            for name, value in counts.items():
+                if value > busiest[name]:
+                    busiest[name] = value
+        self._frame.clear()
+
+    def report(self, reset=True):
+        """Summarize counts since the previous report.
+
+        Args:
+            reset: Start a new reporting period afterwards
+
+        Returns:
+            Dict with the period length and, per section, totals, the number of
+            frames with activity and the highest count seen in one frame
+        """
+        now = time.perf_counter()
+        sections = {}
+        for section in sorted(self._totals, key=lambda name: -sum(self._totals[name].values())):
+            sections[section] = {
+                "totals": dict(self._totals[section]),
+                "frames_active": self._frames_active[section],
+                "max_per_frame": dict(self._max_frame[section]),
+            }
+        result = {"seconds": now - self._report_started, "sections": sections}
+        if reset:
+            self._totals.clear()
+            self._frames_active.clear()
+            self._max_frame.clear()
+            self._report_started = now
+        return result
+
+    def start_reporting(self, interval, root=None, path=None):
+        """Emit a report every ``interval`` seconds.
+
+        Args:
+            interval: Seconds between reports
+            root: If given, newly added widgets under it are watched before
+                each report
+            path: Append reports as JSON lines to this file instead of printing
+        """
+        def emit(dt):
+            """Watch new widgets, then print or append the report."""
+            if root is not None:
+                self.watch_tree(root)
+            line = json.dumps(self.report())
+            if path is None:
+                print(f"Layout metrics: {line}")
+            else:
+                with open(path, "a", encoding="utf-8") as handle:
+                    handle.write(line + "\n")
+
+        self._report_event = Clock.schedule_interval(emit, interval)
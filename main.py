@@ -6,8 +6,29 @@ A demonstration application that showcases the MarkdownLabel widget
 and its Label-compatible properties from the kivy_garden.markdownlabel flower.
 """
 
+import time
+
+# Reference point for the startup profile's milestones
+PROCESS_STARTED = time.perf_counter()
+
+import argparse
+import os
+import sys
+from contextlib import ExitStack, contextmanager
+from functools import partial
 from pathlib import Path
 
+# Time every following import when started with --profile-startup
+# (must be installed before any Kivy import).
+IMPORT_PROFILER = None
+if __name__ == '__main__' and "--profile-startup" in sys.argv[1:]:
+    from startup_profile import ImportProfiler
+    IMPORT_PROFILER = ImportProfiler()
+    IMPORT_PROFILER.install()
+
+# Keep Kivy from consuming the demo's CLI args (must be set before any Kivy import).
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+
 from kivy.config import Config
 
 # Request window size before importing Window to ensure the provider uses it.
@@ -15,12 +36,36 @@ Config.set("graphics", "width", "1400")
 Config.set("graphics", "height", "900")
 
 from kivy.app import App
+from kivy.clock import Clock
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
 from kivy.uix.label import Label
 from kivy.core.window import Window
 from kivy.graphics import Color, Rectangle
-from kivy_garden.markdownlabel import MarkdownLabel
+from kivy.metrics import sp
+
+import parse_cache
+from doc_navigation import DocumentNavigator, resolve_link
+from font_warmup import MONOSPACE_FONT, FontWarmup
+from hot_reload import FileWatcher
+from label_registry import LabelRegistry
+from layout_coordinator import LayoutCoordinator
+from layout_metrics import LayoutMetrics
+from markdown_blocks import DEFAULT_CHUNK_CHARS, BlockMarkdownView, chunk_texts, split_blocks
+from perf_hud import PerfHUD, overlaps_window
+from property_matrix import PropertyMatrix, axes_from_specs
+from render_dedup import RenderShareRegistry, render_key
+from startup_profile import StartupProfile
+from stress import generate_markdown, parse_mix, parse_size
+from virtual_sections import ViewportManager
+from widget_pool import WidgetPool
+
+# kivy_garden.markdownlabel (and mistune with it) is imported on first use by
+# MarkdownDemoApp.markdown_label_class() so it stays off the startup path.
+# Modules of optional features (background parsing, memory profiling, the
+# outline, search and style controls) are imported where the feature is
+# enabled, for the same reason.
+MarkdownLabel = None
 
 
 # Sample markdown content used across all variations (Requirement 9.1)
@@ -30,20 +75,207 @@ This is a paragraph with some text to demonstrate the property. It includes `inl
 
 Another paragraph to show line spacing effects. To make alignment differences clearer, this paragraph contains multiple sentences that should wrap across several lines when the text width is constrained. Notice how the right edge will appear ragged for left alignment but straight for justified alignment when enough wrapping occurs."""
 
+SAMPLE_MARKDOWN_PATH = Path(__file__).with_name("sample_markdown.md")
+
+# Height estimates reserved by virtualized sections before they are measured
+SECTION_CHROME_HEIGHT = 90  # header, section padding and spacing
+ESTIMATED_VARIATION_HEIGHT = 260  # description plus a SAMPLE_MARKDOWN label
+ESTIMATED_LINE_HEIGHT = 24  # one rendered line of sample_markdown.md
+
+# Font sizes in sp of the demo's own labels (descriptions, label default, headers)
+DEMO_FONT_SIZES = (14, 15, 24)
+
+# Seconds after the first frame before the memory report, so textures exist
+MEMORY_REPORT_DELAY = 2.0
+
+MATRIX_PAGE_SIZE = 20  # combinations per lazily built matrix section
+
+HUD_HOTKEY = 293  # F12 toggles the performance overlay
+REBUILD_HOTKEY = 286  # F5 rebuilds every section
+BACK_HOTKEY = 276  # Alt+Left returns to the previous linked document
+FORWARD_HOTKEY = 275  # Alt+Right goes forward again
+FIND_HOTKEY = 102  # Ctrl+F toggles the find bar
+
+# Title (and search source) of the full sample section
+DOCUMENT_SECTION = "sample_markdown.md"
+SEARCH_SCROLL_MARGIN = 40  # pixels left above a match scrolled into view
+MIN_HIGHLIGHT_HEIGHT = 24
+
 
 class MarkdownDemoApp(App):
     """Demo app showcasing MarkdownLabel Label-compatible properties."""
 
-    def __init__(self, **kwargs):
-        """Initialize the app and set up caches."""
+    def __init__(
+        self,
+        share_parse_cache=True,
+        virtualized=False,
+        progressive=False,
+        section_copies=1,
+        sample_text=None,
+        lazy_startup=False,
+        startup_profile=None,
+        watch=False,
+        background_parsing=None,
+        share_renders=False,
+        coalesce_layout=False,
+        layout_metrics_interval=None,
+        layout_metrics_path=None,
+        hud=False,
+        matrix_axes=None,
+        disk_cache_dir=None,
+        warm_fonts=False,
+        profile_memory=False,
+        pool_widgets=False,
+        style_controls=False,
+        navigate_links=True,
+        outline=False,
+        **kwargs
+    ):
+        """Initialize the app and set up caches.
+
+        Args:
+            share_parse_cache: If True, labels with identical source text reuse
+                one parsed token tree from the process-wide parse cache
+            virtualized: If True, sections are only built while they are near
+                the visible part of the ScrollView
+            progressive: If True, the full sample section renders its document
+                block by block over successive frames
+            section_copies: Number of times each property section is repeated
+            sample_text: Markdown shown in the full sample section instead of
+                the contents of sample_markdown.md
+            lazy_startup: If True, the first frame shows the empty layout and
+                sections (and the Markdown modules) are loaded right after it
+            startup_profile: Optional StartupProfile that records startup
+                milestones and is printed once the sections are shown
+            watch: If True, sample_markdown.md is watched for changes and the
+                changed blocks are re-rendered in place
+            background_parsing: None to parse on the main thread, "thread" or
+                "process" to parse on a worker pool and only build widgets on
+                the main thread; parsed tokens are handed to the labels
+                through the shared parse cache, so this requires
+                share_parse_cache
+            share_renders: If True, variations with the same text and
+                effective style are rendered once and share that texture
+            coalesce_layout: If True, height and background updates are
+                collected and applied once per frame
+            layout_metrics_interval: If set, property dispatches, layout passes
+                and canvas updates are counted per section and reported every
+                this many seconds
+            layout_metrics_path: Append the layout metrics reports as JSON
+                lines to this file instead of printing them
+            hud: If True, the frame-time overlay is shown from the start
+                (F12 toggles it either way)
+            matrix_axes: Section titles (e.g. ["font_size", "halign"]) whose
+                variations are combined into a property matrix shown instead
+                of the regular sections; matrix pages are always virtualized
+            disk_cache_dir: If set (and share_parse_cache is True), parse
+                results are also stored in this directory and reused by
+                later runs
+            warm_fonts: If True, font files are read on a worker thread and
+                the document's glyphs are prerendered over the first frames;
+                the sections are built once the warm-up is done (as with
+                lazy_startup), so no frame opens fonts before that
+            profile_memory: If True, allocations made while building each
+                section are traced and reported with texture estimates per
+                section after the first frame and on exit
+            pool_widgets: If True, widgets of sections that leave the tree
+                (released virtualized sections, rebuilds) are reset and
+                reused by later sections instead of being recreated
+            style_controls: If True, a panel of sliders and pickers above the
+                sections restyles every displayed MarkdownLabel live
+            navigate_links: If True, clicking a relative link to a Markdown
+                file opens it in the full sample section, with back/forward
+                history (Alt+Left/Alt+Right) and cached, prefetched documents
+            outline: If True, a sidebar lists the sections and the current
+                document's headings; clicking an entry scrolls to it
+        """
         super().__init__(**kwargs)
-        self._full_sample_cache = None
+        self._full_sample_cache = sample_text
+        self.virtualized = virtualized
+        self.progressive = progressive
+        self.section_copies = section_copies
+        self.section_hooks = []
+        self._building_section = None
+        # Layout of the section being built (see new_section_layout)
+        self._section_layout = None
+        # Every MarkdownLabel in the section tree by section title and properties
+        self.label_registry = LabelRegistry(self.is_markdown_label)
+        self.viewport = None
+        self.share_parse_cache = share_parse_cache
+        self.disk_cache_dir = disk_cache_dir
+        self.warm_fonts = warm_fonts
+        self.font_warmup = None
+        self._waiting_for_fonts = False
+        self.memory_profiler = None
+        if profile_memory:
+            from memory_profile import MemoryProfiler
+            self.memory_profiler = MemoryProfiler()
+            self.memory_profiler.start()
+            self.add_section_hook(self.memory_profiler.section_hook)
+        self.lazy_startup = lazy_startup
+        self.startup_profile = startup_profile
+        self._sections_pending = False
+        self.watch = watch
+        self.file_watcher = None
+        self.full_sample_view = None
+        self.navigate_links = navigate_links
+        self.navigator = None
+        self.document_section = None
+        self.document_header = None
+        self.document_widget = None
+        # Top-level sections (or their placeholders) and variations by title
+        self.section_widgets = {}
+        self.search_index = None
+        self.find_bar = None
+        self._search_highlight = None
+        self._highlight_offset = None
+        self.outline = outline
+        self.outline_index = None
+        self.outline_sidebar = None
+        # (block count, characters) of the document the outline was built from
+        self._outline_document = (0, 0)
+        self.background_parser = None
+        if background_parsing is not None:
+            if not share_parse_cache:
+                raise ValueError("background parsing hands tokens to labels through the shared parse cache")
+            from async_parse import BackgroundParser
+            self.background_parser = BackgroundParser(use_processes=background_parsing == "process")
+        self.render_shares = RenderShareRegistry() if share_renders else None
+        self.layout_coordinator = None
+        if coalesce_layout:
+            # Coordinated rectangle moves bypass _update_rect, which counts them
+            self.layout_coordinator = LayoutCoordinator(on_rect_update=self._count_rect_update)
+        self.layout_metrics_interval = layout_metrics_interval
+        self.layout_metrics_path = layout_metrics_path
+        self.layout_metrics = None
+        if layout_metrics_interval is not None:
+            # Installed before any layout exists so every do_layout is counted
+            self.layout_metrics = LayoutMetrics()
+            self.layout_metrics.install()
+            # Sections are watched as soon as they are built, including the
+            # ones built later by lazy startup or virtualization
+            self.add_section_hook(self.watch_section_metrics)
+        self.hud = hud
+        self.perf_hud = None
+        self.matrix_axes = matrix_axes
+        self.matrix = None
+        self.widget_pool = None
+        if pool_widgets:
+            # Pooled widgets keep their layout bindings unless the pool drops them
+            on_drop = self.layout_coordinator.forget if self.layout_coordinator is not None else None
+            self.widget_pool = WidgetPool(container_kinds=("section", "variation"), on_drop=on_drop)
+        self.style_batcher = None
+        if style_controls:
+            from style_controls import StyleBatcher
+            self.style_batcher = StyleBatcher(self.displayed_markdown_labels, visible=self.visible_markdown_labels)
     
     def build(self):
         """Build scrollable layout with property demonstration sections."""
         # Configure window size
         Window.size = (1400, 900)
         self.title = "MarkdownLabel Demo - Label Compatibility"
+        if self.warm_fonts:
+            self.start_font_warmup()
         
         # Create main vertical BoxLayout container
         main_layout = BoxLayout(
@@ -53,7 +285,7 @@ class MarkdownDemoApp(App):
             padding=[10, 10, 10, 10]
         )
         # Bind height to minimum_height for proper scrolling
-        main_layout.bind(minimum_height=main_layout.setter('height'))
+        self.bind_height(main_layout)
         
         # Create ScrollView for vertical scrolling (Requirement 8.1)
         scroll_view = ScrollView(
@@ -64,43 +296,469 @@ class MarkdownDemoApp(App):
         
         # Store reference to main layout for adding sections
         self.main_layout = main_layout
+        self.scroll_view = scroll_view
+        root = scroll_view
+        if self.style_batcher is not None:
+            from style_controls import StyleControlPanel
+            root = BoxLayout(orientation='vertical')
+            root.add_widget(StyleControlPanel(self.style_batcher))
+            root.add_widget(scroll_view)
+        if self.outline:
+            from outline import OutlineIndex, OutlineSidebar
+            self.outline_index = OutlineIndex(main_layout, self.locate_outline_entry)
+            self.outline_sidebar = OutlineSidebar(self.jump_to_outline_entry)
+            content = root
+            root = BoxLayout(orientation='horizontal')
+            root.add_widget(self.outline_sidebar)
+            root.add_widget(content)
+
+        if self.defers_sections:
+            # Sections are added once the empty layout has been drawn (see
+            # on_start) and, with warm_fonts, once the fonts are warm
+            self._sections_pending = True
+        else:
+            self.populate_sections()
+
+        if self.startup_profile is not None:
+            self.startup_profile.mark("build returned")
+        
+        return root
+
+    @property
+    def defers_sections(self):
+        """True if the sections are built after the first frame instead of in build()."""
+        return self.lazy_startup or self.warm_fonts
+
+    def populate_sections(self, *args):
+        """Add every demonstration section to the main layout."""
+        self._sections_pending = False
+        # Before any section (or background worker) can parse
+        self.install_parse_cache()
+        if self.matrix_axes:
+            self.add_matrix_sections(self.scroll_view, self.main_layout)
+        elif self.virtualized:
+            self.add_virtualized_sections(self.scroll_view, self.main_layout)
+        else:
+            for title, variations, show_background in self.all_section_specs():
+                section = self.create_section(title, variations, show_background=show_background)
+                self.main_layout.add_widget(section)
+                self.section_widgets[title] = (section, variations)
+
+            # Add full sample_markdown.md display (original single-label demo)
+            full_sample_section = self.create_full_sample_section()
+            self.main_layout.add_widget(full_sample_section)
+            self.section_widgets[DOCUMENT_SECTION] = (full_sample_section, None)
+
+        if self.search_index is not None:
+            self.refresh_search_index()
+        if self.outline_index is not None:
+            self.refresh_outline()
+
+        if self.layout_metrics is not None:
+            self.layout_metrics.watch_tree(self.main_layout)
+
+        if self.startup_profile is not None:
+            self.startup_profile.mark("sections built")
+            if self.defers_sections:
+                print(self.startup_profile.report())
+
+    def rebuild_sections(self):
+        """Tear down every section and build them again.
+        
+        With widget pooling the widgets of the old sections are recycled by
+        the new ones.
+        """
+        started = time.perf_counter()
+        if self.viewport is not None:
+            self.viewport.detach()
+            self.viewport = None
+        if self.render_shares is not None:
+            # Shared renderings point at labels of the old sections
+            self.render_shares = RenderShareRegistry()
+        for child in list(self.main_layout.children):
+            self.main_layout.remove_widget(child)
+            self.recycle(child)
+        self.section_widgets = {}
+        self.full_sample_view = None
+        self.clear_search_highlight()
+        self.populate_sections()
+        message = f"Rebuilt sections in {(time.perf_counter() - started) * 1000:.1f} ms"
+        if self.widget_pool is not None:
+            message += f" (widget pool: {self.widget_pool.stats()})"
+        print(message)
+
+    def show_document(self, text):
+        """Show ``text`` in the full sample section instead of the current document.
+        
+        Args:
+            text: Markdown source to display
+        """
+        self._full_sample_cache = text
+        if self.navigator is not None:
+            self.navigator.cache.put(SAMPLE_MARKDOWN_PATH.resolve(), text)
+        self.rebuild_sections()
+
+    def recycle(self, widget):
+        """Return the pooled widgets of a section that left the tree.
+        
+        Args:
+            widget: Detached section (or placeholder) widget
+        """
+        self.label_registry.unregister_tree(widget)
+        if self.render_shares is not None:
+            # Views elsewhere must not keep following a primary that left
+            self.render_shares.release_tree(widget)
+        if self.document_section is not None and is_within(self.document_section, widget):
+            if self.navigator is not None and self.document_widget.parent is self.document_section:
+                # The rendered document stays cached for the next document section
+                self.document_section.remove_widget(self.document_widget)
+            self.document_section = self.document_header = None
+        if self.widget_pool is None:
+            if self.layout_coordinator is not None:
+                self.layout_coordinator.forget_tree(widget)
+            return
+        if self.full_sample_view is not None and is_within(self.full_sample_view, widget):
+            # Its labels are handed out again; edits go to the next full sample section
+            self.full_sample_view = None
+        self.widget_pool.release(widget)
+        if self.layout_coordinator is not None:
+            # Pooled widgets were detached by the release; what is left is discarded
+            self.layout_coordinator.forget_tree(widget, keep=self.widget_pool.is_pooled)
+
+    def pooled(self, kind, create, **properties):
+        """Return a widget of ``kind`` from the widget pool, or a new one.
+        
+        Args:
+            kind: Pool key of widgets built by ``create``
+            create: Callable building a widget from ``properties``
+            **properties: Properties that differ between widgets of the kind
+        """
+        if self.widget_pool is None:
+            return create(**properties)
+        return self.widget_pool.acquire(kind, create, **properties)
+
+    def on_start(self):
+        """Watch for the first drawn frame and start file watching and reports if enabled."""
+        Window.bind(on_flip=self._on_first_frame)
+        Window.bind(on_key_down=self._on_key_down)
+        if self.hud:
+            self.toggle_hud()
+        if self.watch:
+            self.start_watching()
+        if self.layout_metrics is not None:
+            # Built sections are watched by their section hook; the re-scan
+            # before each report picks up widgets added to them afterwards
+            # (progressively rendered document chunks)
+            self.layout_metrics.start_reporting(
+                self.layout_metrics_interval,
+                root=self.main_layout,
+                path=self.layout_metrics_path,
+            )
+
+    def _on_first_frame(self, *args):
+        """Record the first frame and load deferred sections after it."""
+        Window.unbind(on_flip=self._on_first_frame)
+        if self.startup_profile is not None:
+            self.startup_profile.mark("first frame")
+        if self.memory_profiler is not None:
+            Clock.schedule_once(self.report_memory, MEMORY_REPORT_DELAY)
+        if self._sections_pending:
+            if self.font_warmup is not None and not self.font_warmup.done:
+                # Sections are populated by _on_fonts_warm
+                self._waiting_for_fonts = True
+                return
+            Clock.schedule_once(self.populate_sections, 0)
+        elif self.startup_profile is not None:
+            print(self.startup_profile.report())
+
+    def report_memory(self, *args):
+        """Print allocations and texture estimates per section."""
+        print(self.memory_profiler.format_report(
+            self.main_layout, self.is_markdown_label, labels_of=self.section_markdown_labels
+        ))
+
+    def start_font_warmup(self):
+        """Preload the demo's fonts and prerender the glyphs it displays."""
+        font_names = ["Roboto", MONOSPACE_FONT]
+        font_sizes = [sp(size) for size in DEMO_FONT_SIZES]
+        for _, variations, _ in self.section_specs():
+            for _, properties in variations:
+                if "font_name" in properties:
+                    font_names.append(properties["font_name"])
+                if "font_size" in properties:
+                    font_sizes.append(properties["font_size"])
+        self.font_warmup = FontWarmup(
+            font_names,
+            font_sizes,
+            text=SAMPLE_MARKDOWN + self.load_full_sample_markdown(),
+            on_complete=self._on_fonts_warm,
+        )
+        self.font_warmup.start()
+
+    def _on_fonts_warm(self, warmup):
+        """Report the warm-up and show sections that waited for it."""
+        print(f"Fonts warmed up: {warmup.stats()}")
+        if self._waiting_for_fonts:
+            self._waiting_for_fonts = False
+            Clock.schedule_once(self.populate_sections, 0)
+
+    def _on_key_down(self, window, key, *args):
+        """Handle the overlay, rebuild, document history and find hotkeys."""
+        if key == HUD_HOTKEY:
+            self.toggle_hud()
+            return True
+        if key == REBUILD_HOTKEY:
+            self.rebuild_sections()
+            return True
+        modifiers = args[2] if len(args) > 2 else []
+        if "ctrl" in modifiers and key == FIND_HOTKEY:
+            self.toggle_find_bar()
+            return True
+        if "alt" in modifiers and key in (BACK_HOTKEY, FORWARD_HOTKEY):
+            if key == BACK_HOTKEY:
+                self.go_back()
+            else:
+                self.go_forward()
+            return True
+        return False
+
+    def toggle_hud(self):
+        """Show or hide the frame-time and draw-call overlay."""
+        if self.perf_hud is None:
+            self.perf_hud = PerfHUD(
+                self.scroll_view, self.is_markdown_label, find_visible_labels=self.visible_markdown_labels
+            )
+        self.perf_hud.toggle()
+
+    def toggle_find_bar(self):
+        """Show or hide the find bar, indexing the content on first use."""
+        if self.search_index is None:
+            from search_index import SearchIndex
+            started = time.perf_counter()
+            per_block = self.document_chunk_chars() == 0
+            self.search_index = SearchIndex()
+            if not per_block:
+                # Matches are located by their block's widget from now on
+                self.rerender_document()
+            self.refresh_search_index()
+            print(
+                f"Indexed {len(self.search_index)} blocks for search "
+                f"in {(time.perf_counter() - started) * 1000:.1f} ms"
+            )
+        if self.find_bar is None:
+            from search_index import FindBar
+            self.find_bar = FindBar(self.search_index.search, self.jump_to_match)
+        self.find_bar.toggle()
+        if not self.find_bar.active:
+            self.clear_search_highlight()
+
+    def current_document_text(self):
+        """Return the source of the document shown in the full sample section."""
+        if self.navigator is not None:
+            return self.navigator.document().text
+        return self.load_full_sample_markdown()
+
+    def refresh_search_index(self):
+        """Bring the search index up to date with the sections and the current document.
+        
+        Only blocks that changed since the last refresh are re-indexed.
+        """
+        index = self.search_index
+        wanted = set()
+        for title, (widget, variations) in self.section_widgets.items():
+            if variations is not None:
+                index.update_blocks(title, [title] + [description for description, _ in variations])
+                wanted.add(title)
+        if DOCUMENT_SECTION in self.section_widgets:
+            index.update_blocks(DOCUMENT_SECTION, split_blocks(self.current_document_text()))
+            wanted.add(DOCUMENT_SECTION)
+        for source in index.sources:
+            if source not in wanted:
+                index.remove_source(source)
+
+    def locate_match(self, match):
+        """Return (widget, start, span) of a search match.
+        
+        ``start`` and ``span`` are fractions of the widget's height from its
+        top. Document matches use the block's widget when every block has its
+        own, otherwise (e.g. on a released section's placeholder) the block's
+        character position.
+        """
+        if match.source == DOCUMENT_SECTION:
+            view, per_block = self.document_block_widget(
+                match.block, self.search_index.block_count(DOCUMENT_SECTION)
+            )
+            if per_block:
+                return view, 0.0, 1.0
+            start, length, total = self.search_index.block_span(DOCUMENT_SECTION, match.block)
+            total = max(total, 1)
+            return view, start / total, length / total
+        widget = self.section_widgets.get(match.source, (None, None))[0]
+        blocks = max(self.search_index.block_count(match.source), 1)
+        return widget, match.block / blocks, 1 / blocks
+
+    def document_block_widget(self, block, block_count):
+        """Return the widget showing a block of the current document.
+        
+        Args:
+            block: Block position in the document
+            block_count: Number of blocks the document was split into
+            
+        Returns:
+            (widget, per_block): the block's own widget and True when every
+            block has one (see ``document_chunk_chars``), otherwise the widget
+            showing the whole document (or its section placeholder while
+            released) and False
+        """
+        section = self.document_section
+        if section is not None and is_within(section, self.main_layout):
+            view = self.document_widget
+            if isinstance(view, BlockMarkdownView) and len(view.block_widgets) == block_count:
+                return view.block_widgets[block], True
+            return view, False
+        return self.section_widgets.get(DOCUMENT_SECTION, (None, None))[0], False
+
+    def jump_to_match(self, match):
+        """Scroll a search match into view and highlight it."""
+        widget, start, span = self.locate_match(match)
+        if widget is None or not is_within(widget, self.main_layout):
+            return
+        layout = self.main_layout
+        x, top = layout.to_widget(*widget.to_window(widget.x, widget.top))
+        span_top = top - widget.height * start
+        span_height = max(widget.height * span, MIN_HIGHLIGHT_HEIGHT)
+
+        view_height = self.scroll_view.height
+        scrollable = layout.height - view_height
+        if scrollable > 0:
+            content_top = span_top - layout.y
+            scroll_y = (content_top + SEARCH_SCROLL_MARGIN - view_height) / scrollable
+            self.scroll_view.scroll_y = min(max(scroll_y, 0), 1)
+
+        if self._search_highlight is None:
+            with layout.canvas.after:
+                Color(1, 0.85, 0, 0.3)
+                self._search_highlight = Rectangle()
+            layout.bind(pos=self._place_search_highlight)
+        # Kept relative to the layout, which the ScrollView moves
+        self._highlight_offset = (x - layout.x, span_top - span_height - layout.y)
+        self._search_highlight.size = (widget.width, span_height)
+        self._place_search_highlight()
+
+    def _place_search_highlight(self, *args):
+        """Keep the search highlight on its match while the layout moves."""
+        if self._highlight_offset is not None:
+            dx, dy = self._highlight_offset
+            self._search_highlight.pos = (self.main_layout.x + dx, self.main_layout.y + dy)
+
+    def clear_search_highlight(self):
+        """Hide the search highlight."""
+        if self._search_highlight is not None:
+            self._highlight_offset = None
+            self._search_highlight.size = (0, 0)
+
+    def refresh_outline(self):
+        """Rebuild the outline from the sections and the current document's headings."""
+        from outline import OutlineEntry, document_headings
+
+        blocks = split_blocks(self.current_document_text())
+        self._outline_document = (len(blocks), sum(len(block) for block in blocks))
+        entries = []
+        for title in self.section_widgets:
+            if title == DOCUMENT_SECTION:
+                entries.append(OutlineEntry(self.document_title(), 1, "section", title))
+                entries.extend(
+                    OutlineEntry(heading.title, heading.level + 1, "heading", heading)
+                    for heading in document_headings(blocks)
+                )
+            else:
+                entries.append(OutlineEntry(title, 1, "section", title))
+        self.outline_index.set_entries(entries)
+        self.outline_sidebar.show_entries(entries)
+
+    def locate_outline_entry(self, entry):
+        """Return (widget, fraction) of an outline entry.
+        
+        ``fraction`` is the entry's position as a fraction of the widget's
+        height from its top, like the positions of search matches.
+        """
+        if entry.kind == "section":
+            return self.section_widgets.get(entry.key, (None, None))[0], 0.0
+        heading = entry.key
+        block_count, total = self._outline_document
+        widget, per_block = self.document_block_widget(heading.block, block_count)
+        if per_block:
+            return widget, heading.within
+        return widget, heading.offset / max(total, 1)
+
+    def jump_to_outline_entry(self, index):
+        """Scroll outline entry ``index`` to the top of the view."""
+        self.scroll_view.scroll_y = self.outline_index.scroll_y_for(index, self.scroll_view.height)
+
+    def displayed_markdown_labels(self):
+        """Return the MarkdownLabels currently in the section tree."""
+        return list(self.label_registry)
+
+    def visible_markdown_labels(self):
+        """Return the MarkdownLabels currently overlapping the window.
         
-        # Add font_name demonstration section (Requirements 1.1, 1.2)
+        Only the labels of sections overlapping the window are checked.
+        """
+        visible = []
+        for title, (widget, _) in self.section_widgets.items():
+            if overlaps_window(widget):
+                visible.extend(label for label in self.label_registry.labels(section=title) if overlaps_window(label))
+        return visible
+
+    def section_markdown_labels(self, title):
+        """Return the MarkdownLabels of the section with ``title``."""
+        return self.label_registry.labels(section=title)
+
+    def style_overrides(self):
+        """Return the properties set through the style controls (empty without them)."""
+        if self.style_batcher is None:
+            return {}
+        return self.style_batcher.overrides
+
+    def is_markdown_label(self, widget):
+        """Return True if ``widget`` is a MarkdownLabel (False until the class is loaded)."""
+        return MarkdownLabel is not None and isinstance(widget, MarkdownLabel)
+
+    def section_specs(self):
+        """Return the property demonstration sections shown by the demo.
+        
+        Returns:
+            List of (title, variations, show_background) tuples, where
+            variations is a list of (description, property_dict) tuples
+        """
+        # font_name demonstration section (Requirements 1.1, 1.2)
         font_name_variations = [
             ("font_name='Roboto' (default)", {"font_name": "Roboto"}),
             ("font_name='DejaVuSans'", {"font_name": "DejaVuSans"}),
         ]
-        font_name_section = self.create_section("font_name", font_name_variations)
-        main_layout.add_widget(font_name_section)
         
-        # Add font_size demonstration section (Requirements 2.1, 2.2)
+        # font_size demonstration section (Requirements 2.1, 2.2)
         font_size_variations = [
             ("font_size=14", {"font_size": 14}),
             ("font_size=20", {"font_size": 20}),
             ("font_size=28", {"font_size": 28}),
         ]
-        font_size_section = self.create_section("font_size", font_size_variations)
-        main_layout.add_widget(font_size_section)
         
-        # Add color demonstration section (Requirements 3.1, 3.2)
+        # color demonstration section (Requirements 3.1, 3.2)
         color_variations = [
             ("color=[1,1,1,1] (white)", {"color": [1, 1, 1, 1]}),
             ("color=[1,1,0,1] (yellow)", {"color": [1, 1, 0, 1]}),
             ("color=[0,1,1,1] (cyan)", {"color": [0, 1, 1, 1]}),
         ]
-        color_section = self.create_section("color", color_variations)
-        main_layout.add_widget(color_section)
         
-        # Add line_height demonstration section (Requirements 4.1, 4.2)
+        # line_height demonstration section (Requirements 4.1, 4.2)
         line_height_variations = [
             ("line_height=1.0", {"line_height": 1.0}),
             ("line_height=1.5", {"line_height": 1.5}),
             ("line_height=2.0", {"line_height": 2.0}),
         ]
-        line_height_section = self.create_section("line_height", line_height_variations)
-        main_layout.add_widget(line_height_section)
         
-        # Add halign demonstration section (Requirements 5.1, 5.2)
+        # halign demonstration section (Requirements 5.1, 5.2)
         halign_variations = [
             ("halign='left'", {"halign": "left"}),
             ("halign='center'", {"halign": "center"}),
@@ -114,19 +772,15 @@ class MarkdownDemoApp(App):
                 "text_size": [600, None],
             }),
         ]
-        halign_section = self.create_section("halign", halign_variations)
-        main_layout.add_widget(halign_section)
         
-        # Add padding demonstration section (Requirements 6.1, 6.2, 6.3)
+        # padding demonstration section (Requirements 6.1, 6.2, 6.3)
         padding_variations = [
             ("padding=[0,0,0,0]", {"padding": [0, 0, 0, 0]}),
             ("padding=[20,20,20,20]", {"padding": [20, 20, 20, 20]}),
             ("padding=[50,10,100,10]", {"padding": [50, 10, 100, 10]}),
         ]
-        padding_section = self.create_section("padding", padding_variations, show_background=True)
-        main_layout.add_widget(padding_section)
         
-        # Add disabled demonstration section (Requirements 7.1, 7.2, 7.3)
+        # disabled demonstration section (Requirements 7.1, 7.2, 7.3)
         disabled_variations = [
             ("disabled=False (normal)", {"disabled": False}),
             ("disabled=True, disabled_color=[0.5,0.5,0.5,1]", {
@@ -134,14 +788,135 @@ class MarkdownDemoApp(App):
                 "disabled_color": [0.5, 0.5, 0.5, 1]
             }),
         ]
-        disabled_section = self.create_section("disabled", disabled_variations)
-        main_layout.add_widget(disabled_section)
 
-        # Add full sample_markdown.md display (original single-label demo)
-        full_sample_section = self.create_full_sample_section()
-        main_layout.add_widget(full_sample_section)
+        return [
+            ("font_name", font_name_variations, False),
+            ("font_size", font_size_variations, False),
+            ("color", color_variations, False),
+            ("line_height", line_height_variations, False),
+            ("halign", halign_variations, False),
+            ("padding", padding_variations, True),
+            ("disabled", disabled_variations, False),
+        ]
+
+    def all_section_specs(self):
+        """Return section_specs() repeated ``section_copies`` times.
+        
+        Copies after the first get a numbered title so they stay distinguishable.
+        """
+        specs = self.section_specs()
+        all_specs = list(specs)
+        for copy_number in range(2, self.section_copies + 1):
+            all_specs.extend(
+                (f"{title} #{copy_number}", variations, show_background)
+                for title, variations, show_background in specs
+            )
+        return all_specs
+
+    def add_section_hook(self, hook):
+        """Register a hook wrapped around the construction of every section.
+        
+        Args:
+            hook: Callable taking the section title and returning a context
+                manager that is entered while the section is built
+        """
+        self.section_hooks.append(hook)
+
+    @contextmanager
+    def section_build(self, title):
+        """Enter every registered section hook while a section is built.
+        
+        Args:
+            title: Title of the section being built
+        """
+        outer = (self._building_section, self._section_layout)
+        self._building_section, self._section_layout = title, None
+        try:
+            with ExitStack() as stack:
+                for hook in self.section_hooks:
+                    stack.enter_context(hook(title))
+                yield
+        finally:
+            self._building_section, self._section_layout = outer
+
+    def new_section_layout(self, title):
+        """Return the layout of the section ``title`` that is being built.
+        
+        Section hooks find it as ``_section_layout`` when the build ends.
+        """
+        section_layout = self.pooled("section", self._new_section_layout)
+        section_layout.section_title = title
+        self._section_layout = section_layout
+        return section_layout
+
+    @contextmanager
+    def watch_section_metrics(self, title):
+        """Section hook counting the layout events of the built section."""
+        yield
+        if self._section_layout is not None:
+            self.layout_metrics.watch_tree(self._section_layout)
+
+    def add_virtualized_sections(self, scroll_view, main_layout):
+        """Add every section as a placeholder that is built near the viewport.
+        
+        Args:
+            scroll_view: The root ScrollView
+            main_layout: Vertical layout inside the ScrollView
+        """
+        self.viewport = ViewportManager(scroll_view, main_layout, on_release=self.recycle)
+        for title, variations, show_background in self.all_section_specs():
+            placeholder = self.viewport.add_section(
+                title,
+                partial(self.create_section, title, variations, show_background=show_background),
+                estimated_height=self.estimate_section_height(len(variations)),
+            )
+            self.section_widgets[title] = (placeholder, variations)
+
+        full_sample_lines = self.load_full_sample_markdown().count("\n") + 1
+        placeholder = self.viewport.add_section(
+            DOCUMENT_SECTION,
+            self.create_full_sample_section,
+            estimated_height=SECTION_CHROME_HEIGHT + full_sample_lines * ESTIMATED_LINE_HEIGHT,
+        )
+        self.section_widgets[DOCUMENT_SECTION] = (placeholder, None)
+
+    def add_matrix_sections(self, scroll_view, main_layout):
+        """Add the property matrix as virtualized pages of combinations.
         
-        return scroll_view
+        Only the combinations are generated up front; widgets are built for
+        the pages near the viewport.
+        
+        Args:
+            scroll_view: The root ScrollView
+            main_layout: Vertical layout inside the ScrollView
+        """
+        axes = axes_from_specs(self.section_specs(), self.matrix_axes)
+        self.matrix = PropertyMatrix(axes, self.markdown_label_class())
+        self.viewport = ViewportManager(scroll_view, main_layout, on_release=self.recycle)
+        axis_names = " x ".join(self.matrix.names)
+        for number, page in enumerate(self.matrix.pages(MATRIX_PAGE_SIZE), 1):
+            title = f"{axis_names} #{number}"
+            placeholder = self.viewport.add_section(
+                title,
+                partial(self.create_section, title, page, show_background=self.matrix.show_background),
+                estimated_height=self.estimate_section_height(len(page)),
+            )
+            self.section_widgets[title] = (placeholder, page)
+        print(
+            f"Property matrix: {self.matrix.total_combinations} combinations, "
+            f"{self.matrix.duplicates} duplicate style(s) skipped"
+        )
+
+    def estimate_section_height(self, variation_count):
+        """Estimate the height of a property section before it is built.
+        
+        Args:
+            variation_count: Number of variations in the section
+            
+        Returns:
+            Estimated height in pixels
+        """
+        return SECTION_CHROME_HEIGHT + variation_count * ESTIMATED_VARIATION_HEIGHT
     
     def create_header(self, title):
         """Create a section header label.
@@ -152,15 +927,19 @@ class MarkdownDemoApp(App):
         Returns:
             Label widget styled as a section header
         """
+        return self.pooled("header", self._new_header, text=f"[b]{title}[/b]")
+
+    def _new_header(self, **properties):
+        """Create a section header label showing ``properties``."""
         header = Label(
-            text=f"[b]{title}[/b]",
             markup=True,
             font_size='24sp',
             size_hint_y=None,
             height=50,
             color=[1, 0.8, 0, 1],  # Gold color for headers
             halign='left',
-            valign='middle'
+            valign='middle',
+            **properties
         )
         header.bind(size=header.setter('text_size'))
         return header
@@ -176,33 +955,123 @@ class MarkdownDemoApp(App):
         Returns:
             BoxLayout containing description and MarkdownLabel
         """
+        variation_layout = self.pooled("variation", self._new_variation_layout)
+        
+        # Description label (Requirement 8.3)
+        desc_label = self.pooled("description", self._new_description_label, text=description)
+        variation_layout.add_widget(desc_label)
+        
+        # MarkdownLabel with specified properties (Requirement 9.1, 9.2);
+        # sections built after a change in the style controls start restyled
+        variation_properties = properties
+        properties = {**properties, **self.style_overrides()}
+        # Labels are registered when created, which a background parse delays
+        # past this section build
+        if self.render_shares is not None:
+            # Variations that render identically share one label's texture; the
+            # rendered labels stay referenced by their share, so they are not pooled
+            key = render_key(SAMPLE_MARKDOWN, properties, show_background, self.markdown_label_class())
+            label_factory = partial(
+                self.render_shares.acquire,
+                key,
+                partial(self.shared_render_label, self._building_section, variation_properties, show_background),
+            )
+        else:
+            label_factory = partial(self.pooled_variation_label, show_background, properties)
+            label_factory = partial(self.registered_label, self._building_section, variation_properties, label_factory)
+
+        if self.background_parser is not None:
+            # Parse off the main thread; a sized slot holds the space meanwhile
+            md_slot = self.background_parser.slot(SAMPLE_MARKDOWN, label_factory)
+            variation_layout.add_widget(md_slot)
+        else:
+            md_label = label_factory()
+            variation_layout.add_widget(md_label)
+        
+        return variation_layout
+
+    def _new_variation_layout(self):
+        """Create the height-following layout of a variation."""
         variation_layout = BoxLayout(
             orientation='vertical',
             size_hint_y=None,
             spacing=5,
             padding=[10, 5, 10, 5]
         )
-        
-        # Description label (Requirement 8.3)
+        # Calculate total height
+        self.bind_height(variation_layout)
+        return variation_layout
+
+    def _new_description_label(self, **properties):
+        """Create a variation's description label showing ``properties``."""
         desc_label = Label(
-            text=description,
             font_size='14sp',
             size_hint_y=None,
             height=30,
             color=[0.7, 0.7, 0.7, 1],  # Gray color for descriptions
             halign='left',
-            valign='middle'
+            valign='middle',
+            **properties
         )
         desc_label.bind(size=desc_label.setter('text_size'))
-        variation_layout.add_widget(desc_label)
+        return desc_label
+
+    def registered_label(self, section, properties, create):
+        """Create a MarkdownLabel with ``create`` and add it to the label registry.
+        
+        Args:
+            section: Title of the section showing the label
+            properties: Variation properties the label is indexed by
+            create: Callable returning the label
+        """
+        md_label = create()
+        self.label_registry.register(md_label, section, properties)
+        return md_label
+
+    def shared_render_label(self, section, properties, show_background):
+        """Create and register a label whose rendering variations may share.
         
-        # MarkdownLabel with specified properties (Requirement 9.1, 9.2)
-        md_label = MarkdownLabel(
-            text=SAMPLE_MARKDOWN,
+        Used for the first variation of a rendering and for views that take
+        over a released primary (or stop matching its width), possibly long
+        after their section was built, so the current style overrides apply.
+        
+        Args:
+            section: Title of the section showing the label
+            properties: Variation properties the label is indexed by
+            show_background: Whether the label draws a background rectangle
+        """
+        create = partial(self.create_variation_label, show_background, {**properties, **self.style_overrides()})
+        return self.registered_label(section, properties, create)
+
+    def pooled_variation_label(self, show_background, properties):
+        """Return a variation's MarkdownLabel, recycled from the widget pool if possible.
+        
+        Labels with and without background are pooled separately because the
+        background is drawn on the label's canvas.
+        """
+        kind = "markdown_label_bg" if show_background else "markdown_label"
+        create = partial(self._build_markdown_label, show_background)
+        return self.pooled(kind, create, text=SAMPLE_MARKDOWN, **properties)
+    
+    def create_variation_label(self, show_background, properties):
+        """Create the MarkdownLabel shown by a variation.
+        
+        Args:
+            show_background: If True, add visible background color to MarkdownLabel
+            properties: Properties to apply to MarkdownLabel
+            
+        Returns:
+            MarkdownLabel displaying SAMPLE_MARKDOWN
+        """
+        return self._build_markdown_label(show_background, text=SAMPLE_MARKDOWN, **properties)
+
+    def _build_markdown_label(self, show_background, **properties):
+        """Create a content-sized MarkdownLabel, optionally with a background."""
+        md_label = self.markdown_label_class()(
             size_hint_y=None,
             **properties
         )
-        md_label.bind(minimum_height=md_label.setter('height'))
+        self.bind_height(md_label)
         md_label.bind(on_ref_press=self.on_ref_press)
         
         # Add background color if requested (Requirement 6.3)
@@ -210,16 +1079,12 @@ class MarkdownDemoApp(App):
             with md_label.canvas.before:
                 Color(0.2, 0.2, 0.3, 1)  # Dark blue-gray background
                 md_label.bg_rect = Rectangle(pos=md_label.pos, size=md_label.size)
-            md_label.bind(pos=self._update_rect, size=self._update_rect)
-        
-        variation_layout.add_widget(md_label)
+            if self.layout_coordinator is not None:
+                self.layout_coordinator.track_background(md_label, md_label.bg_rect)
+            else:
+                md_label.bind(pos=self._update_rect, size=self._update_rect)
         
-        # Calculate total height
-        variation_layout.bind(
-            minimum_height=variation_layout.setter('height')
-        )
-        
-        return variation_layout
+        return md_label
     
     def create_section(self, title, variations, show_background=False):
         """Create a section with header and variations.
@@ -232,64 +1097,332 @@ class MarkdownDemoApp(App):
         Returns:
             BoxLayout containing the section
         """
+        with self.section_build(title):
+            section_layout = self.new_section_layout(title)
+        
+            # Add section header (Requirement 8.2)
+            header = self.create_header(title)
+            section_layout.add_widget(header)
+        
+            # Add each variation
+            for description, props in variations:
+                variation = self.create_variation(description, show_background=show_background, **props)
+                section_layout.add_widget(variation)
+        
+            return section_layout
+
+    def _new_section_layout(self):
+        """Create the height-following layout of a section."""
         section_layout = BoxLayout(
             orientation='vertical',
             size_hint_y=None,
             spacing=10,
             padding=[0, 10, 0, 20]
         )
-        section_layout.section_title = title
-        
-        # Add section header (Requirement 8.2)
-        header = self.create_header(title)
-        section_layout.add_widget(header)
-        
-        # Add each variation
-        for description, props in variations:
-            variation = self.create_variation(description, show_background=show_background, **props)
-            section_layout.add_widget(variation)
-        
         # Bind height to minimum_height
-        section_layout.bind(minimum_height=section_layout.setter('height'))
-        
+        self.bind_height(section_layout)
         return section_layout
 
     def create_full_sample_section(self):
         """Create a section that displays the full sample_markdown.md content."""
-        section_layout = BoxLayout(
-            orientation='vertical',
-            size_hint_y=None,
-            spacing=10,
-            padding=[0, 10, 0, 20]
-        )
-        section_layout.section_title = "sample_markdown.md"
+        with self.section_build(DOCUMENT_SECTION):
+            section_layout = self.new_section_layout(DOCUMENT_SECTION)
 
-        header = self.create_header("sample_markdown.md (full content)")
-        section_layout.add_widget(header)
+            header = self.create_header(self.document_title())
+            section_layout.add_widget(header)
+            section_layout.add_widget(self.current_document_widget())
 
-        full_sample_text = self.load_full_sample_markdown()
-        md_label = MarkdownLabel(
-            text=full_sample_text,
-            size_hint_y=None,
-        )
-        md_label.bind(minimum_height=md_label.setter('height'))
-        md_label.bind(on_ref_press=self.on_ref_press)
-        section_layout.add_widget(md_label)
+            self.document_section = section_layout
+            self.document_header = header
+            return section_layout
 
-        section_layout.bind(minimum_height=section_layout.setter('height'))
-        return section_layout
+    def render_document(self, text):
+        """Create the widget displaying a full document.
+        
+        Args:
+            text: Markdown source of the document
+            
+        Returns:
+            BlockMarkdownView when documents are split (see
+            ``document_chunk_chars``), otherwise a MarkdownLabel (or
+            MarkdownSlot holding one)
+        """
+        chunk_chars = self.document_chunk_chars()
+        if chunk_chars is not None:
+            document_view = BlockMarkdownView(
+                self.create_markdown_label,
+                progressive=self.progressive,
+                chunk_chars=chunk_chars,
+                on_discard=self.label_registry.unregister_tree,
+            )
+            document_view.set_text(text)
+            return document_view
+        return self.create_markdown_label(text)
+
+    def document_chunk_chars(self):
+        """Return the chunk size documents are split at, or None when rendered whole."""
+        # Split at block boundaries; progressive mode streams chunks in over
+        # several frames. Watch mode keeps one widget per block so edits only
+        # re-render the blocks that changed, and the outline and search
+        # locate headings and matches by their block's widget.
+        if self.watch or self.outline or self.search_index is not None:
+            return 0
+        if self.progressive:
+            return DEFAULT_CHUNK_CHARS
+        return None
+
+    def document_texts(self, text):
+        """Return the Markdown texts ``render_document`` parses for ``text``."""
+        chunk_chars = self.document_chunk_chars()
+        if chunk_chars is None:
+            return [text]
+        return chunk_texts(text, chunk_chars, progressive=self.progressive)
+
+    def current_document_widget(self):
+        """Return the rendering of the current document, reusing a cached one.
+        
+        The local documents a new rendering links to are prefetched.
+        """
+        navigator = self.document_navigator()
+        if navigator is None:
+            widget = self.render_document(self.load_full_sample_markdown())
+            is_sample = True
+        else:
+            entry = navigator.document()
+            widget = entry.widget
+            if widget is not None and widget.parent is not None:
+                # Still attached to a section that was dropped without recycling
+                widget.parent.remove_widget(widget)
+            if widget is None:
+                widget = entry.widget = self.render_document(entry.text)
+                navigator.prefetch_links(entry)
+            else:
+                # Its labels left the registry when it was navigated away from
+                self.label_registry.register_tree(widget, DOCUMENT_SECTION)
+            is_sample = entry.path == SAMPLE_MARKDOWN_PATH.resolve()
+        if is_sample and isinstance(widget, BlockMarkdownView):
+            self.full_sample_view = widget
+        self.document_widget = widget
+        return widget
+
+    def document_title(self):
+        """Return the header text of the full sample section."""
+        if self.navigator is None or self.navigator.current == SAMPLE_MARKDOWN_PATH.resolve():
+            return "sample_markdown.md (full content)"
+        return os.path.relpath(self.navigator.current, SAMPLE_MARKDOWN_PATH.parent)
+
+    def document_navigator(self):
+        """Return the link navigator (None if disabled), starting it on first use."""
+        if self.navigate_links and self.navigator is None:
+            self.navigator = DocumentNavigator(
+                SAMPLE_MARKDOWN_PATH,
+                self.load_full_sample_markdown(),
+                on_evict=self._on_document_evicted,
+                render_texts=self.document_texts,
+            )
+        return self.navigator
+
+    def _on_document_evicted(self, entry):
+        """Recycle the rendering of a document dropped from the document cache."""
+        if entry.widget is not None and entry.widget.parent is None:
+            if entry.widget is self.full_sample_view:
+                self.full_sample_view = None
+            self.recycle(entry.widget)
+
+    def follow_link(self, ref):
+        """Open a clicked link in place if it points to a local Markdown file.
+        
+        Args:
+            ref: The clicked link target
+            
+        Returns:
+            True if a document was opened
+        """
+        navigator = self.document_navigator()
+        if navigator is None:
+            return False
+        path = resolve_link(ref, navigator.current)
+        if path is None:
+            return False
+        if not path.is_file():
+            print(f"Linked document not found: {path}")
+            return False
+        self.show_document_entry(navigator.open(path))
+        return True
+
+    def go_back(self):
+        """Show the previously opened document, if any."""
+        if self.navigator is not None:
+            entry = self.navigator.back()
+            if entry is not None:
+                self.show_document_entry(entry)
+
+    def go_forward(self):
+        """Show the document left with go_back(), if any."""
+        if self.navigator is not None:
+            entry = self.navigator.forward()
+            if entry is not None:
+                self.show_document_entry(entry)
+
+    def rerender_document(self):
+        """Render the current document again, e.g. after its chunking changed.
+
+        Cached renderings of other documents are dropped, so they are
+        rendered the same way when opened.
+        """
+        if self.navigator is not None:
+            current = self.navigator.document()
+            for entry in self.navigator.cache.documents():
+                if entry is not current:
+                    self._on_document_evicted(entry)
+                entry.widget = None
+        section = self.document_section
+        old = self.document_widget
+        if section is None or old is None or old.parent is not section:
+            # Not built or released; the next document section renders it anew
+            return
+        section.remove_widget(old)
+        if old is self.full_sample_view:
+            self.full_sample_view = None
+        self.recycle(old)
+        section.add_widget(self.current_document_widget())
+
+    def show_document_entry(self, entry):
+        """Swap the full sample section's content for the navigator's current document.
+        
+        A section that is not built (lazy startup, virtualized) shows the
+        current document once it is created.
+        
+        Args:
+            entry: CachedDocument that was opened
+        """
+        section = self.document_section
+        if section is None:
+            return
+        if self.document_widget is not None and self.document_widget.parent is section:
+            section.remove_widget(self.document_widget)
+            self.label_registry.unregister_tree(self.document_widget)
+        self.document_header.text = f"[b]{self.document_title()}[/b]"
+        section.add_widget(self.current_document_widget())
+        if self.search_index is not None:
+            self.refresh_search_index()
+        if self.outline_index is not None:
+            self.refresh_outline()
+        self.scroll_view.scroll_to(section, animate=False)
+        print(f"Opened {entry.path} (document cache: {self.navigator.cache.stats()})")
+
+    def markdown_label_class(self):
+        """Return the MarkdownLabel class, importing it on first use.
+        
+        The parse cache is installed before any label can parse.
+        """
+        global MarkdownLabel
+        self.install_parse_cache()
+        if MarkdownLabel is None:
+            from kivy_garden.markdownlabel import MarkdownLabel as label_class
+            MarkdownLabel = label_class
+        return MarkdownLabel
+
+    def install_parse_cache(self):
+        """Install the shared parse cache (and its disk layer) if enabled."""
+        if self.share_parse_cache:
+            parse_cache.install(disk_cache_dir=self.disk_cache_dir)
+
+    def create_markdown_label(self, text):
+        """Create a MarkdownLabel that sizes to its content and reports link clicks.
+        
+        With background parsing enabled this returns a sized slot that is
+        filled with the label once ``text`` has been parsed.
+        
+        Args:
+            text: Markdown source to display
+            
+        Returns:
+            MarkdownLabel widget (or MarkdownSlot holding one)
+        """
+        if self.background_parser is not None:
+            return self.background_parser.slot(text, partial(self._new_markdown_label, text))
+        return self._new_markdown_label(text)
+
+    def _new_markdown_label(self, text):
+        """Return a content-sized document MarkdownLabel for ``text`` (recycled if pooling)."""
+        md_label = self.pooled(
+            "markdown_label", partial(self._build_markdown_label, False), text=text, **self.style_overrides()
+        )
+        self.label_registry.register(md_label, DOCUMENT_SECTION)
+        return md_label
 
     def load_full_sample_markdown(self):
         """Load and cache the contents of sample_markdown.md."""
         if self._full_sample_cache is None:
-            sample_path = Path(__file__).with_name("sample_markdown.md")
             try:
-                self._full_sample_cache = sample_path.read_text(encoding="utf-8")
+                self._full_sample_cache = SAMPLE_MARKDOWN_PATH.read_text(encoding="utf-8")
             except Exception as exc:
                 self._full_sample_cache = "Failed to load sample_markdown.md"
                 print(f"Error loading sample_markdown.md: {exc}")
         return self._full_sample_cache
     
+    def start_watching(self):
+        """Start polling sample_markdown.md and live-update the full sample section."""
+        if self.file_watcher is None:
+            self.file_watcher = FileWatcher(SAMPLE_MARKDOWN_PATH, self.on_sample_changed)
+        self.file_watcher.start()
+
+    def on_sample_changed(self, text):
+        """Show a new version of sample_markdown.md.
+        
+        Args:
+            text: New file contents
+        """
+        self._full_sample_cache = text
+        if self.navigator is not None:
+            entry = self.navigator.cache.get(SAMPLE_MARKDOWN_PATH.resolve())
+            if entry is not None:
+                entry.text = text
+        if self.search_index is not None:
+            self.refresh_search_index()
+        # The section may not be built yet (lazy startup) or be released (virtualized);
+        # it then picks up the cached text when it is created
+        if self.full_sample_view is not None:
+            changed = self.full_sample_view.update_text(text)
+            print(f"Reloaded sample_markdown.md ({changed} block(s) re-rendered)")
+        if self.outline_index is not None:
+            self.refresh_outline()
+
+    def on_stop(self):
+        """Stop watching files, background workers and profilers when the app closes."""
+        if self.file_watcher is not None:
+            self.file_watcher.stop()
+        if self.background_parser is not None:
+            self.background_parser.shutdown()
+        if self.navigator is not None:
+            self.navigator.shutdown()
+        if self.layout_metrics is not None:
+            self.layout_metrics.uninstall()
+        if self.memory_profiler is not None:
+            # Sections built while scrolling (virtualized mode) are included here
+            self.report_memory()
+            self.memory_profiler.stop()
+
+    def bind_height(self, widget):
+        """Keep a widget's height equal to its minimum_height.
+        
+        With layout coalescing enabled the update is deferred to the layout
+        coordinator's next before-frame flush.
+        
+        Args:
+            widget: Layout or MarkdownLabel with a minimum_height property
+        """
+        if self.layout_coordinator is not None:
+            self.layout_coordinator.track_height(widget)
+        else:
+            widget.bind(minimum_height=widget.setter('height'))
+
+    def _count_rect_update(self, widget):
+        """Count a background rectangle moved by the layout coordinator."""
+        if self.layout_metrics is not None:
+            self.layout_metrics.count(widget, 'canvas_updates')
+
     def _update_rect(self, instance, value):
         """Update background rectangle position and size.
         
@@ -300,6 +1433,8 @@ class MarkdownDemoApp(App):
         if hasattr(instance, 'bg_rect'):
             instance.bg_rect.pos = instance.pos
             instance.bg_rect.size = instance.size
+            if self.layout_metrics is not None:
+                self.layout_metrics.count(instance, 'canvas_updates')
     
     def on_ref_press(self, instance, ref):
         """Handle link click events from MarkdownLabel.
@@ -310,9 +1445,185 @@ class MarkdownDemoApp(App):
         """
         try:
             print(f"Link clicked: {ref}")
+            self.follow_link(ref)
         except Exception as e:
             print(f"Error handling link click: {e}")
 
 
+def is_within(widget, ancestor):
+    """Return True if ``widget`` is ``ancestor`` or one of its descendants."""
+    while widget is not None:
+        if widget is ancestor:
+            return True
+        parent = widget.parent
+        # The Window is its own parent
+        widget = parent if parent is not widget else None
+    return False
+
+
+def parse_args(argv=None):
+    """Parse demo command-line options."""
+    parser = argparse.ArgumentParser(description="MarkdownLabel demo app")
+    parser.add_argument(
+        "--virtualized",
+        action="store_true",
+        help="Only build sections while they are near the visible area",
+    )
+    parser.add_argument(
+        "--lazy-startup",
+        action="store_true",
+        help="Draw the empty layout first and load sections after the first frame",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Print import times and time to first frame",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Re-render changed blocks of sample_markdown.md when the file is saved",
+    )
+    parser.add_argument(
+        "--background-parsing",
+        choices=["thread", "process"],
+        help="Parse Markdown on a worker pool and only build widgets on the main thread",
+    )
+    parser.add_argument(
+        "--share-renders",
+        action="store_true",
+        help="Render identical variations once and share the texture",
+    )
+    parser.add_argument(
+        "--coalesce-layout",
+        action="store_true",
+        help="Apply height and background updates once per frame",
+    )
+    parser.add_argument(
+        "--progressive",
+        action="store_true",
+        help="Render the full sample document block by block over several frames",
+    )
+    parser.add_argument(
+        "--stress-size",
+        type=parse_size,
+        metavar="SIZE",
+        help="Show SIZE (e.g. 10KB, 50MB) of generated Markdown instead of sample_markdown.md",
+    )
+    parser.add_argument(
+        "--stress-mix",
+        type=parse_mix,
+        metavar="MIX",
+        help="Block-type weights of the generated Markdown, e.g. paragraph=4,table=1,list=2,code=1,heading=1",
+    )
+    parser.add_argument(
+        "--stress-seed",
+        type=int,
+        default=0,
+        help="Random seed of the generated Markdown",
+    )
+    parser.add_argument(
+        "--stress-copies",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Show every property section N times",
+    )
+    parser.add_argument(
+        "--matrix",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        metavar="AXES",
+        help="Show every combination of these sections' variations, e.g. font_size,line_height,halign,color",
+    )
+    parser.add_argument(
+        "--disk-cache",
+        nargs="?",
+        const=parse_cache.default_disk_cache_dir(),
+        metavar="DIR",
+        help="Keep parsed Markdown on disk across runs (default DIR: %(const)s)",
+    )
+    parser.add_argument(
+        "--warm-fonts",
+        action="store_true",
+        help="Read fonts in the background and prerender the document's glyphs at startup",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        action="store_true",
+        help="Report allocations and texture memory per section",
+    )
+    parser.add_argument(
+        "--no-navigation",
+        action="store_true",
+        help="Only print clicked links instead of opening linked Markdown files in place",
+    )
+    parser.add_argument(
+        "--outline",
+        action="store_true",
+        help="Show a sidebar listing the sections and document headings; click one to jump to it",
+    )
+    parser.add_argument(
+        "--style-controls",
+        action="store_true",
+        help="Show sliders and pickers that restyle the MarkdownLabels live",
+    )
+    parser.add_argument(
+        "--pool-widgets",
+        action="store_true",
+        help="Recycle the widgets of released or rebuilt sections (F5 rebuilds every section)",
+    )
+    parser.add_argument(
+        "--hud",
+        action="store_true",
+        help="Show the frame-time and draw-call overlay (toggle with F12)",
+    )
+    parser.add_argument(
+        "--layout-metrics",
+        type=float,
+        metavar="SECONDS",
+        help="Report property dispatches, layout passes and canvas updates per section every SECONDS",
+    )
+    parser.add_argument(
+        "--layout-metrics-output",
+        metavar="PATH",
+        help="Append the layout metrics reports to PATH as JSON lines instead of printing them",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Run the demo app with command-line options."""
+    args = parse_args(argv)
+    startup_profile = None
+    if args.profile_startup:
+        startup_profile = StartupProfile(started=PROCESS_STARTED, profiler=IMPORT_PROFILER)
+    sample_text = None
+    if args.stress_size is not None:
+        sample_text = generate_markdown(args.stress_size, mix=args.stress_mix, seed=args.stress_seed)
+    MarkdownDemoApp(
+        sample_text=sample_text,
+        section_copies=args.stress_copies,
+        virtualized=args.virtualized,
+        progressive=args.progressive,
+        lazy_startup=args.lazy_startup,
+        startup_profile=startup_profile,
+        watch=args.watch,
+        background_parsing=args.background_parsing,
+        share_renders=args.share_renders,
+        coalesce_layout=args.coalesce_layout,
+        layout_metrics_interval=args.layout_metrics,
+        layout_metrics_path=args.layout_metrics_output,
+        hud=args.hud,
+        matrix_axes=args.matrix,
+        disk_cache_dir=args.disk_cache,
+        warm_fonts=args.warm_fonts,
+        profile_memory=args.profile_memory,
+        pool_widgets=args.pool_widgets,
+        style_controls=args.style_controls,
+        navigate_links=not args.no_navigation,
+        outline=args.outline,
+    ).run()
+
+
 if __name__ == '__main__':
-    MarkdownDemoApp().run()
+    main()
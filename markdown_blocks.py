@@ -0,0 +1,417 @@
+"""Block-level splitting and rendering of long Markdown documents.
+
+A single ``MarkdownLabel`` has to parse and lay out its whole document before
+anything appears. ``BlockMarkdownView`` instead splits the source at
+top-level block boundaries (blank lines outside fenced code and indented
+continuations) and renders the document as a column of one label per chunk
+of blocks.
+
+With ``progressive=True`` the chunks are appended over successive Clock
+frames, each frame spending at most ``frame_budget`` seconds, while a
+"loading" label sits below the rendered part. Lines are split lazily and
+link reference definitions are collected chunk by chunk, so the first frame
+only has to split and render the first chunk: first content appears within
+a fixed budget regardless of document size, and the already rendered part
+can be scrolled while the rest streams in. When a later chunk defines a
+reference (``[id]: url``), the rendered chunks using that label are
+rendered again with the definition appended.
+
+``update_text`` diffs a new version of the document against the displayed
+one at block level and only replaces the widgets of blocks that changed, so
+a one-line edit re-renders one block instead of the whole document.
+
+``chunk_texts`` lists the texts a view renders for a document, so they can
+be parsed ahead of it.
+"""
+
+import difflib
+import re
+import time
+from collections import defaultdict
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+# Characters of Markdown source rendered per label; keeps widget counts low
+# while bounding the cost of rendering a single chunk.
+DEFAULT_CHUNK_CHARS = 4000
+
+# Time spent appending chunks per frame in progressive mode (~half a 60 fps frame).
+DEFAULT_FRAME_BUDGET = 0.008
+
+# Opening line of a fenced code block; group 1 is the fence
+
+FENCE_RE = re.compile(r"^ {0,3}(`{3,}|~{3,})")
+_REF_DEF_RE = re.compile(r"^ {0,3}\[[^\]\n]+\]:[ \t]*\S.*$", re.MULTILINE)
+_REF_LABEL_RE = re.compile(r"^ {0,3}\[([^\]\n]+)\]:")
+_BRACKET_RE = re.compile(r"\[([^\]\n]+)\]")
+
+
+def iter_lines(text):
+    """Yield the lines of ``text`` without line endings, splitting lazily.
+
+    Equivalent to ``text.splitlines()`` for ``\\n`` and ``\\r\\n`` line
+    endings, but only scans as far as the caller consumes.
+    """
+    start = 0
+    length = len(text)
+    while start < length:
+        end = text.find("\n", start)
+        if end == -1:
+            end = length
+        line = text[start:end]
+        yield line[:-1] if line.endswith("\r") else line
+        start = end + 1
+
+
+def iter_blocks(text):
+    """Yield top-level Markdown blocks from ``text`` in order.
+
+    Blocks are separated by blank lines, except inside fenced code blocks and
+    when the next non-blank line is indented (a continuation of a list item
+    or indented code).
+
+    Args:
+        text: Markdown source
+
+    Yields:
+        Block source strings without surrounding blank lines
+    """
+    current = []
+    pending_blank = 0
+    fence = None
+
+    for line in iter_lines(text):
+        if fence is not None:
+            current.append(line)
+            stripped = line.strip()
+            if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                fence = None
+            continue
+
+        if not line.strip():
+            if current:
+                pending_blank += 1
+            continue
+
+        if pending_blank:
+            if line[:1] in (" ", "\t"):
+                current.extend([""] * pending_blank)
+            else:
+                yield "\n".join(current)
+                current = []
+            pending_blank = 0
+
+        match = FENCE_RE.match(line)
+        if match:
+            fence = match.group(1)
+        current.append(line)
+
+    if current:
+        yield "\n".join(current)
+
+
+def split_blocks(text):
+    """Return the list of top-level Markdown blocks in ``text``."""
+    return list(iter_blocks(text))
+
+
+def reference_definitions(text):
+    """Return link reference definitions (``[id]: url``) found in ``text``.
+
+    Chunks rendered separately need these appended so reference-style links
+    still resolve.
+    """
+    return _REF_DEF_RE.findall(text)
+
+
+def reference_suffix(definitions):
+    """Return the text appended to every chunk for ``definitions``."""
+    return "\n\n" + "\n".join(definitions) if definitions else ""
+
+
+def iter_chunks(blocks, chunk_chars=DEFAULT_CHUNK_CHARS):
+    """Group consecutive blocks into chunks of roughly ``chunk_chars``.
+
+    Args:
+        blocks: Iterable of block strings
+        chunk_chars: Target chunk size; 0 yields one chunk per block
+
+    Yields:
+        Chunk source strings
+    """
+    group = []
+    size = 0
+    for block in blocks:
+        group.append(block)
+        size += len(block)
+        if size >= chunk_chars:
+            yield "\n\n".join(group)
+            group = []
+            size = 0
+    if group:
+        yield "\n\n".join(group)
+
+
+def chunk_texts(text, chunk_chars=DEFAULT_CHUNK_CHARS, progressive=False):
+    """Yield every text ``BlockMarkdownView.set_text`` renders for ``text``.
+
+    These are the texts handed to the view's label factory, in order: each
+    chunk with the reference suffix and, in progressive mode, the earlier
+    chunks rendered again once a later chunk defines a label they use.
+    Parsing them ahead (e.g. into the parse cache) lets the view's labels
+    find their tokens cached.
+
+    Args:
+        text: Markdown source
+        chunk_chars: Target chunk size, as passed to the view
+        progressive: Whether the view renders progressively
+    """
+    chunks = iter_chunks(iter_blocks(text), chunk_chars)
+    if not progressive:
+        suffix = reference_suffix(reference_definitions(text))
+        for chunk in chunks:
+            yield chunk + suffix
+        return
+    collector = ReferenceCollector()
+    rendered = []
+    for position, chunk in enumerate(chunks):
+        for earlier in collector.add(position, chunk):
+            yield rendered[earlier] + collector.suffix
+        rendered.append(chunk)
+        yield chunk + collector.suffix
+
+
+def diff_blocks(old_blocks, new_blocks):
+    """Return the edit operations turning ``old_blocks`` into ``new_blocks``.
+
+    Args:
+        old_blocks: Block strings currently displayed
+        new_blocks: Block strings of the new document version
+
+    Returns:
+        List of difflib opcodes ``(tag, i1, i2, j1, j2)`` where tag is one of
+        'equal', 'replace', 'delete' or 'insert'
+    """
+    matcher = difflib.SequenceMatcher(None, old_blocks, new_blocks, autojunk=False)
+    return matcher.get_opcodes()
+
+
+class ReferenceCollector:
+    """Link reference definitions collected from chunks streamed in order."""
+
+    def __init__(self):
+        """Start without chunks or definitions."""
+        self.definitions = []
+        self.suffix = ""
+        # Lowercase bracketed label -> positions of the chunks using it
+        self._references = defaultdict(list)
+
+    def add(self, position, chunk):
+        """Record the labels and definitions of the chunk at ``position``.
+
+        Returns:
+            Sorted positions of earlier chunks using a label defined by
+            ``chunk``; they need rendering again with the extended ``suffix``
+        """
+        for label in set(_BRACKET_RE.findall(chunk.lower())):
+            self._references[label].append(position)
+        definitions = _REF_DEF_RE.findall(chunk)
+        if not definitions:
+            return []
+        self.definitions.extend(definitions)
+        self.suffix = reference_suffix(self.definitions)
+        stale = set()
+        for definition in definitions:
+            label = _REF_LABEL_RE.match(definition).group(1).lower()
+            stale.update(earlier for earlier in self._references.get(label, ()) if earlier < position)
+        return sorted(stale)
+
+
+class BlockMarkdownView(BoxLayout):
+    """Vertical column of Markdown chunks, optionally rendered progressively."""
+
+    __events__ = ('on_loaded',)
+
+    def __init__(self, label_factory, progressive=False, chunk_chars=DEFAULT_CHUNK_CHARS,
+                 frame_budget=DEFAULT_FRAME_BUDGET, on_discard=None, **kwargs):
+        """Create an empty view.
+
+        Args:
+            label_factory: Callable taking chunk text and returning a widget
+            progressive: If True, append chunks over successive frames
+            chunk_chars: Target Markdown characters per rendered chunk
+            frame_budget: Seconds spent rendering chunks per frame
+            on_discard: Optional callable receiving every chunk widget that
+                is removed because its text was replaced
+        """
+        kwargs.setdefault('orientation', 'vertical')
+        kwargs.setdefault('size_hint_y', None)
+        super().__init__(**kwargs)
+        self.bind(minimum_height=self.setter('height'))
+        self.label_factory = label_factory
+        self.progressive = progressive
+        self.chunk_chars = chunk_chars
+        self.frame_budget = frame_budget
+        self.on_discard = on_discard
+        self.blocks = []
+        self.block_widgets = []
+        self.loading = False
+        self._pending = None
+        self._suffix = ""
+        # Definitions collected while chunks stream in (progressive mode)
+        self._collector = None
+        self._event = None
+        self._loading_label = None
+
+    def set_text(self, text):
+        """Replace the displayed document with ``text``.
+
+        Args:
+            text: Markdown source to display
+        """
+        self._cancel()
+        self.clear_widgets()
+        self._discard(self.block_widgets)
+        self.blocks = []
+        self.block_widgets = []
+        self._collector = None
+        self._pending = iter_chunks(iter_blocks(text), self.chunk_chars)
+
+        if not self.progressive:
+            self._suffix = reference_suffix(reference_definitions(text))
+            for chunk in self._pending:
+                self._append_chunk(chunk)
+            self._pending = None
+            self.dispatch('on_loaded')
+            return
+
+        # Collected while the chunks are appended (see _append_chunk)
+        self._collector = ReferenceCollector()
+        self._suffix = ""
+        self.loading = True
+        self._loading_label = Label(
+            text="Loading…",
+            size_hint_y=None,
+            height=40,
+            color=[0.7, 0.7, 0.7, 1],
+        )
+        self.add_widget(self._loading_label)
+        # Render the first slice right away so first content shows on the first frame
+        self._render_slice()
+
+    def update_text(self, text):
+        """Show a new version of the document, re-rendering only changed chunks.
+
+        Falls back to ``set_text`` while a progressive render is running or
+        when the link reference definitions (appended to every chunk) changed.
+
+        Args:
+            text: New Markdown source
+
+        Returns:
+            Number of chunk widgets that were created
+        """
+        suffix = reference_suffix(reference_definitions(text))
+        if self.loading or suffix != self._suffix:
+            self.set_text(text)
+            return len(self.block_widgets)
+
+        new_blocks = list(iter_chunks(iter_blocks(text), self.chunk_chars))
+        old_widgets = self.block_widgets
+        new_widgets = []
+        created = []
+        for tag, i1, i2, j1, j2 in diff_blocks(self.blocks, new_blocks):
+            if tag == 'equal':
+                new_widgets.extend(old_widgets[i1:i2])
+                continue
+            for widget in old_widgets[i1:i2]:
+                self.remove_widget(widget)
+            self._discard(old_widgets[i1:i2])
+            for position in range(j1, j2):
+                widget = self.label_factory(new_blocks[position] + self._suffix)
+                new_widgets.append(widget)
+                created.append((position, widget))
+
+        # Insert in document order; every earlier block is already in place, so
+        # ``position`` widgets precede the new one in reversed children order.
+        for position, widget in created:
+            self.add_widget(widget, index=len(self.children) - position)
+
+        self.blocks = new_blocks
+        self.block_widgets = new_widgets
+        return len(created)
+
+    def _discard(self, widgets):
+        """Report removed chunk widgets to ``on_discard``."""
+        if self.on_discard is not None:
+            for widget in widgets:
+                self.on_discard(widget)
+
+    def _append_chunk(self, chunk):
+        """Render one chunk and insert it above the loading label."""
+        if self.loading:
+            self._collect_definitions(chunk)
+        widget = self.label_factory(chunk + self._suffix if self._suffix else chunk)
+        # Kivy inserts at ``index`` counted from the end of the children list
+        index = 1 if self._loading_label is not None else 0
+        self.add_widget(widget, index=index)
+        self.blocks.append(chunk)
+        self.block_widgets.append(widget)
+
+    def _collect_definitions(self, chunk):
+        """Record the references and definitions of a chunk streamed in.
+
+        Chunks rendered earlier that use a label defined here are rendered
+        again with the extended suffix.
+        """
+        stale = self._collector.add(len(self.blocks), chunk)
+        self._suffix = self._collector.suffix
+        for earlier in stale:
+            self._rerender_chunk(earlier)
+
+    def _rerender_chunk(self, position):
+        """Replace the widget of chunk ``position`` using the current suffix."""
+        old = self.block_widgets[position]
+        widget = self.label_factory(self.blocks[position] + self._suffix)
+        index = self.children.index(old)
+        self.remove_widget(old)
+        self.add_widget(widget, index=index)
+        self.block_widgets[position] = widget
+        self._discard([old])
+
+    def _render_slice(self, *args):
+        """Append chunks until the frame budget is spent, then reschedule."""
+        # Also called directly (first slice), so drop a slice that is still scheduled
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        deadline = time.perf_counter() + self.frame_budget
+        for chunk in self._pending:
+            self._append_chunk(chunk)
+            if time.perf_counter() >= deadline:
+                self._event = Clock.schedule_once(self._render_slice, 0)
+                return
+        self._finish()
+
+    def _finish(self):
+        """Remove the loading placeholder once every chunk is rendered."""
+        self._pending = None
+        self.loading = False
+        if self._loading_label is not None:
+            self.remove_widget(self._loading_label)
+            self._loading_label = None
+        self.dispatch('on_loaded')
+
+    def _cancel(self):
+        """Stop an in-progress progressive render."""
+        if self._event is not None:
+            self._event.cancel()
+            self._event = None
+        self._pending = None
+        self._loading_label = None
+        self.loading = False
+
+    def on_loaded(self):
+        """Fired when every chunk of the current document has been rendered."""
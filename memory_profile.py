@@ -0,0 +1,215 @@
+"""Per-section memory accounting.
+
+``MemoryProfiler`` is registered as a section hook: it reads tracemalloc's
+traced memory before and after each section is built and keeps, per section
+title, the net change and the peak reached during the build. Python-side
+costs of widgets, bindings and parsed tokens show up there. The first build
+of each section is also compared between two snapshots to find its top
+allocating source lines; snapshots copy every trace, so later builds (e.g.
+sections rebuilt while scrolling in virtualized mode) skip them.
+
+Textures live in GPU memory and are created after layout, so they are
+estimated separately from the live widget tree: ``texture_report`` sums
+width x height x bytes per pixel of every distinct texture under each
+MarkdownLabel and groups the totals by section.
+"""
+
+import tracemalloc
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+from kivy.graphics import Rectangle
+
+# tracemalloc.reset_peak needs Python 3.9; without it peaks are not reported
+_reset_peak = getattr(tracemalloc, "reset_peak", None)
+
+BYTES_PER_PIXEL = {"rgba": 4, "bgra": 4, "rgb": 3, "bgr": 3, "luminance_alpha": 2, "luminance": 1, "alpha": 1}
+
+
+def texture_bytes(texture):
+    """Estimate the GPU memory used by ``texture`` in bytes."""
+    width, height = texture.size
+    return int(width * height * BYTES_PER_PIXEL.get(texture.colorfmt, 4))
+
+
+def widget_textures(widget):
+    """Return {id: texture} of the textures used by ``widget`` and its children.
+
+    Both widget ``texture`` properties (labels, images) and textured canvas
+    instructions (e.g. shared snapshots) are included. Kivy's default
+    texture, which untextured shapes share, is left out.
+    """
+    default_texture = Rectangle().texture
+    textures = {}
+    for node in widget.walk(restrict=True):
+        candidates = [getattr(node, 'texture', None)]
+        for canvas in (node.canvas.before, node.canvas, node.canvas.after):
+            candidates.extend(getattr(instruction, 'texture', None) for instruction in canvas.children)
+        for texture in candidates:
+            if texture is not None and texture is not default_texture:
+                textures[id(texture)] = texture
+    return textures
+
+
+def sections_under(root):
+    """Yield (title, widget) for the outermost widgets with a ``section_title``."""
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        title = getattr(widget, 'section_title', None)
+        if title is not None:
+            yield title, widget
+            continue
+        stack.extend(widget.children)
+
+
+def texture_report(root, is_markdown_label, labels_of=None):
+    """Estimate texture memory per section and per MarkdownLabel.
+
+    Args:
+        root: Widget containing the sections
+        is_markdown_label: Predicate telling whether a widget is a MarkdownLabel
+        labels_of: Optional callable returning the MarkdownLabels of a section
+            title (e.g. from an index), used instead of walking each section
+
+    Returns:
+        Dict of section title to {"texture_bytes", "labels", "largest_label_bytes"}
+    """
+    report = {}
+    for title, section in sections_under(root):
+        if labels_of is not None:
+            labels = labels_of(title)
+        else:
+            labels = [widget for widget in section.walk(restrict=True) if is_markdown_label(widget)]
+        label_bytes = [sum(texture_bytes(t) for t in widget_textures(label).values()) for label in labels]
+        report[title] = {
+            "texture_bytes": sum(texture_bytes(t) for t in widget_textures(section).values()),
+            "labels": len(labels),
+            "largest_label_bytes": max(label_bytes, default=0),
+        }
+    return report
+
+
+class MemoryProfiler:
+    """Record tracemalloc differences around section construction."""
+
+    def __init__(self, top=10, frames=1):
+        """Configure the profiler.
+
+        Args:
+            top: Number of allocation sites kept per section; 0 skips the
+                snapshots entirely
+            frames: Stack frames stored per allocation (1 groups by source line)
+        """
+        self.top = top
+        self.frames = frames
+        self.builds = Counter()
+        self.net = Counter()
+        self.peak = {}
+        self.sites = defaultdict(Counter)
+        self._started = False
+        # [peak seen so far] of the section builds in progress, outermost first
+        self._active = []
+
+    def start(self):
+        """Start tracing allocations unless tracemalloc already runs."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self._started = True
+
+    def stop(self):
+        """Stop tracing allocations if ``start`` started it."""
+        if self._started:
+            tracemalloc.stop()
+            self._started = False
+
+    def _note_peak(self):
+        """Fold the traced peak into every build in progress and reset it."""
+        if _reset_peak is None:
+            return
+        peak = tracemalloc.get_traced_memory()[1]
+        for seen in self._active:
+            seen[0] = max(seen[0], peak)
+        _reset_peak()
+
+    @contextmanager
+    def section_hook(self, title):
+        """Section hook recording what building section ``title`` allocated."""
+        if not tracemalloc.is_tracing():
+            yield
+            return
+        before = tracemalloc.take_snapshot() if self.top and not self.builds[title] else None
+        # A nested build resets the peak, so outer builds keep the peak seen so far
+        self._note_peak()
+        start = tracemalloc.get_traced_memory()[0]
+        seen = [start]
+        self._active.append(seen)
+        try:
+            yield
+        finally:
+            self._note_peak()
+            self._active.remove(seen)
+            current = tracemalloc.get_traced_memory()[0]
+            self.builds[title] += 1
+            self.net[title] += current - start
+            if _reset_peak is not None:
+                self.peak[title] = max(self.peak.get(title, 0), seen[0] - start)
+            if before is not None:
+                self._record_sites(title, before)
+
+    def _record_sites(self, title, before):
+        """Keep the source lines that allocated since ``before`` for ``title``."""
+        after = tracemalloc.take_snapshot()
+        # Ignore the profiler's own bookkeeping
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+        stats = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        for stat in stats:
+            # Frees show up as negative differences; only allocations are sites
+            if stat.size_diff > 0:
+                frame = stat.traceback[0]
+                self.sites[title][f"{frame.filename}:{frame.lineno}"] += stat.size_diff
+
+    def report(self, root=None, is_markdown_label=None, labels_of=None):
+        """Return the allocations (and texture estimates) per section.
+
+        Args:
+            root: If given with ``is_markdown_label``, texture memory of the
+                sections currently under it is estimated too
+            is_markdown_label: Predicate telling whether a widget is a MarkdownLabel
+            labels_of: Optional callable returning the MarkdownLabels of a section
+
+        Returns:
+            Dict of section title to builds, net bytes (allocations minus
+            frees, summed over builds), peak bytes above the start of a build
+            (None before Python 3.9), top sites of the first build and
+            (optionally) texture estimates, largest net allocation first
+        """
+        textures = texture_report(root, is_markdown_label, labels_of) if root is not None else {}
+        report = {}
+        for title in sorted(self.net, key=self.net.get, reverse=True):
+            report[title] = {
+                "builds": self.builds[title],
+                "net_bytes": self.net[title],
+                "peak_bytes": self.peak.get(title),
+                "top_sites": self.sites[title].most_common(self.top),
+            }
+            if title in textures:
+                report[title].update(textures[title])
+        return report
+
+    def format_report(self, root=None, is_markdown_label=None, labels_of=None):
+        """Return ``report()`` as readable text."""
+        lines = ["Memory per section (tracemalloc, texture estimates):"]
+        for title, entry in self.report(root, is_markdown_label, labels_of).items():
+            summary = f"  {title}: {entry['net_bytes'] / 1024:.1f} KiB net in {entry['builds']} build(s)"
+            if entry["peak_bytes"] is not None:
+                summary += f", peak {entry['peak_bytes'] / 1024:.1f} KiB"
+            if "texture_bytes" in entry:
+                summary += (
+                    f", {entry['texture_bytes'] / 1024:.1f} KiB textures "
+                    f"({entry['labels']} labels, largest {entry['largest_label_bytes'] / 1024:.1f} KiB)"
+                )
+            lines.append(summary)
+            for site, size in entry["top_sites"]:
+                lines.append(f"      {size / 1024:9.1f} KiB  {site}")
+        return "\n".join(lines)
@@ -0,0 +1,203 @@
+"""Heading outline with precomputed scroll offsets.
+
+``document_headings`` extracts the ATX and setext headings of a document in
+the same block pass the document views use (``split_blocks``), recording
+each heading's block and character position. ``OutlineIndex`` combines them
+with the demo's sections into a flat list of entries and keeps an array of
+their y-offsets from the top of the scrolled content.
+
+Offsets are recomputed once after the content's height changed (one pass
+over the entries, with each widget's position looked up once), not while
+scrolling, so jumping to an entry is an array lookup. ``OutlineSidebar`` is
+a RecycleView listing the entries; it only creates rows for the visible
+part of the list, so documents with thousands of headings stay cheap.
+"""
+
+import re
+from array import array
+from collections import namedtuple
+
+from kivy.clock import Clock
+from kivy.properties import NumericProperty
+from kivy.uix.button import Button
+from kivy.uix.recycleview import RecycleView
+
+from markdown_blocks import FENCE_RE
+
+_ATX_RE = re.compile(r"^ {0,3}(#{1,6})(?:[ \t]+(.*?))?(?:[ \t]+#+)?[ \t]*$")
+_SETEXT_RE = re.compile(r"^ {0,3}(=+|-+)[ \t]*$")
+_INLINE_MARKUP_RE = re.compile(r"[*_`]|\[([^\]]*)\]\([^)]*\)")
+
+SIDEBAR_WIDTH = 280
+ROW_HEIGHT = 28
+SCROLL_MARGIN = 10
+
+Heading = namedtuple("Heading", ["level", "title", "block", "within", "offset"])
+OutlineEntry = namedtuple("OutlineEntry", ["title", "level", "kind", "key"])
+
+
+def plain_title(text):
+    """Return heading text without emphasis, code and link markup."""
+    return _INLINE_MARKUP_RE.sub(lambda found: found.group(1) or "", text).strip()
+
+
+def document_headings(blocks):
+    """Return the headings of a document split into blocks.
+
+    Args:
+        blocks: Block strings from ``split_blocks``
+
+    Returns:
+        List of Heading(level, title, block, within, offset): ``within`` is
+        the heading's position as a fraction of its block, ``offset`` its
+        character position in the concatenated blocks
+    """
+    headings = []
+    start = 0
+    for number, block in enumerate(blocks):
+        lines = block.split("\n")
+        position = 0
+        fence = None
+        for index, line in enumerate(lines):
+            line_start = position
+            position += len(line) + 1
+            if fence is not None:
+                stripped = line.strip()
+                if stripped.startswith(fence) and not stripped.strip(fence[0]):
+                    fence = None
+                continue
+            match = FENCE_RE.match(line)
+            if match:
+                fence = match.group(1)
+                continue
+            level = title = None
+            match = _ATX_RE.match(line)
+            if match:
+                level, title = len(match.group(1)), match.group(2) or ""
+            elif index + 1 < len(lines) and line.strip() and _SETEXT_RE.match(lines[index + 1]):
+                if not line.startswith("    "):
+                    level, title = (1 if lines[index + 1].strip()[0] == "=" else 2), line
+            if level is not None:
+                within = line_start / len(block) if block else 0.0
+                headings.append(Heading(level, plain_title(title), number, within, start + line_start))
+        start += len(block)
+    return headings
+
+
+class OutlineIndex:
+    """Outline entries and their y-offsets in the scrolled content."""
+
+    def __init__(self, layout, locate):
+        """Create an empty outline.
+
+        Args:
+            layout: Scrolled content layout the offsets are measured in
+            locate: Callable taking an OutlineEntry and returning
+                (widget, fraction): the widget showing the entry and the
+                entry's position as a fraction of its height from the top
+        """
+        self.layout = layout
+        self.locate = locate
+        self.entries = []
+        self.offsets = array('d')
+        self.refreshes = 0
+        self._trigger = Clock.create_trigger(self.refresh)
+        layout.bind(height=self._trigger)
+
+    def set_entries(self, entries):
+        """Replace the outline and compute the offsets of the new entries."""
+        self.entries = list(entries)
+        self.refresh()
+
+    def refresh(self, *args):
+        """Recompute every entry's distance from the top of the content."""
+        layout = self.layout
+        tops = {}
+        offsets = array('d')
+        for entry in self.entries:
+            widget, fraction = self.locate(entry)
+            if widget is None:
+                offsets.append(0.0)
+                continue
+            geometry = tops.get(widget)
+            if geometry is None:
+                _, top = layout.to_widget(*widget.to_window(widget.x, widget.top))
+                geometry = tops[widget] = (top, widget.height)
+            top, height = geometry
+            offsets.append(layout.top - top + height * fraction)
+        self.offsets = offsets
+        self.refreshes += 1
+
+    def scroll_y_for(self, index, view_height):
+        """Return the ScrollView ``scroll_y`` that shows entry ``index`` at the top."""
+        scrollable = self.layout.height - view_height
+        if scrollable <= 0:
+            return 1.0
+        scroll_y = 1 - (self.offsets[index] - SCROLL_MARGIN) / scrollable
+        return min(max(scroll_y, 0.0), 1.0)
+
+
+class OutlineRow(Button):
+    """One outline entry in the sidebar."""
+
+    outline_index = NumericProperty(0)
+
+    def __init__(self, **kwargs):
+        """Create a row; the RecycleView sets its text and ``outline_index``."""
+        super().__init__(halign='left', valign='middle', shorten=True, padding=(8, 0), **kwargs)
+        self.bind(size=self._fit_text)
+
+    def _fit_text(self, instance, size):
+        """Left-align the (indented) title within the row."""
+        self.text_size = size
+
+    def on_release(self):
+        """Report this row's entry to the sidebar it is shown in."""
+        # Rows live in the RecycleView's layout
+        sidebar = self.parent.parent if self.parent is not None else None
+        if isinstance(sidebar, OutlineSidebar):
+            sidebar.select(int(self.outline_index))
+
+
+class OutlineSidebar(RecycleView):
+    """Table of contents listing outline entries."""
+
+    def __init__(self, on_select, **kwargs):
+        """Create an empty sidebar.
+
+        Args:
+            on_select: Called with the index of the clicked entry
+        """
+        super().__init__(size_hint_x=None, width=SIDEBAR_WIDTH, **kwargs)
+        self.on_select = on_select
+        self.viewclass = OutlineRow
+        self.add_widget(_row_layout())
+
+    def show_entries(self, entries):
+        """List ``entries``, indented by heading level."""
+        self.data = [
+            {
+                "text": "    " * max(entry.level - 1, 0) + entry.title,
+                "outline_index": index,
+                "bold": entry.kind == "section",
+            }
+            for index, entry in enumerate(entries)
+        ]
+
+    def select(self, index):
+        """Report a clicked entry."""
+        self.on_select(index)
+
+
+def _row_layout():
+    """Return the vertical RecycleBoxLayout holding the sidebar rows."""
+    from kivy.uix.recycleboxlayout import RecycleBoxLayout
+
+    layout = RecycleBoxLayout(
+        orientation='vertical',
+        size_hint_y=None,
+        default_size=(None, ROW_HEIGHT),
+        default_size_hint=(1, None),
+    )
+    layout.bind(minimum_height=layout.setter('height'))
+    return layout
@@ -0,0 +1,497 @@
+"""Process-wide cache of parsed Markdown token trees.
+
+Every ``MarkdownLabel`` parses its ``text`` through a mistune ``Markdown``
+instance. The demo builds many labels from the same source (all variations
+share ``SAMPLE_MARKDOWN``), so the identical document would otherwise be
+parsed once per widget.
+
+``install()`` wraps ``mistune.Markdown.parse`` so parse results are stored in
+a shared LRU cache keyed by a hash of the source text plus the parser's
+configuration (renderer, block/inline rules and hooks). Labels created with
+the same text and the same parser options then only pay for their own
+styling pass.
+
+With a ``DiskCache`` (``install(disk_cache_dir=...)``) parse results also
+survive restarts: token trees are stored as zlib-compressed ``marshal`` data,
+one file per entry, keyed by the text hash, the parser signature, the
+installed mistune and markdownlabel versions and the Python/marshal version
+(marshal data is not portable across Python versions). Files are written
+atomically and the least recently used ones are evicted once the directory
+exceeds its size bound, so a warm start does not parse at all.
+"""
+
+import hashlib
+import marshal
+import os
+import sys
+import tempfile
+import threading
+import warnings
+import zlib
+from collections import OrderedDict
+from importlib import metadata
+from pathlib import Path
+
+# Number of distinct (text, parser options) entries kept in memory.
+DEFAULT_MAXSIZE = 128
+
+# Size bound of the on-disk cache directory.
+DEFAULT_DISK_MAX_BYTES = 64 * 1024 * 1024
+DISK_ENTRY_SUFFIX = ".tokens"
+
+# Plugins enabled by MarkdownLabel's parser; used when code outside a label
+# needs a parser that produces the same tokens (and cache keys).
+MARKDOWNLABEL_PLUGINS = ("table", "strikethrough", "task_lists")
+
+
+def text_digest(text):
+    """Return the content hash used in cache keys.
+
+    Args:
+        text: Markdown source string
+
+    Returns:
+        Hex digest of the UTF-8 encoded text
+    """
+    return hashlib.sha256(text.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _callable_name(func):
+    """Return a stable name for a plugin hook or renderer."""
+    module = getattr(func, "__module__", "")
+    name = getattr(func, "__qualname__", None) or type(func).__qualname__
+    return f"{module}.{name}"
+
+
+def parser_signature(md):
+    """Describe the options of a mistune ``Markdown`` instance.
+
+    Two parser instances with the same signature produce the same tokens for
+    the same input, so their results can share cache entries.
+
+    Args:
+        md: mistune ``Markdown`` instance
+
+    Returns:
+        Hashable tuple describing renderer, rules and hooks
+    """
+    renderer = md.renderer
+    renderer_key = None
+    if renderer is not None:
+        renderer_key = (_callable_name(renderer), getattr(renderer, "_escape", None))
+    return (
+        renderer_key,
+        tuple(md.block.rules),
+        tuple(md.inline.rules),
+        getattr(md.inline, "hard_wrap", False),
+        tuple(_callable_name(hook) for hook in md.before_parse_hooks),
+        tuple(_callable_name(hook) for hook in md.before_render_hooks),
+        tuple(_callable_name(hook) for hook in md.after_render_hooks),
+    )
+
+
+class ParseCache:
+    """Thread-safe LRU mapping of (text hash, parser signature) to results."""
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of entries before LRU eviction
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of cached parse results."""
+        return len(self._entries)
+
+    def get(self, key):
+        """Return the cached ``(result, state)`` pair for ``key`` or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, result, state):
+        """Store a parse result, evicting least recently used entries."""
+        with self._lock:
+            self._entries[key] = (result, state)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries and reset the hit/miss counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return a dict with size and hit/miss counters."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+def default_disk_cache_dir():
+    """Return the per-user directory used for the on-disk parse cache."""
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "markdownlabel_testapp" / "parse"
+
+
+def parser_versions():
+    """Return the installed (mistune, markdownlabel) versions.
+
+    Both are part of on-disk keys: a new parser or label version may produce
+    different tokens for the same text.
+    """
+    versions = []
+    for name in ("mistune", "kivy_garden.markdownlabel"):
+        try:
+            versions.append(metadata.version(name))
+        except metadata.PackageNotFoundError:
+            versions.append(None)
+    return tuple(versions)
+
+
+class DiskCache:
+    """Size-bounded directory of compressed token trees."""
+
+    def __init__(self, directory, max_bytes=DEFAULT_DISK_MAX_BYTES):
+        """Use (and create) ``directory`` for cache files.
+
+        Args:
+            directory: Cache directory
+            max_bytes: Total size of the entries before the least recently
+                used ones are evicted
+        """
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        # marshal's format may change between Python versions
+        self.versions = parser_versions() + (tuple(sys.version_info[:2]), marshal.version)
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        # Running size of the entries, so writes do not rescan the directory.
+        # Scanned on the first write; other processes sharing the directory
+        # make it approximate, which the rescan in evict() corrects.
+        self._total_bytes = None
+        self._lock = threading.Lock()
+
+    def path_for(self, key):
+        """Return the file holding the entry for a ``cache_key`` result."""
+        digest = hashlib.sha256(repr((key, self.versions)).encode("utf-8")).hexdigest()
+        return self.directory / f"{digest}{DISK_ENTRY_SUFFIX}"
+
+    def get(self, key):
+        """Return the ``(tokens, env)`` stored for ``key`` or None."""
+        path = self.path_for(key)
+        try:
+            data = path.read_bytes()
+            tokens, env = marshal.loads(zlib.decompress(data))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, ValueError, EOFError, TypeError, zlib.error):
+            # Truncated or foreign file: drop it and parse again
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+        # The modification time doubles as the LRU timestamp
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        self.hits += 1
+        return tokens, env
+
+    def put(self, key, tokens, env=None):
+        """Store ``tokens`` (and the parser state's ``env``) for ``key``.
+
+        Entries that ``marshal`` cannot represent are not stored.
+        """
+        try:
+            payload = marshal.dumps((tokens, env))
+        except ValueError:
+            try:
+                payload = marshal.dumps((tokens, None))
+            except ValueError:
+                return
+        data = zlib.compress(payload, 6)
+        path = self.path_for(key)
+        try:
+            replaced = path.stat().st_size
+        except OSError:
+            replaced = 0
+        handle, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(handle, "wb") as temp_file:
+                temp_file.write(data)
+            os.replace(temp_path, path)
+        except OSError:
+            Path(temp_path).unlink(missing_ok=True)
+            return
+        self.writes += 1
+        with self._lock:
+            if self._total_bytes is None:
+                self._total_bytes = self._scan_total()
+            else:
+                self._total_bytes += len(data) - replaced
+            over_limit = self._total_bytes > self.max_bytes
+        if over_limit:
+            self.evict()
+
+    def _scan_total(self):
+        """Return the total size of the entry files."""
+        return sum(size for _, size, _ in self._scan())
+
+    def _scan(self):
+        """Return ``(mtime, size, path)`` for every entry file."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(DISK_ENTRY_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        """Delete the least recently used entries beyond ``max_bytes``."""
+        with self._lock:
+            entries = sorted(self._scan())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                total -= size
+            self._total_bytes = total
+
+    def clear(self):
+        """Delete every entry."""
+        with self._lock:
+            for path in self.directory.glob(f"*{DISK_ENTRY_SUFFIX}"):
+                path.unlink(missing_ok=True)
+            self._total_bytes = 0
+
+    def stats(self):
+        """Return a dict with hit/miss/write counters."""
+        return {"hits": self.hits, "misses": self.misses, "writes": self.writes}
+
+
+# Shared by every parser in the process once install() has run.
+PARSE_CACHE = ParseCache()
+
+# Optional persistent layer behind PARSE_CACHE, set by install(disk_cache_dir=...).
+DISK_CACHE = None
+
+_original_parse = None
+
+# One parser per signature seen by the hook, so code that parses ahead of a
+# label (e.g. on a worker thread) can use the same configuration as the label.
+_known_parsers = {}
+
+# Signatures of the create_parser() configuration used by code that parsed
+# before any label did (see guessed_parser). If the first label parser has
+# another signature, those results are never hit; the mismatch is reported.
+_guessed_signatures = set()
+GUESS_ATTRIBUTE = "_parse_cache_guess"
+
+
+def _copy_tokens(value):
+    """Copy the dict/list skeleton of a token tree, sharing leaf values.
+
+    Tokens only hold dicts, lists and immutable scalars, so this is a much
+    cheaper equivalent of ``copy.deepcopy`` for them.
+    """
+    if isinstance(value, list):
+        return [_copy_tokens(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _copy_tokens(item) for key, item in value.items()}
+    return value
+
+
+def cache_key(md, text):
+    """Return the cache key for parsing ``text`` with parser ``md``."""
+    return (text_digest(text), parser_signature(md))
+
+
+def _cached_parse(self, s, state=None):
+    """Replacement for ``mistune.Markdown.parse`` backed by ``PARSE_CACHE``."""
+    # A caller-supplied state may carry env (e.g. __file__) the result depends on.
+    if state is not None or not isinstance(s, str):
+        return _original_parse(self, s, state)
+
+    signature = parser_signature(self)
+    if signature not in _known_parsers and not getattr(self, GUESS_ATTRIBUTE, False):
+        _known_parsers[signature] = self
+        _check_guesses(signature)
+    key = (text_digest(s), signature)
+    entry = PARSE_CACHE.get(key)
+    if entry is not None:
+        result, cached_state = entry
+        return _copy_tokens(result), cached_state
+
+    if DISK_CACHE is not None:
+        stored = DISK_CACHE.get(key)
+        if stored is not None:
+            result, env = stored
+            state = _state_for(self, result, env)
+            PARSE_CACHE.put(key, _copy_tokens(result), state)
+            return result, state
+
+    result, state = _original_parse(self, s)
+    PARSE_CACHE.put(key, _copy_tokens(result), state)
+    if DISK_CACHE is not None:
+        DISK_CACHE.put(key, result, getattr(state, "env", None))
+    return result, state
+
+
+def _state_for(md, tokens, env=None):
+    """Return a parser state for ``tokens`` parsed outside this parse call."""
+    state = md.block.state_cls()
+    state.tokens = tokens
+    if env:
+        state.env.update(env)
+    return state
+
+
+def create_parser():
+    """Return a new mistune parser configured like MarkdownLabel's."""
+    import mistune
+
+    return mistune.create_markdown(renderer="ast", plugins=list(MARKDOWNLABEL_PLUGINS))
+
+
+def guessed_parser():
+    """Return a ``create_parser()`` parser used in place of a label's.
+
+    Its parses are not taken as a label configuration, and its signature is
+    compared with the first label parser's (see ``_check_guesses``).
+    """
+    md = create_parser()
+    setattr(md, GUESS_ATTRIBUTE, True)
+    _guessed_signatures.add(parser_signature(md))
+    return md
+
+
+def label_signatures():
+    """Return the signatures of the parsers labels have used so far."""
+    return set(_known_parsers)
+
+
+def _check_guesses(signature):
+    """Warn once if a label parses unlike the parser guessed before it."""
+    if _guessed_signatures and signature not in _guessed_signatures:
+        _guessed_signatures.clear()
+        warnings.warn(
+            "MarkdownLabel parses with another configuration than create_parser(); "
+            "texts parsed before the first label miss the cache and are parsed again",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+
+
+def label_parsers():
+    """Return parsers whose configuration labels have used in this process.
+
+    Falls back to ``guessed_parser()`` before any label has parsed.
+    """
+    parsers = list(_known_parsers.values())
+    return parsers or [guessed_parser()]
+
+
+def warm(text):
+    """Parse ``text`` with every known label parser configuration.
+
+    Used to move parsing off the main thread: once this returns, labels
+    created with ``text`` get their tokens from the cache.
+
+    Args:
+        text: Markdown source
+    """
+    install()
+    for md in label_parsers():
+        md.parse(text)
+
+
+def store(text, tokens, md=None):
+    """Add tokens parsed elsewhere (e.g. in another process) to the cache.
+
+    Args:
+        text: Markdown source the tokens were parsed from
+        tokens: Token list produced by a parser configured like ``md``
+        md: Parser whose configuration produced the tokens; defaults to the
+            first known label parser
+    """
+    if md is None:
+        md = label_parsers()[0]
+    key = cache_key(md, text)
+    PARSE_CACHE.put(key, tokens, _state_for(md, tokens))
+    if DISK_CACHE is not None:
+        DISK_CACHE.put(key, tokens)
+
+
+def install(maxsize=None, disk_cache_dir=None, disk_max_bytes=DEFAULT_DISK_MAX_BYTES):
+    """Route every mistune parse in this process through ``PARSE_CACHE``.
+
+    Safe to call more than once.
+
+    Args:
+        maxsize: Optional new LRU bound for the shared cache
+        disk_cache_dir: If given, also keep parse results in this directory
+            across runs
+        disk_max_bytes: Size bound of the disk cache directory
+    """
+    global _original_parse, DISK_CACHE
+    import mistune
+
+    if maxsize is not None:
+        PARSE_CACHE.maxsize = maxsize
+    if disk_cache_dir is not None and (DISK_CACHE is None or DISK_CACHE.directory != Path(disk_cache_dir)):
+        DISK_CACHE = DiskCache(disk_cache_dir, disk_max_bytes)
+    if _original_parse is None:
+        _original_parse = mistune.Markdown.parse
+        mistune.Markdown.parse = _cached_parse
+
+
+def uninstall():
+    """Restore mistune's original parse method and clear the cache.
+
+    The disk cache is detached but its files are kept.
+    """
+    global _original_parse, DISK_CACHE
+    import mistune
+
+    if _original_parse is not None:
+        mistune.Markdown.parse = _original_parse
+        _original_parse = None
+    _known_parsers.clear()
+    _guessed_signatures.clear()
+    PARSE_CACHE.clear()
+    DISK_CACHE = None
+
+
+def is_installed():
+    """Return True while mistune parsing is routed through the cache."""
+    return _original_parse is not None
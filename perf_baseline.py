@@ -0,0 +1,221 @@
+"""Performance baselines for the regression tests in tests/test_performance.py.
+
+A measurement runs a callable several times and keeps the median wall time
+(one untimed warm-up run first, so imports and caches do not count), plus
+the peak memory traced by tracemalloc during one more run. Baselines are
+stored as JSON in the repository; a check fails when a measurement exceeds
+its baseline by more than the configured tolerance. Wall times are only
+compared on the machine the baselines were recorded on (same Python,
+architecture, system, CPU model and CPU count, or the same PERF_MACHINE
+id); elsewhere only memory is checked.
+
+Environment variables:
+    PERF_RECORD: "1" stores the new measurements as baselines instead of
+        comparing against them
+    PERF_ALLOW_MISSING: "1" skips measurements without a baseline instead
+        of failing
+    PERF_MACHINE: identifier of the machine (e.g. a CI runner class) stored
+        with the baselines and compared in addition to the detected hardware
+    PERF_REPEAT: timed repetitions per measurement (default 5)
+    PERF_TIME_TOLERANCE: allowed relative slowdown (default 0.5, i.e. 50 %)
+    PERF_MEMORY_TOLERANCE: allowed relative growth of peak memory (default 0.25)
+    PERF_BASELINES: baseline file (default tests/perf_baselines.json)
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import time
+import tracemalloc
+from pathlib import Path
+
+DEFAULT_BASELINES_PATH = Path(__file__).with_name("tests") / "perf_baselines.json"
+DEFAULT_REPEAT = 5
+DEFAULT_TIME_TOLERANCE = 0.5
+DEFAULT_MEMORY_TOLERANCE = 0.25
+# Slack added to every time limit so sub-millisecond baselines do not fail on jitter
+MIN_SLACK_SECONDS = 0.002
+
+
+def env_flag(name):
+    """Return True if the environment variable ``name`` is set to a true value."""
+    return os.environ.get(name, "").lower() in ("1", "true", "yes")
+
+
+def env_number(name, default, kind=float):
+    """Return the environment variable ``name`` as a number, or ``default``."""
+    value = os.environ.get(name)
+    return kind(value) if value else default
+
+
+def measure(function, repeat=DEFAULT_REPEAT, setup=None):
+    """Time ``function`` and trace its peak memory.
+
+    Args:
+        function: Callable to measure; its return value is ignored
+        repeat: Timed runs; the median is reported
+        setup: Optional callable run (untimed) before every run, e.g. to
+            clear caches
+
+    Returns:
+        Dict with "seconds" (median), "min_seconds", "repeat" and
+        "peak_bytes" (None if an outer tracemalloc session is running and
+        its peak cannot be reset, before Python 3.9)
+    """
+    def run():
+        """Run ``setup`` untimed, then return the seconds ``function`` took."""
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        function()
+        return time.perf_counter() - started
+
+    run()  # warm-up
+    times = [run() for _ in range(repeat)]
+
+    return {
+        "seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "repeat": repeat,
+        "peak_bytes": traced_peak(function, setup),
+    }
+
+
+def traced_peak(function, setup=None):
+    """Return the peak memory in bytes allocated while ``function`` runs, or None."""
+    if setup is not None:
+        setup()
+    was_tracing = tracemalloc.is_tracing()
+    if was_tracing:
+        if not hasattr(tracemalloc, "reset_peak"):
+            return None
+        tracemalloc.reset_peak()
+    else:
+        # A fresh session starts with a zero peak (reset_peak needs Python 3.9)
+        tracemalloc.start()
+    baseline_size = tracemalloc.get_traced_memory()[0]
+    function()
+    peak = tracemalloc.get_traced_memory()[1] - baseline_size
+    if not was_tracing:
+        tracemalloc.stop()
+    return max(peak, 0)
+
+
+def cpu_model():
+    """Return the model name of this machine's processor, or "" if unknown.
+
+    ``platform.processor()`` is empty on most Linux systems, so the model is
+    read from /proc/cpuinfo there and from sysctl on macOS.
+    """
+    try:
+        with open("/proc/cpuinfo", encoding="utf-8") as cpuinfo:
+            for line in cpuinfo:
+                key, _, value = line.partition(":")
+                if key.strip() == "model name":
+                    return value.strip()
+    except OSError:
+        pass
+    if platform.system() == "Darwin":
+        try:
+            result = subprocess.run(
+                ["sysctl", "-n", "machdep.cpu.brand_string"], capture_output=True, text=True, check=True
+            )
+            return result.stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            pass
+    return platform.processor()
+
+
+def machine_description():
+    """Return the details of this machine stored with recorded baselines."""
+    description = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "cpu": cpu_model(),
+        "cpu_count": os.cpu_count(),
+    }
+    machine_id = os.environ.get("PERF_MACHINE")
+    if machine_id:
+        description["id"] = machine_id
+    return description
+
+
+def compare(measurement, baseline, time_tolerance=DEFAULT_TIME_TOLERANCE,
+            memory_tolerance=DEFAULT_MEMORY_TOLERANCE, check_time=True):
+    """Return the regressions of ``measurement`` against ``baseline``.
+
+    Args:
+        measurement: Result of ``measure``
+        baseline: Stored result of an earlier ``measure``
+        time_tolerance: Allowed relative slowdown of the median time
+        memory_tolerance: Allowed relative growth of the peak memory
+        check_time: If False, only memory is compared (e.g. the baseline
+            was recorded on another machine)
+
+    Returns:
+        List of human-readable messages, empty if within tolerance
+    """
+    problems = []
+    time_limit = baseline["seconds"] * (1 + time_tolerance) + MIN_SLACK_SECONDS
+    if check_time and measurement["seconds"] > time_limit:
+        problems.append(
+            f"median {measurement['seconds'] * 1000:.2f} ms exceeds baseline "
+            f"{baseline['seconds'] * 1000:.2f} ms by more than {time_tolerance:.0%}"
+        )
+    if baseline.get("peak_bytes") is not None and measurement["peak_bytes"] is not None:
+        memory_limit = baseline["peak_bytes"] * (1 + memory_tolerance)
+        if measurement["peak_bytes"] > memory_limit:
+            problems.append(
+                f"peak memory {measurement['peak_bytes'] / 1024:.1f} KiB exceeds baseline "
+                f"{baseline['peak_bytes'] / 1024:.1f} KiB by more than {memory_tolerance:.0%}"
+            )
+    return problems
+
+
+class BaselineStore:
+    """Baseline measurements by name, kept in a JSON file."""
+
+    def __init__(self, path=DEFAULT_BASELINES_PATH):
+        """Load the baselines stored at ``path``, if the file exists.
+
+        Args:
+            path: JSON baseline file
+        """
+        self.path = Path(path)
+        self.machine = None
+        self.metrics = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.machine = data.get("machine")
+            self.metrics = data.get("metrics", {})
+
+    @classmethod
+    def from_environment(cls):
+        """Open the baseline file named by PERF_BASELINES (or the default)."""
+        return cls(os.environ.get("PERF_BASELINES") or DEFAULT_BASELINES_PATH)
+
+    def same_machine(self):
+        """Return True if the baselines were recorded on this machine."""
+        return self.machine == machine_description()
+
+    def get(self, name):
+        """Return the baseline called ``name``, or None."""
+        return self.metrics.get(name)
+
+    def record(self, name, measurement):
+        """Store ``measurement`` as the baseline called ``name`` and save the file."""
+        self.metrics[name] = {
+            "seconds": round(measurement["seconds"], 6),
+            "peak_bytes": measurement["peak_bytes"],
+            "repeat": measurement["repeat"],
+        }
+        self.machine = machine_description()
+        self.save()
+
+    def save(self):
+        """Write the baselines, sorted by name."""
+        data = {"machine": self.machine, "metrics": dict(sorted(self.metrics.items()))}
+        self.path.write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
@@ -0,0 +1,208 @@
+"""On-screen frame-time and draw-call overlay.
+
+``PerfHUD`` is a small label drawn on top of the app (it is added to the
+Window, so the app's root widget is unchanged). Every frame it only stores
+the frame time in ``FrameTimeRing``, a fixed-size ``array('d')`` ring
+buffer. Twice a second it shows the frame-time percentiles and the number of
+dropped frames over that history; the canvas instruction count and the
+number of visible MarkdownLabels need a tree walk and are refreshed once a
+second.
+"""
+
+from array import array
+
+from kivy.clock import Clock
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.label import Label
+
+TARGET_FRAME_TIME = 1.0 / 60
+HISTORY_FRAMES = 600
+
+
+class FrameTimeRing:
+    """Fixed-size history of frame times in seconds."""
+
+    def __init__(self, capacity=HISTORY_FRAMES):
+        """Create an empty history of ``capacity`` frames."""
+        self.capacity = capacity
+        self._values = array('d', bytes(8 * capacity))
+        self._next = 0
+        self.count = 0
+
+    def append(self, value):
+        """Store ``value``, overwriting the oldest entry once full."""
+        self._values[self._next] = value
+        self._next = (self._next + 1) % self.capacity
+        if self.count < self.capacity:
+            self.count += 1
+
+    def values(self):
+        """Return the stored frame times, oldest first."""
+        if self.count < self.capacity:
+            return self._values[:self.count]
+        return self._values[self._next:] + self._values[:self._next]
+
+    def percentiles(self, *percents):
+        """Return the nearest-rank percentiles of the stored frame times.
+
+        Args:
+            *percents: Percentiles between 0 and 100
+
+        Returns:
+            List with one value per percentile (0.0 while empty)
+        """
+        ordered = sorted(self.values())
+        if not ordered:
+            return [0.0 for _ in percents]
+        last = len(ordered) - 1
+        return [ordered[min(last, int(round(percent / 100 * last)))] for percent in percents]
+
+    def dropped_frames(self, target=TARGET_FRAME_TIME):
+        """Return how many display refreshes were missed within the history.
+
+        A frame that took ``n`` target intervals (rounded) missed ``n - 1``.
+        """
+        return sum(max(0, round(value / target) - 1) for value in self.values())
+
+
+def count_instructions(canvas):
+    """Return the number of graphics instructions in ``canvas`` and its groups.
+
+    A widget's canvas is part of its parent's canvas, so passing
+    ``Window.canvas`` counts everything that is drawn.
+    """
+    total = 0
+    stack = [canvas]
+    while stack:
+        group = stack.pop()
+        children = getattr(group, 'children', None)
+        if children:
+            total += len(children)
+            stack.extend(children)
+    return total
+
+
+def overlaps_window(widget):
+    """Return True if ``widget`` is at least partly inside the window."""
+    x, y = widget.to_window(widget.x, widget.y)
+    return not (x > Window.width or y > Window.height or x + widget.width < 0 or y + widget.height < 0)
+
+
+def visible_widgets(root):
+    """Yield the widgets under ``root`` that overlap the window.
+
+    Subtrees whose parent lies entirely outside the window are skipped, so
+    long scrolled-away documents are not walked.
+    """
+    stack = [root]
+    while stack:
+        widget = stack.pop()
+        if not overlaps_window(widget):
+            continue
+        yield widget
+        stack.extend(widget.children)
+
+
+class PerfHUD(Label):
+    """Overlay showing frame-time percentiles, dropped frames and draw counts."""
+
+    def __init__(self, root, is_markdown_label, refresh_interval=0.5, find_visible_labels=None, **kwargs):
+        """Create the overlay.
+
+        Args:
+            root: Widget whose visible MarkdownLabels are counted
+            is_markdown_label: Predicate telling whether a widget is a MarkdownLabel
+            refresh_interval: Seconds between text updates
+            find_visible_labels: Optional callable returning the visible
+                MarkdownLabels (e.g. from an index), used instead of walking
+                the visible part of ``root``
+        """
+        kwargs.setdefault('font_size', '13sp')
+        super().__init__(
+            size_hint=(None, None),
+            size=(300, 110),
+            halign='left',
+            valign='top',
+            padding=[8, 6],
+            **kwargs
+        )
+        self.text_size = self.size
+        self.root_widget = root
+        self.is_markdown_label = is_markdown_label
+        self.find_visible_labels = find_visible_labels
+        self.refresh_interval = refresh_interval
+        self.frames = FrameTimeRing()
+        self.instructions = 0
+        self.visible_labels = 0
+        self._refreshes = 0
+        self._frame_event = None
+        self._refresh_event = None
+        with self.canvas.before:
+            Color(0, 0, 0, 0.7)
+            self._bg = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_bg)
+
+    @property
+    def active(self):
+        """Whether the overlay is currently shown."""
+        return self._frame_event is not None
+
+    def show(self):
+        """Add the overlay to the window and start recording."""
+        if self.active:
+            return
+        Window.add_widget(self)
+        Window.bind(size=self._place)
+        self._place()
+        self._frame_event = Clock.schedule_interval(self.record_frame, 0)
+        self._refresh_event = Clock.schedule_interval(self.refresh, self.refresh_interval)
+
+    def hide(self):
+        """Remove the overlay and stop recording."""
+        if not self.active:
+            return
+        self._frame_event.cancel()
+        self._refresh_event.cancel()
+        self._frame_event = self._refresh_event = None
+        Window.unbind(size=self._place)
+        Window.remove_widget(self)
+
+    def toggle(self):
+        """Show the overlay if hidden, hide it otherwise."""
+        if self.active:
+            self.hide()
+        else:
+            self.show()
+
+    def record_frame(self, dt):
+        """Store the duration of the last frame."""
+        self.frames.append(dt)
+
+    def refresh(self, *args):
+        """Recompute the statistics and update the text."""
+        # The tree walks run every other refresh
+        if self._refreshes % 2 == 0:
+            self.instructions = count_instructions(Window.canvas)
+            if self.find_visible_labels is not None:
+                self.visible_labels = len(self.find_visible_labels())
+            else:
+                self.visible_labels = sum(
+                    1 for widget in visible_widgets(self.root_widget) if self.is_markdown_label(widget)
+                )
+        self._refreshes += 1
+        p50, p95, p99 = self.frames.percentiles(50, 95, 99)
+        self.text = "\n".join([
+            f"frame ms  p50 {p50 * 1000:.1f}  p95 {p95 * 1000:.1f}  p99 {p99 * 1000:.1f}",
+            f"dropped frames: {self.frames.dropped_frames()} / {self.frames.count}",
+            f"canvas instructions: {self.instructions}",
+            f"visible MarkdownLabels: {self.visible_labels}",
+        ])
+
+    def _place(self, *args):
+        """Keep the overlay in the top-right corner of the window."""
+        self.pos = (Window.width - self.width - 10, Window.height - self.height - 10)
+
+    def _update_bg(self, *args):
+        """Keep the background behind the text."""
+        self._bg.pos = self.pos
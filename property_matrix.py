@@ -0,0 +1,101 @@
+"""Cartesian products of property variations for style QA.
+
+A matrix takes several property axes (for example the demo's font_size,
+line_height, halign and color sections) and yields every combination of
+their variations, with the properties of all axes merged into one dict.
+Combinations whose effective style is identical (see
+``render_dedup.effective_style``) are produced only once.
+
+Combinations are generated lazily and handed out in pages, so the demo can
+give each page its own virtualized section and only build the widgets of the
+pages near the viewport.
+"""
+
+from itertools import islice, product
+
+from render_dedup import _freeze, effective_style
+
+
+def axes_from_specs(specs, names):
+    """Select the sections named ``names`` from ``section_specs()`` as axes.
+
+    Args:
+        specs: List of (title, variations, show_background) tuples
+        names: Section titles to use as axes, in order
+
+    Returns:
+        List of (title, variations, show_background) tuples
+
+    Raises:
+        ValueError: If a name does not match a section title
+    """
+    by_title = {spec[0]: spec for spec in specs}
+    unknown = [name for name in names if name not in by_title]
+    if unknown:
+        raise ValueError(f"Unknown matrix axes {', '.join(unknown)}; expected some of {', '.join(by_title)}")
+    return [by_title[name] for name in names]
+
+
+class PropertyMatrix:
+    """Lazily generated, deduplicated combinations of property axes."""
+
+    def __init__(self, axes, label_cls=None):
+        """Describe a matrix.
+
+        Args:
+            axes: List of (name, variations, show_background) tuples, where
+                variations is a list of (description, property_dict) tuples
+            label_cls: Class whose property defaults are ignored when
+                comparing styles (None compares the properties as given)
+        """
+        self.axes = axes
+        self.label_cls = label_cls
+        self.duplicates = 0
+
+    @property
+    def names(self):
+        """Names of the axes."""
+        return [axis[0] for axis in self.axes]
+
+    @property
+    def show_background(self):
+        """Whether any axis shows its variations with a background."""
+        return any(axis[2] for axis in self.axes)
+
+    @property
+    def total_combinations(self):
+        """Number of combinations before deduplication."""
+        total = 1
+        for axis in self.axes:
+            total *= len(axis[1])
+        return total
+
+    def style_key(self, properties):
+        """Return the key under which equally styled combinations collapse."""
+        if self.label_cls is None:
+            return _freeze(properties)
+        return effective_style(properties, self.label_cls)
+
+    def __iter__(self):
+        """Yield (description, properties) for every distinct combination."""
+        self.duplicates = 0
+        seen = set()
+        for combination in product(*(axis[1] for axis in self.axes)):
+            properties = {}
+            for _, axis_properties in combination:
+                properties.update(axis_properties)
+            key = self.style_key(properties)
+            if key in seen:
+                self.duplicates += 1
+                continue
+            seen.add(key)
+            yield ", ".join(description for description, _ in combination), properties
+
+    def pages(self, page_size):
+        """Yield lists of at most ``page_size`` distinct combinations."""
+        combinations = iter(self)
+        while True:
+            page = list(islice(combinations, page_size))
+            if not page:
+                return
+            yield page
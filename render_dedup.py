@@ -0,0 +1,276 @@
+"""Texture sharing for MarkdownLabel variations that render identically.
+
+Several demo variations produce byte-identical output because their
+properties equal the label defaults (``font_name='Roboto'``,
+``color=[1,1,1,1]``, ``line_height=1.0``, ``disabled=False``, ...). ``render_key`` reduces a
+variation to its effective style (properties equal to the class defaults
+are dropped, lists become tuples) plus a hash of its text, so such
+variations get the same key.
+
+``RenderShareRegistry`` builds a real label only for the first variation of
+each key. Later variations get a ``SharedRenderView`` that draws a snapshot
+of that label's canvas (rendered through an Fbo by ``export_as_image``) and
+forwards touches to it so links keep working. The snapshot is taken again
+whenever the primary's size or one of its style properties changes (e.g.
+from the live style controls). When a section leaves the tree,
+``RenderShareRegistry.release_tree`` drops the views it contained and, if
+the primary left with it, hands the primary role to a remaining view (which
+builds a real label) or forgets the share. Texture memory and
+rasterization therefore scale with the number of distinct renderings, not
+with the number of widgets.
+"""
+
+from kivy.clock import Clock
+from kivy.graphics import Color, Rectangle
+from kivy.properties import Property
+from kivy.uix.widget import Widget
+
+import parse_cache
+
+# Properties whose change re-renders a label without necessarily resizing it
+RENDER_PROPERTIES = (
+    "color",
+    "disabled_color",
+    "disabled",
+    "font_name",
+    "font_size",
+    "line_height",
+    "halign",
+    "valign",
+    "padding",
+)
+
+
+def _freeze(value):
+    """Return a hashable form of a property value."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    return value
+
+
+def effective_style(properties, label_cls):
+    """Return ``properties`` without values equal to ``label_cls`` defaults.
+
+    Args:
+        properties: Dict of properties passed to the label
+        label_cls: Widget class whose Kivy property defaults are compared
+
+    Returns:
+        Sorted tuple of (name, frozen value) pairs
+    """
+    style = []
+    for name, value in properties.items():
+        prop = getattr(label_cls, name, None)
+        frozen = _freeze(value)
+        if isinstance(prop, Property) and _freeze(prop.defaultvalue) == frozen:
+            continue
+        style.append((name, frozen))
+    return tuple(sorted(style))
+
+
+def render_key(text, properties, show_background, label_cls):
+    """Return the key under which identical renderings are shared.
+
+    Args:
+        text: Markdown source
+        properties: Properties passed to the label
+        show_background: Whether the label draws a background rectangle
+        label_cls: Label class (used for its property defaults)
+    """
+    return (parse_cache.text_digest(text), effective_style(properties, label_cls), bool(show_background))
+
+
+class RenderShare:
+    """One real label and the Fbo snapshot of its canvas."""
+
+    def __init__(self, primary):
+        """Start tracking ``primary``'s rendering.
+
+        Args:
+            primary: The label that is actually rendered
+        """
+        self.primary = None
+        self.texture = None
+        self.views = []
+        self._bound = ()
+        # Runs on the next tick, after the primary's own -1 redraw triggers
+        self._refresh_trigger = Clock.create_trigger(self.refresh)
+        self.set_primary(primary)
+
+    def set_primary(self, primary):
+        """Render from ``primary`` instead of the current primary label."""
+        old = self.primary
+        if old is not None:
+            for name in self._bound:
+                old.funbind(name, self._refresh_trigger)
+        self.primary = primary
+        self._bound = ('size',) + tuple(
+            name for name in RENDER_PROPERTIES if primary.property(name, quiet=True) is not None
+        )
+        for name in self._bound:
+            primary.fbind(name, self._refresh_trigger)
+        for view in self.views:
+            view.follow_primary(old, primary)
+        self._refresh_trigger()
+
+    def close(self):
+        """Stop following the primary (the share is no longer used)."""
+        for name in self._bound:
+            self.primary.funbind(name, self._refresh_trigger)
+        self._bound = ()
+        self._refresh_trigger.cancel()
+
+    def refresh(self, *args):
+        """Snapshot the primary's canvas and update every sharing view."""
+        primary = self.primary
+        if primary.width <= 1 or primary.height <= 1:
+            return
+        self.texture = primary.export_as_image().texture
+        for view in self.views:
+            view.update_texture(self.texture)
+
+
+class SharedRenderView(Widget):
+    """Widget that displays another label's rendering instead of its own."""
+
+    def __init__(self, share, fallback_factory, **kwargs):
+        """Create a view drawing ``share``'s snapshot.
+
+        Args:
+            share: RenderShare of the label with the same rendering
+            fallback_factory: Builds a real label if the widths stop matching
+        """
+        super().__init__(size_hint_y=None, height=share.primary.height, **kwargs)
+        self.share = share
+        self.fallback_factory = fallback_factory
+        self.fallback = None
+        with self.canvas:
+            Color(1, 1, 1, 1)
+            self._rect = Rectangle(pos=self.pos, size=self.size, texture=share.texture)
+        self.bind(pos=self._update_rect, size=self._update_rect)
+        self._follow_height = self.setter('height')
+        share.primary.bind(height=self._follow_height)
+        share.views.append(self)
+
+    def follow_primary(self, old, primary):
+        """Take the height of ``primary``, the share's new rendered label."""
+        old.unbind(height=self._follow_height)
+        primary.bind(height=self._follow_height)
+        self.height = primary.height
+
+    def leave_share(self):
+        """Stop following the share (the view left the tree)."""
+        if self in self.share.views:
+            self.share.views.remove(self)
+            self.share.primary.unbind(height=self._follow_height)
+
+    def update_texture(self, texture):
+        """Show a new snapshot, or a real label if widths no longer match.
+
+        Called after layout has settled, when the primary was re-snapshotted.
+        """
+        if self.fallback is not None:
+            return
+        if abs(self.width - self.share.primary.width) > 1 and self.width > 1:
+            self._use_fallback()
+            return
+        self._rect.texture = texture
+
+    def _use_fallback(self):
+        """Replace the shared snapshot with a label of our own."""
+        self.leave_share()
+        self.canvas.clear()
+        self.fallback = self.fallback_factory()
+        self.add_widget(self.fallback)
+        self.fallback.bind(height=self._follow_height)
+        self.bind(pos=self._layout_fallback, width=self._layout_fallback)
+        self._layout_fallback()
+
+    def _layout_fallback(self, *args):
+        """Keep the fallback label on top of this widget."""
+        self.fallback.pos = self.pos
+        self.fallback.width = self.width
+
+    def _update_rect(self, *args):
+        """Keep the snapshot rectangle on the widget."""
+        self._rect.pos = self.pos
+        self._rect.size = self.size
+
+    def on_touch_down(self, touch):
+        """Forward touches (e.g. link presses) to the rendered label."""
+        if self.fallback is not None:
+            return super().on_touch_down(touch)
+        if not self.collide_point(*touch.pos):
+            return False
+        primary = self.share.primary
+        dx = primary.x - self.x
+        dy = primary.y - self.y
+        touch.push()
+        touch.apply_transform_2d(lambda x, y: (x + dx, y + dy))
+        try:
+            return primary.dispatch('on_touch_down', touch)
+        finally:
+            touch.pop()
+
+
+class RenderShareRegistry:
+    """Hand out real labels for new renderings and shared views for repeats."""
+
+    def __init__(self):
+        """Create a registry without shares."""
+        self.shares = {}
+
+    def acquire(self, key, factory):
+        """Return a widget for a rendering identified by ``key``.
+
+        Args:
+            key: Result of ``render_key``
+            factory: Callable building the real label
+
+        Returns:
+            The real label for the first request of a key, otherwise a
+            SharedRenderView of it
+        """
+        share = self.shares.get(key)
+        if share is None:
+            widget = factory()
+            self.shares[key] = RenderShare(widget)
+            return widget
+        return SharedRenderView(share, factory)
+
+    def release_tree(self, root):
+        """Detach the shares from a subtree that left the tree.
+
+        Views under ``root`` stop following their share. A share whose
+        primary is under ``root`` is handed to one of its remaining views,
+        which replaces its snapshot with a real label that becomes the new
+        primary; without remaining views the share is forgotten, so the next
+        ``acquire`` of its key builds a new primary.
+
+        Args:
+            root: Root of the detached subtree
+        """
+        if not self.shares:
+            return
+        released = set(root.walk(restrict=True))
+        for key, share in list(self.shares.items()):
+            for view in [view for view in share.views if view in released]:
+                view.leave_share()
+            if share.primary not in released:
+                continue
+            if not share.views:
+                share.close()
+                del self.shares[key]
+                continue
+            view = share.views[0]
+            view._use_fallback()
+            share.set_primary(view.fallback)
+
+    def stats(self):
+        """Return counts of distinct renderings and shared views."""
+        return {
+            "renderings": len(self.shares),
+            "shared_views": sum(len(share.views) for share in self.shares.values()),
+        }
@@ -0,0 +1,296 @@
+"""Incremental full-text search over the demo's documents and sections.
+
+``SearchIndex`` is a positional inverted index from lowercase words to the
+blocks containing them and the word offsets within each block. Each source
+(the full document, every section) is a list of blocks (Markdown blocks for
+documents, the title and variation descriptions for sections), and a match
+is reported as a block position and character offset in its source, so the
+app can scroll to it without searching the widget tree.
+
+Sources are updated with ``diff_blocks``: only blocks that were inserted or
+replaced are tokenized, unchanged blocks keep their postings. Queries
+intersect the postings of their words (the last word matches as a prefix,
+so results update while typing), and the phrase is only compared at the
+offsets of its first word in the candidate blocks, so no block text is
+scanned. Matches start at the beginning of a word.
+
+``FindBar`` is the search field drawn on top of the window.
+"""
+
+import bisect
+import re
+from array import array
+from collections import defaultdict, namedtuple
+
+from kivy.core.window import Window
+from kivy.graphics import Color, Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.button import Button
+from kivy.uix.label import Label
+from kivy.uix.textinput import TextInput
+
+from markdown_blocks import diff_blocks
+
+WORD_RE = re.compile(r"\w+")
+DEFAULT_LIMIT = 500
+
+Match = namedtuple("Match", ["source", "block", "offset", "length"])
+
+
+def tokenize(text):
+    """Return the lowercase words of ``text``."""
+    return WORD_RE.findall(text.lower())
+
+
+class SearchIndex:
+    """Inverted word index over the blocks of several sources."""
+
+    def __init__(self):
+        """Create an empty index."""
+        # word -> {block id: array of word offsets in the block}
+        self._postings = defaultdict(dict)
+        self._blocks = {}
+        self._sources = {}
+        self._source_blocks = {}
+        self._positions = {}
+        self._offsets = {}
+        self._next_id = 0
+        self._vocabulary = None
+        self.tokenized_blocks = 0
+
+    def __len__(self):
+        """Return the number of indexed blocks."""
+        return len(self._blocks)
+
+    @property
+    def sources(self):
+        """Names of the indexed sources, in the order they were added."""
+        return list(self._sources)
+
+    def update_blocks(self, source, blocks):
+        """Index ``blocks`` as the new content of ``source``.
+
+        Only blocks that differ from the previous content are tokenized.
+
+        Args:
+            source: Name of the document or section
+            blocks: Block strings in display order
+
+        Returns:
+            Number of blocks that were (re-)indexed
+        """
+        old_blocks = self._source_blocks.get(source, [])
+        old_ids = self._sources.get(source, [])
+        new_ids = []
+        indexed = 0
+        for tag, i1, i2, j1, j2 in diff_blocks(old_blocks, blocks):
+            if tag == 'equal':
+                new_ids.extend(old_ids[i1:i2])
+                continue
+            for block_id in old_ids[i1:i2]:
+                self._remove(block_id)
+            for text in blocks[j1:j2]:
+                new_ids.append(self._add(source, text))
+                indexed += 1
+        self._sources[source] = new_ids
+        self._source_blocks[source] = list(blocks)
+        offsets = [0]
+        for position, (block_id, text) in enumerate(zip(new_ids, blocks)):
+            self._positions[block_id] = position
+            offsets.append(offsets[-1] + len(text))
+        self._offsets[source] = offsets
+        return indexed
+
+    def remove_source(self, source):
+        """Drop every block of ``source`` from the index."""
+        for block_id in self._sources.pop(source, []):
+            self._remove(block_id)
+        self._source_blocks.pop(source, None)
+        self._offsets.pop(source, None)
+
+    def block_count(self, source):
+        """Return the number of blocks indexed for ``source``."""
+        return len(self._sources.get(source, ()))
+
+    def block_span(self, source, block):
+        """Return (start, length, total) of a block in characters of its source."""
+        offsets = self._offsets[source]
+        return offsets[block], offsets[block + 1] - offsets[block], offsets[-1]
+
+    def _add(self, source, text):
+        """Index ``text`` as a new block of ``source`` and return its block id."""
+        block_id = self._next_id
+        self._next_id += 1
+        lowered = text.lower()
+        self._blocks[block_id] = (source, lowered)
+        for found in WORD_RE.finditer(lowered):
+            postings = self._postings[found.group()]
+            offsets = postings.get(block_id)
+            if offsets is None:
+                if not postings:
+                    self._vocabulary = None
+                offsets = postings[block_id] = array('L')
+            offsets.append(found.start())
+        self.tokenized_blocks += 1
+        return block_id
+
+    def _remove(self, block_id):
+        """Drop block ``block_id`` and the postings of its words."""
+        source, lowered = self._blocks.pop(block_id)
+        self._positions.pop(block_id, None)
+        for token in set(WORD_RE.findall(lowered)):
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.pop(block_id, None)
+            if not postings:
+                del self._postings[token]
+                self._vocabulary = None
+
+    def _prefix_words(self, prefix):
+        """Return the indexed words that start with ``prefix``."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        vocabulary = self._vocabulary
+        start = index = bisect.bisect_left(vocabulary, prefix)
+        while index < len(vocabulary) and vocabulary[index].startswith(prefix):
+            index += 1
+        return vocabulary[start:index]
+
+    def search(self, query, limit=DEFAULT_LIMIT):
+        """Return the matches of ``query`` in document order.
+
+        Args:
+            query: Text to find (case-insensitive, starting at a word start)
+            limit: Maximum number of matches returned
+
+        Returns:
+            List of Match(source, block, offset, length)
+        """
+        needle = " ".join(query.lower().split())
+        words = WORD_RE.findall(needle)
+        if not words:
+            return []
+        candidates = None
+        for word in words[:-1]:
+            postings = self._postings.get(word, {})
+            candidates = set(postings) if candidates is None else candidates & postings.keys()
+            if not candidates:
+                return []
+        last_words = self._prefix_words(words[-1])
+        last = set()
+        for word in last_words:
+            last.update(self._postings[word])
+        candidates = last if candidates is None else candidates & last
+
+        source_order = {source: number for number, source in enumerate(self._sources)}
+        ordered = sorted(
+            candidates, key=lambda block_id: (source_order[self._blocks[block_id][0]], self._positions[block_id])
+        )
+        # The phrase is compared from its first word on; whitespace in the
+        # query matches any whitespace run in the text
+        needle = needle[needle.index(words[0]):]
+        pattern = re.compile(r"\s+".join(re.escape(part) for part in needle.split(" ")))
+        anchors = [self._postings[words[0]]] if len(words) > 1 else [self._postings[word] for word in last_words]
+        matches = []
+        for block_id in ordered:
+            source, lowered = self._blocks[block_id]
+            offsets = sorted(offset for postings in anchors for offset in postings.get(block_id, ()))
+            for offset in offsets:
+                found = pattern.match(lowered, offset)
+                if found is not None:
+                    matches.append(Match(source, self._positions[block_id], offset, found.end() - offset))
+                    if len(matches) >= limit:
+                        return matches
+        return matches
+
+
+class FindBar(BoxLayout):
+    """Search field with previous/next buttons drawn on top of the window."""
+
+    def __init__(self, search, on_match, **kwargs):
+        """Create the (hidden) find bar.
+
+        Args:
+            search: Callable taking the query and returning a list of matches
+            on_match: Called with the selected Match
+        """
+        super().__init__(
+            orientation='horizontal',
+            size_hint=(None, None),
+            size=(520, 44),
+            spacing=4,
+            padding=[6, 4],
+            **kwargs
+        )
+        self.search = search
+        self.on_match = on_match
+        self.matches = []
+        self.current = -1
+        self.field = TextInput(multiline=False, hint_text="Find", write_tab=False)
+        self.field.bind(text=self._on_text, on_text_validate=lambda *args: self.step(1))
+        previous_button = Button(text="<", size_hint_x=None, width=40)
+        previous_button.bind(on_release=lambda *args: self.step(-1))
+        next_button = Button(text=">", size_hint_x=None, width=40)
+        next_button.bind(on_release=lambda *args: self.step(1))
+        self.status = Label(text="", size_hint_x=None, width=110, font_size='13sp')
+        for widget in (self.field, previous_button, next_button, self.status):
+            self.add_widget(widget)
+        with self.canvas.before:
+            Color(0, 0, 0, 0.8)
+            self._bg = Rectangle(pos=self.pos, size=self.size)
+        self.bind(pos=self._update_bg)
+
+    @property
+    def active(self):
+        """Whether the find bar is shown."""
+        return self.parent is not None
+
+    def show(self):
+        """Add the find bar to the window and focus the field."""
+        if self.active:
+            return
+        Window.add_widget(self)
+        Window.bind(size=self._place)
+        self._place()
+        self.field.focus = True
+
+    def hide(self):
+        """Remove the find bar from the window."""
+        if not self.active:
+            return
+        Window.unbind(size=self._place)
+        Window.remove_widget(self)
+
+    def toggle(self):
+        """Show the find bar if hidden, hide it otherwise."""
+        if self.active:
+            self.hide()
+        else:
+            self.show()
+
+    def _on_text(self, instance, text):
+        """Search as the query is typed and select the first match."""
+        self.matches = self.search(text) if text.strip() else []
+        self.current = -1
+        if self.matches:
+            self.step(1)
+        else:
+            self.status.text = "no matches" if text.strip() else ""
+
+    def step(self, direction):
+        """Select the next (1) or previous (-1) match."""
+        if not self.matches:
+            return
+        self.current = (self.current + direction) % len(self.matches)
+        count = f"{len(self.matches)}+" if len(self.matches) >= DEFAULT_LIMIT else len(self.matches)
+        self.status.text = f"{self.current + 1} / {count}"
+        self.on_match(self.matches[self.current])
+
+    def _place(self, *args):
+        """Keep the find bar in the top-left corner of the window."""
+        self.pos = (10, Window.height - self.height - 10)
+
+    def _update_bg(self, *args):
+        """Keep the background behind the controls."""
+        self._bg.pos = self.pos
@@ -0,0 +1,256 @@
+"""Parallel offscreen PNG export of every demo variation.
+
+Usage (after activating the venv):
+    python3 snapshot_export.py --output snapshots --workers 8
+    python3 snapshot_export.py --matrix font_size,line_height,halign,color -o snapshots
+
+Options:
+  --output/-o: directory receiving the PNGs and manifest.json
+  --workers: number of worker processes (default: CPU count)
+  --width: width in pixels every variation is laid out and rendered at
+  --matrix: export every combination of these sections' variations
+      instead of the regular sections (see property_matrix.py)
+  --no-full-sample: skip the full sample_markdown.md section
+  --raw: also write each snapshot's RGBA pixels as .npy for visual_diff.py
+
+Every variation built by ``MarkdownDemoApp.create_variation`` and the full
+sample section are rendered through an Fbo (``Widget.export_as_image``)
+without being shown; with ``--raw`` the pixels are also saved as ``.npy``.
+Jobs are spread over a spawn-based process pool; each worker creates its
+own hidden Kivy window and GL context once and renders many jobs with it.
+``manifest.json`` lists every file with its size, the worker that rendered
+it and the build and render times.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+DEFAULT_WIDTH = 1380
+SETTLE_TICKS = 30
+# Consecutive ticks without a size change before a widget counts as laid out
+STABLE_TICKS = 2
+
+_worker_app = None
+
+
+def slugify(text):
+    """Return ``text`` reduced to a file-name friendly slug."""
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:80]
+
+
+def build_jobs(app, matrix_axes=None, label_cls=None, include_full_sample=True):
+    """Return the export jobs for ``app``'s sections.
+
+    Args:
+        app: MarkdownDemoApp providing the sections (it is not run)
+        matrix_axes: Section titles to combine into a property matrix
+        label_cls: Label class used to deduplicate matrix combinations
+        include_full_sample: Also export the full sample section
+
+    Returns:
+        List of job dicts with ``file``, ``section``, ``description``,
+        ``properties`` and ``show_background`` (``kind`` is "variation"
+        or "full_sample")
+    """
+    from property_matrix import PropertyMatrix, axes_from_specs
+
+    if matrix_axes:
+        matrix = PropertyMatrix(axes_from_specs(app.section_specs(), matrix_axes), label_cls)
+        section = " x ".join(matrix.names)
+        sections = [(section, list(matrix), matrix.show_background)]
+    else:
+        sections = app.all_section_specs()
+
+    jobs = []
+    for section, variations, show_background in sections:
+        for description, properties in variations:
+            jobs.append({
+                "kind": "variation",
+                "file": f"{len(jobs):05d}-{slugify(section)}-{slugify(description)}.png",
+                "section": section,
+                "description": description,
+                "properties": properties,
+                "show_background": show_background,
+            })
+    if include_full_sample:
+        jobs.append({
+            "kind": "full_sample",
+            "file": f"{len(jobs):05d}-sample-markdown.png",
+            "section": "sample_markdown.md",
+            "description": "sample_markdown.md (full content)",
+            "properties": {},
+            "show_background": False,
+        })
+    return jobs
+
+
+def _init_worker():
+    """Create this worker's hidden window and app (runs once per process)."""
+    global _worker_app
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    from kivy.config import Config
+
+    Config.set("graphics", "window_state", "hidden")
+    # Settling layouts ticks the Clock repeatedly; don't wait for vsync
+    Config.set("graphics", "maxfps", "0")
+
+    from main import MarkdownDemoApp
+
+    # Snapshots never follow links, so no document navigator or prefetch threads
+    _worker_app = MarkdownDemoApp(navigate_links=False)
+
+
+def settle(widget, width, max_ticks=SETTLE_TICKS, stable_ticks=STABLE_TICKS):
+    """Lay ``widget`` out at ``width`` until its size stops changing.
+
+    Each tick also runs the draw phase, so canvas and texture updates are
+    applied before the widget is exported. Layout triggers can fire a few
+    ticks apart, so the size has to stay the same for ``stable_ticks``
+    consecutive ticks.
+    """
+    from kivy.clock import Clock
+
+    widget.size_hint_x = None
+    widget.width = width
+    widget.pos = (0, 0)
+    last_size = None
+    stable = 0
+    for _ in range(max_ticks):
+        Clock.tick()
+        Clock.tick_draw()
+        size = tuple(widget.size)
+        stable = stable + 1 if size == last_size else 0
+        if stable >= stable_ticks:
+            break
+        last_size = size
+
+
+def render_job(job, output_dir, width, raw=False):
+    """Build, lay out and export one job in a worker; return its manifest entry."""
+    started = time.perf_counter()
+    if job["kind"] == "full_sample":
+        widget = _worker_app.create_full_sample_section()
+    else:
+        widget = _worker_app.create_variation(
+            job["description"], show_background=job["show_background"], **job["properties"]
+        )
+    settle(widget, width)
+    built = time.perf_counter()
+    image = widget.export_as_image()
+    image.save(str(Path(output_dir) / job["file"]), flipped=False)
+    if raw:
+        import numpy as np
+
+        texture = image.texture
+        pixels = np.frombuffer(texture.pixels, dtype=np.uint8).reshape(texture.height, texture.width, 4)
+        # Texture rows start at the bottom; store the top row first like the PNG
+        np.save(Path(output_dir) / Path(job["file"]).with_suffix(".npy"), pixels[::-1])
+    finished = time.perf_counter()
+    snapshot_width, snapshot_height = int(widget.width), int(widget.height)
+    # Workers render many jobs; drop the widget's registrations and pool its labels
+    _worker_app.recycle(widget)
+    return {
+        "file": job["file"],
+        "section": job["section"],
+        "description": job["description"],
+        "width": snapshot_width,
+        "height": snapshot_height,
+        "worker": os.getpid(),
+        "build_seconds": built - started,
+        "render_seconds": finished - built,
+    }
+
+
+def export_snapshots(
+    output_dir,
+    workers=None,
+    width=DEFAULT_WIDTH,
+    matrix_axes=None,
+    include_full_sample=True,
+    raw=False,
+):
+    """Render every job to ``output_dir`` and write manifest.json.
+
+    Args:
+        output_dir: Directory receiving the PNGs
+        workers: Number of worker processes (None uses the CPU count)
+        width: Width in pixels used for every snapshot
+        matrix_axes: Section titles to combine into a property matrix
+        include_full_sample: Also export the full sample section
+        raw: Also save the RGBA pixels of every snapshot as ``.npy``
+
+    Returns:
+        The manifest dict
+    """
+    from main import MarkdownDemoApp
+
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    app = MarkdownDemoApp(navigate_links=False)
+    label_cls = app.markdown_label_class() if matrix_axes else None
+    jobs = build_jobs(app, matrix_axes, label_cls, include_full_sample)
+    workers = workers or os.cpu_count() or 1
+
+    started = time.perf_counter()
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        count = len(jobs)
+        entries = list(pool.map(render_job, jobs, [output_dir] * count, [width] * count, [raw] * count, chunksize=chunksize))
+
+    manifest = {
+        "width": width,
+        "workers": workers,
+        "jobs": len(jobs),
+        "wall_seconds": time.perf_counter() - started,
+        "snapshots": entries,
+    }
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    return manifest
+
+
+def parse_args(argv=None):
+    """Parse snapshot export command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", "-o", default="snapshots", help="Output directory")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument("--width", type=int, default=DEFAULT_WIDTH, help="Snapshot width in pixels")
+    parser.add_argument(
+        "--matrix",
+        type=lambda value: [name.strip() for name in value.split(",") if name.strip()],
+        help="Export every combination of these sections' variations",
+    )
+    parser.add_argument("--no-full-sample", action="store_true", help="Skip the full sample section")
+    parser.add_argument("--raw", action="store_true", help="Also save RGBA pixels as .npy")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Export the snapshots selected on the command line."""
+    args = parse_args(argv)
+    # The parent only lists jobs; keep its window hidden too
+    os.environ.setdefault("KIVY_NO_ARGS", "1")
+    os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+    from kivy.config import Config
+
+    Config.set("graphics", "window_state", "hidden")
+    manifest = export_snapshots(
+        args.output,
+        workers=args.workers,
+        width=args.width,
+        matrix_axes=args.matrix,
+        include_full_sample=not args.no_full_sample,
+        raw=args.raw,
+    )
+    print(f"Exported {manifest['jobs']} snapshots in {manifest['wall_seconds']:.1f}s to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
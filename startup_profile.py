@@ -0,0 +1,163 @@
+"""Import-time and time-to-first-frame profiling for the demo's cold start.
+
+``ImportProfiler`` puts a finder at the front of ``sys.meta_path`` that
+times the execution of every module imported after it is installed, so the
+report shows which of Kivy, its window/graphics providers, mistune and
+markdownlabel dominate startup. Times are both cumulative (including nested
+imports) and self (excluding them), like ``python -X importtime``.
+
+``StartupProfile`` combines that breakdown with startup milestones recorded
+by the app (build finished, first frame drawn, sections ready).
+"""
+
+import importlib.abc
+import sys
+import time
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper that reports how long module execution took."""
+
+    def __init__(self, loader, profiler):
+        """Wrap ``loader``, reporting its module executions to ``profiler``."""
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        """Create the module with the wrapped loader (untimed)."""
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Execute ``module`` with the wrapped loader and time it."""
+        self._profiler._enter(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit(module.__name__)
+
+    def __getattr__(self, name):
+        """Return the wrapped loader's attribute ``name``."""
+        # Forward get_resource_reader, is_package, etc. to the real loader
+        return getattr(self._loader, name)
+
+
+class ImportProfiler(importlib.abc.MetaPathFinder):
+    """Meta path finder that records per-module import times."""
+
+    def __init__(self):
+        """Create a profiler that is not installed yet."""
+        # Module name -> (cumulative seconds, self seconds)
+        self.timings = {}
+        self._stack = []
+        self._finding = set()
+
+    def install(self):
+        """Start timing imports; only modules imported afterwards are measured."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Stop timing imports."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+    def find_spec(self, fullname, path, target=None):
+        """Find ``fullname`` with the other finders and time its loader.
+
+        Returns:
+            The spec found by the next finder, with its loader wrapped in a
+            _TimedLoader, or None if no finder knows the module
+        """
+        if fullname in self._finding:
+            return None
+        self._finding.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._finding.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self)
+        return spec
+
+    def _enter(self, name):
+        """Start timing the execution of module ``name``."""
+        # [name, start time, seconds spent in nested imports]
+        self._stack.append([name, time.perf_counter(), 0.0])
+
+    def _exit(self, name):
+        """Record the times of module ``name`` and add them to the importing module's nested time."""
+        _, started, nested = self._stack.pop()
+        elapsed = time.perf_counter() - started
+        self.timings[name] = (elapsed, elapsed - nested)
+        if self._stack:
+            self._stack[-1][2] += elapsed
+
+    def top(self, limit=20, key="cumulative"):
+        """Return the slowest imports.
+
+        Args:
+            limit: Number of modules to return
+            key: Sort by "cumulative" or "self" time
+
+        Returns:
+            List of (module, cumulative_seconds, self_seconds) tuples
+        """
+        index = 0 if key == "cumulative" else 1
+        rows = sorted(self.timings.items(), key=lambda item: item[1][index], reverse=True)
+        return [(name, cumulative, own) for name, (cumulative, own) in rows[:limit]]
+
+    def top_level_totals(self):
+        """Return self time summed per top-level package (kivy, mistune, ...)."""
+        totals = {}
+        for name, (_, own) in self.timings.items():
+            package = name.split(".", 1)[0]
+            totals[package] = totals.get(package, 0.0) + own
+        return dict(sorted(totals.items(), key=lambda item: item[1], reverse=True))
+
+
+class StartupProfile:
+    """Startup milestones plus the import breakdown, printed as a report."""
+
+    def __init__(self, started=None, profiler=None):
+        """Start a profile.
+
+        Args:
+            started: perf_counter() value treated as process start
+            profiler: Optional ImportProfiler that has been timing imports
+        """
+        self.started = time.perf_counter() if started is None else started
+        self.profiler = profiler
+        self.milestones = []
+
+    def mark(self, name):
+        """Record a named milestone at the current time."""
+        self.milestones.append((name, time.perf_counter() - self.started))
+
+    def report(self, limit=15):
+        """Return the profile as printable text.
+
+        Args:
+            limit: Number of slowest modules listed
+        """
+        lines = ["Startup profile", "==============="]
+        for name, seconds in self.milestones:
+            lines.append(f"{name:<28}{seconds * 1000:10.1f} ms")
+
+        if self.profiler is not None and self.profiler.timings:
+            lines.append("")
+            lines.append("Import self time by package")
+            for package, seconds in list(self.profiler.top_level_totals().items())[:limit]:
+                lines.append(f"  {package:<26}{seconds * 1000:10.1f} ms")
+            lines.append("")
+            lines.append("Slowest imports (cumulative / self)")
+            for name, cumulative, own in self.profiler.top(limit):
+                lines.append(f"  {name:<40}{cumulative * 1000:10.1f} ms {own * 1000:10.1f} ms")
+        return "\n".join(lines)
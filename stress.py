@@ -0,0 +1,161 @@
+"""Synthetic Markdown for stress-testing parsing, layout and scrolling.
+
+``generate_markdown`` builds a reproducible document of a given size from a
+weighted mix of block types: headings, long paragraphs, big tables, deeply
+nested lists and long fenced code blocks. The same size, mix and seed always
+produce the same text, so runs from 10 KB to 50 MB can be compared.
+
+Usage:
+    python3 main.py --stress-size 5MB --stress-mix paragraph=4,table=2 --stress-copies 10
+"""
+
+import random
+
+BLOCK_TYPES = ("heading", "paragraph", "table", "list", "code")
+DEFAULT_MIX = {"heading": 1, "paragraph": 4, "table": 1, "list": 2, "code": 1}
+SIZE_UNITS = {"B": 1, "KB": 1000, "MB": 1000 ** 2, "GB": 1000 ** 3}
+
+WORDS = (
+    "label texture layout widget canvas property binding scroll viewport frame "
+    "render parse token block heading paragraph table list code markdown kivy "
+    "window height width padding spacing font size color align wrap line text "
+    "cache event dispatch clock trigger instruction vertex fbo glyph atlas"
+).split()
+CODE_LINES = (
+    "for widget in root.walk(restrict=True):",
+    "    widget.height = widget.minimum_height",
+    "label = MarkdownLabel(text=source, size_hint_y=None)",
+    "tokens = parser(source)",
+    "Clock.schedule_once(callback, 0)",
+    "if not tokens:",
+    "    return None",
+    "result.append({'type': 'paragraph', 'children': children})",
+)
+
+
+def parse_size(value):
+    """Return the number of bytes in a size such as ``"10KB"`` or ``"50MB"``.
+
+    Raises:
+        ValueError: If the unit is unknown or the number is not valid
+    """
+    text = value.strip().upper()
+    for unit in sorted(SIZE_UNITS, key=len, reverse=True):
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * SIZE_UNITS[unit])
+    return int(text)
+
+
+def parse_mix(value):
+    """Return a block-type weight dict from ``"paragraph=4,table=1"``.
+
+    Block types that are not listed get weight 0.
+
+    Raises:
+        ValueError: For unknown block types, negative weights or an all-zero mix
+    """
+    mix = dict.fromkeys(BLOCK_TYPES, 0)
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in mix:
+            raise ValueError(f"Unknown block type {name!r}; expected one of {', '.join(BLOCK_TYPES)}")
+        mix[name] = float(weight) if weight else 1
+        if mix[name] < 0:
+            raise ValueError(f"Negative weight for {name!r}")
+    if not any(mix.values()):
+        raise ValueError("At least one block type needs a positive weight")
+    return mix
+
+
+def _sentence(rng):
+    """Return a random sentence, sometimes with inline code, bold text or a link."""
+    words = rng.choices(WORDS, k=rng.randint(8, 20))
+    styled = rng.random()
+    if styled < 0.15:
+        words[rng.randrange(len(words))] = f"`{rng.choice(WORDS)}()`"
+    elif styled < 0.3:
+        words[rng.randrange(len(words))] = f"**{rng.choice(WORDS)}**"
+    elif styled < 0.35:
+        words[rng.randrange(len(words))] = f"[{rng.choice(WORDS)}](https://example.com/{rng.choice(WORDS)})"
+    return " ".join(words).capitalize() + "."
+
+
+def _heading(rng, number):
+    """Return a numbered ATX heading of level 1 to 4."""
+    level = rng.randint(1, 4)
+    return f"{'#' * level} Section {number}: {rng.choice(WORDS).capitalize()} {rng.choice(WORDS)}"
+
+
+def _paragraph(rng, number):
+    """Return a paragraph of 4 to 16 sentences."""
+    return " ".join(_sentence(rng) for _ in range(rng.randint(4, 16)))
+
+
+def _table(rng, number):
+    """Return a pipe table of 3 to 8 columns and 10 to 60 rows."""
+    columns = rng.randint(3, 8)
+    rows = rng.randint(10, 60)
+    lines = [
+        "| " + " | ".join(f"{rng.choice(WORDS)} {column}" for column in range(columns)) + " |",
+        "|" + "---|" * columns,
+    ]
+    for row in range(rows):
+        cells = (f"{rng.choice(WORDS)} {rng.randint(0, 9999)}" for _ in range(columns))
+        lines.append("| " + " | ".join(cells) + " |")
+    return "\n".join(lines)
+
+
+def _nested_list(rng, number):
+    """Return a list of 10 to 40 items nested up to 6 levels, alternating bullets and numbers."""
+    lines = []
+    depth = 0
+    for item in range(rng.randint(10, 40)):
+        if item:
+            # Items nest at most one level deeper than the previous one
+            depth = max(0, min(depth + rng.choice((-1, 0, 1)), 6))
+        marker = "-" if depth % 2 == 0 else "1."
+        lines.append(f"{'  ' * depth * 2}{marker} {_sentence(rng)}")
+    return "\n".join(lines)
+
+
+def _code(rng, number):
+    """Return a fenced Python block of 20 to 200 lines."""
+    lines = rng.choices(CODE_LINES, k=rng.randint(20, 200))
+    return "```python\n" + "\n".join(lines) + "\n```"
+
+
+BUILDERS = {
+    "heading": _heading,
+    "paragraph": _paragraph,
+    "table": _table,
+    "list": _nested_list,
+    "code": _code,
+}
+
+
+def generate_markdown(size, mix=None, seed=0):
+    """Return synthetic Markdown of at least ``size`` bytes.
+
+    Args:
+        size: Target size in bytes
+        mix: Dict of block type to relative weight (defaults to DEFAULT_MIX)
+        seed: Random seed; equal arguments always produce equal text
+
+    Returns:
+        ASCII Markdown with blocks separated by blank lines
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    names = [name for name in BLOCK_TYPES if mix.get(name, 0) > 0]
+    weights = [mix[name] for name in names]
+    if not names:
+        raise ValueError("At least one block type needs a positive weight")
+    rng = random.Random(seed)
+    blocks = []
+    total = 0
+    while total < size:
+        name = rng.choices(names, weights)[0]
+        block = BUILDERS[name](rng, len(blocks) + 1)
+        blocks.append(block)
+        total += len(block) + 2
+    return "\n\n".join(blocks)
@@ -0,0 +1,203 @@
+"""Live style controls for the displayed MarkdownLabels.
+
+``StyleControlPanel`` is a strip of sliders and pickers above the scroll
+view. Controls do not touch the labels directly: every change is handed to
+``StyleBatcher``, which keeps only the latest value per property and applies
+the batch from one Clock trigger before the next frame. Dragging a slider
+over many labels therefore restyles them at most once per frame, however
+many ticks the slider dispatched.
+
+Properties are applied in two classes:
+
+- style-only properties (``color``, ``disabled_color``) only recolor text
+  that is already laid out, so they are set on every label in the flush;
+- other properties (``font_size``, ``line_height``, ``halign``, ...) make a
+  label lay out its text again. Visible labels are restyled in the flush,
+  the remaining ones over the following frames within a time budget. A new
+  change while that is in progress restarts the queue with the latest values.
+
+The source text is never set, so no label parses its Markdown again; the
+labels re-render from their existing (shared) token trees.
+"""
+
+import time
+from collections import deque
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+from kivy.uix.slider import Slider
+from kivy.uix.spinner import Spinner
+from kivy.uix.togglebutton import ToggleButton
+
+from markdown_blocks import DEFAULT_FRAME_BUDGET
+
+STYLE_ONLY_PROPERTIES = frozenset({"color", "disabled_color"})
+
+COLOR_PRESETS = {
+    "white": [1, 1, 1, 1],
+    "yellow": [1, 1, 0, 1],
+    "cyan": [0, 1, 1, 1],
+    "orange": [1, 0.6, 0.2, 1],
+    "gray": [0.5, 0.5, 0.5, 1],
+    "dark gray": [0.3, 0.3, 0.3, 1],
+}
+
+HALIGN_VALUES = ("left", "center", "right", "justify")
+
+PANEL_HEIGHT = 90
+
+
+class StyleBatcher:
+    """Coalesce property changes and apply them to labels once per frame."""
+
+    def __init__(self, targets, visible=None, frame_budget=DEFAULT_FRAME_BUDGET):
+        """Create a batcher.
+
+        Args:
+            targets: Callable returning the labels to restyle
+            visible: Optional callable returning the currently visible labels,
+                which are restyled first
+            frame_budget: Seconds per frame spent restyling off-screen labels
+        """
+        self.targets = targets
+        self.visible = visible
+        self.frame_budget = frame_budget
+        self.overrides = {}
+        self.flushes = 0
+        self.updates = 0
+        self._pending = {}
+        self._queue = deque()
+        self._queued_names = set()
+        # timeout -1 runs the flush before the next frame is drawn
+        self._trigger = Clock.create_trigger(self.flush, -1)
+        self._slice_trigger = Clock.create_trigger(self._restyle_slice)
+
+    @property
+    def busy(self):
+        """True while changes wait for a flush or off-screen labels are queued."""
+        return bool(self._pending or self._queue)
+
+    def set(self, name, value):
+        """Request ``name = value`` on every label (applied before the next frame)."""
+        self.overrides[name] = value
+        self._pending[name] = value
+        self._trigger()
+
+    def flush(self, *args):
+        """Apply the pending changes collected since the last flush."""
+        if not self._pending:
+            return
+        changes = self._pending
+        self._pending = {}
+        self.flushes += 1
+        labels = list(self.targets())
+
+        style = {name: value for name, value in changes.items() if name in STYLE_ONLY_PROPERTIES}
+        if style:
+            for label in labels:
+                self._apply(label, style)
+
+        layout_names = changes.keys() - STYLE_ONLY_PROPERTIES
+        if not layout_names:
+            return
+        # Labels still queued from an earlier change need those properties too
+        self._queued_names.update(layout_names)
+        visible = set(self.visible()) if self.visible is not None else set(labels)
+        properties = self._queued_properties()
+        for label in labels:
+            if label in visible:
+                self._apply(label, properties)
+        self._queue = deque(label for label in labels if label not in visible)
+        if self._queue:
+            self._slice_trigger()
+        else:
+            self._queued_names.clear()
+
+    def _restyle_slice(self, *args):
+        """Restyle queued off-screen labels until the frame budget is spent."""
+        deadline = time.perf_counter() + self.frame_budget
+        properties = self._queued_properties()
+        while self._queue:
+            self._apply(self._queue.popleft(), properties)
+            if time.perf_counter() >= deadline:
+                break
+        if self._queue:
+            self._slice_trigger()
+        else:
+            self._queued_names.clear()
+
+    def _queued_properties(self):
+        """Return the latest values of the properties the queue applies."""
+        return {name: self.overrides[name] for name in self._queued_names}
+
+    def _apply(self, label, properties):
+        """Set the properties of ``label`` that differ from ``properties``."""
+        for name, value in properties.items():
+            if getattr(label, name) != value:
+                setattr(label, name, value)
+                self.updates += 1
+
+    def stats(self):
+        """Return counters of flushes and property updates."""
+        return {
+            "flushes": self.flushes,
+            "updates": self.updates,
+            "queued_labels": len(self._queue),
+        }
+
+
+class StyleControlPanel(BoxLayout):
+    """Sliders and pickers that restyle labels through a StyleBatcher."""
+
+    def __init__(self, batcher, **kwargs):
+        """Create the controls.
+
+        Args:
+            batcher: StyleBatcher receiving every change
+        """
+        kwargs.setdefault('orientation', 'horizontal')
+        super().__init__(size_hint_y=None, height=PANEL_HEIGHT, spacing=10, padding=[10, 5], **kwargs)
+        self.batcher = batcher
+        # Controls by property name
+        self.controls = {}
+
+        self._add_slider("font_size", 8, 40, 1, 15)
+        self._add_slider("line_height", 0.8, 2.5, 0.1, 1.0)
+        self._add_picker("halign", HALIGN_VALUES, "left", lambda text: text)
+        self._add_picker("color", COLOR_PRESETS, "white", COLOR_PRESETS.get)
+        self._add_picker("disabled_color", COLOR_PRESETS, "gray", COLOR_PRESETS.get)
+
+        toggle = ToggleButton(text="disabled", size_hint_x=0.6)
+        toggle.bind(state=lambda button, state: batcher.set("disabled", state == "down"))
+        self.controls["disabled"] = toggle
+        self.add_widget(toggle)
+
+    def _add_column(self, name, control):
+        """Add ``control`` below a caption showing ``name``."""
+        column = BoxLayout(orientation='vertical', spacing=2)
+        caption = Label(text=name, font_size='13sp', size_hint_y=None, height=24)
+        column.add_widget(caption)
+        column.add_widget(control)
+        self.add_widget(column)
+        return caption
+
+    def _add_slider(self, name, low, high, step, value):
+        """Add a slider for the numeric property ``name``."""
+        slider = Slider(min=low, max=high, step=step, value=value)
+        caption = self._add_column(name, slider)
+
+        def on_value(instance, new_value):
+            """Show the slider's value and queue it for the labels."""
+            caption.text = f"{name} = {new_value:g}"
+            self.batcher.set(name, new_value)
+
+        slider.bind(value=on_value)
+        self.controls[name] = slider
+
+    def _add_picker(self, name, choices, default, to_value):
+        """Add a picker for ``name``; ``to_value`` maps a choice to the property value."""
+        spinner = Spinner(text=default, values=list(choices))
+        self._add_column(name, spinner)
+        spinner.bind(text=lambda instance, text: self.batcher.set(name, to_value(text)))
+        self.controls[name] = spinner
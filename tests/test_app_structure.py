@@ -1,6 +1,7 @@
 """Unit tests for application structure."""
 import unittest
 from unittest.mock import patch
+from kivy.clock import Clock
 from kivy.core.window import Window
 from kivy.uix.scrollview import ScrollView
 from kivy.uix.boxlayout import BoxLayout
@@ -166,6 +167,130 @@ class TestApplicationStructure(unittest.TestCase):
                         "Each property section should contain at least 2 MarkdownLabel variations"
                     )
 
+    def test_label_registry_matches_tree(self):
+        """Test that the label registry indexes exactly the labels in each section."""
+        root_widget = self.app.build()
+        main_layout = root_widget.children[0]
+
+        for section in main_layout.children:
+            title = section.section_title
+            self.assertCountEqual(self.app.section_markdown_labels(title), find_markdownlabels(section))
+        self.assertCountEqual(self.app.displayed_markdown_labels(), find_markdownlabels(main_layout))
+
+        centered = self.app.label_registry.labels(section="halign", halign="center")
+        self.assertEqual(len(centered), 1)
+        self.assertEqual(centered[0].halign, "center")
+
+    def test_label_registry_follows_rebuilds(self):
+        """Test that rebuilt sections replace the registered labels.
+
+        The rendered document is kept by the document cache and reattached,
+        so its labels are registered again rather than replaced.
+        """
+        from main import DOCUMENT_SECTION
+
+        root_widget = self.app.build()
+        main_layout = root_widget.children[0]
+        old_labels = set(self.app.displayed_markdown_labels())
+        old_document_labels = set(self.app.section_markdown_labels(DOCUMENT_SECTION))
+
+        self.app.rebuild_sections()
+
+        labels = self.app.displayed_markdown_labels()
+        self.assertCountEqual(labels, find_markdownlabels(main_layout))
+        document_labels = set(self.app.section_markdown_labels(DOCUMENT_SECTION))
+        self.assertEqual(document_labels, old_document_labels)
+        self.assertFalse((old_labels - old_document_labels) & (set(labels) - document_labels))
+
+    def test_font_warmup_defers_sections(self):
+        """Test that no section is built before the fonts are warm."""
+        from main import MarkdownDemoApp
+
+        app = MarkdownDemoApp(warm_fonts=True)
+        root_widget = app.build()
+        self.assertEqual(find_markdownlabels(root_widget), [], "Sections should wait for the warm-up")
+        self.assertTrue(app._sections_pending)
+
+    def test_shared_renders_follow_released_sections(self):
+        """Test that every shared rendering comes from a registered label after a release."""
+        from main import MarkdownDemoApp, is_within
+
+        app = MarkdownDemoApp(share_renders=True)
+        app.build()
+        section, _ = next(iter(app.section_widgets.values()))
+        app.main_layout.remove_widget(section)
+        app.recycle(section)
+
+        for share in app.render_shares.shares.values():
+            self.assertIn(share.primary, app.label_registry)
+            for view in share.views:
+                self.assertTrue(is_within(view, app.main_layout), "Views of released sections should leave their share")
+
+    def test_outline_renders_the_document_per_block(self):
+        """Test that outline headings are located on their block's own widget."""
+        from main import MarkdownDemoApp
+        from markdown_blocks import BlockMarkdownView
+
+        app = MarkdownDemoApp(outline=True)
+        app.build()
+        self.assertIsInstance(app.document_widget, BlockMarkdownView)
+        headings = [entry for entry in app.outline_index.entries if entry.kind == "heading"]
+        self.assertTrue(headings)
+        for entry in headings:
+            widget, _ = app.locate_outline_entry(entry)
+            self.assertIs(widget, app.document_widget.block_widgets[entry.key.block])
+
+    def test_search_renders_the_document_per_block(self):
+        """Test that opening the find bar splits a whole-document rendering into blocks."""
+        from main import DOCUMENT_SECTION, MarkdownDemoApp
+        from markdown_blocks import BlockMarkdownView
+
+        app = MarkdownDemoApp()
+        app.build()
+        self.assertNotIsInstance(app.document_widget, BlockMarkdownView)
+        app.toggle_find_bar()
+        self.assertIsInstance(app.document_widget, BlockMarkdownView)
+        self.assertIs(app.document_widget.parent, app.document_section)
+        match = next(found for found in app.search_index.search("markdown") if found.source == DOCUMENT_SECTION)
+        widget, start, span = app.locate_match(match)
+        self.assertEqual((start, span), (0.0, 1.0))
+
+    def test_coordinated_rect_updates_are_counted(self):
+        """Test that background moves applied by the coordinator count as canvas updates."""
+        from main import MarkdownDemoApp
+
+        app = MarkdownDemoApp(coalesce_layout=True, layout_metrics_interval=60)
+        try:
+            app.build()
+            for _ in range(5):
+                # Flushes, layouts and end_frame run as Clock callbacks
+                Clock.tick()
+            app.layout_metrics.end_frame()
+            sections = app.layout_metrics.report()["sections"]
+            self.assertGreater(sum(section["totals"].get("canvas_updates", 0) for section in sections.values()), 0)
+        finally:
+            app.layout_metrics.uninstall()
+
+    def test_layout_metrics_watch_new_sections(self):
+        """Test that sections built after startup are watched without a re-scan."""
+        from main import MarkdownDemoApp
+
+        app = MarkdownDemoApp(layout_metrics_interval=60)
+        try:
+            app.build()
+            title, variations, show_background = app.section_specs()[0]
+            section = app.create_section(title, variations, show_background=show_background)
+            labels = find_markdownlabels(section)
+            self.assertTrue(labels)
+            app.layout_metrics.report()
+            for label in labels:
+                label.text_size = (label.width + 1, None)
+            app.layout_metrics.end_frame()
+            totals = app.layout_metrics.report()["sections"][title]["totals"]
+            self.assertGreaterEqual(totals["text_size"], len(labels))
+        finally:
+            app.layout_metrics.uninstall()
+
     def test_full_sample_section_present(self):
         """Test that the full sample_markdown.md section is appended."""
         root_widget = self.app.build()
@@ -181,6 +306,20 @@ class TestApplicationStructure(unittest.TestCase):
             "Layout should include a section for sample_markdown.md content"
         )
 
+    def test_virtualized_build_defers_sections(self):
+        """Test that virtualized mode starts with placeholders for every section."""
+        from main import MarkdownDemoApp
+        from virtual_sections import SectionPlaceholder
+
+        app = MarkdownDemoApp(virtualized=True)
+        root_widget = app.build()
+        main_layout = root_widget.children[0]
+
+        placeholders = [child for child in main_layout.children if isinstance(child, SectionPlaceholder)]
+        self.assertEqual(len(placeholders), len(main_layout.children), "Every section should be a placeholder")
+        self.assertIn('sample_markdown.md', [p.section_title for p in placeholders])
+        self.assertEqual(find_markdownlabels(root_widget), [], "No section should be built before layout")
+
 
 if __name__ == '__main__':
     unittest.main()
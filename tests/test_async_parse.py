@@ -0,0 +1,123 @@
+"""Unit tests for background parsing."""
+import threading
+import time
+import unittest
+import warnings
+from kivy.uix.widget import Widget
+
+import parse_cache
+from async_parse import BackgroundParser, estimate_markdown_height
+from parse_cache import PARSE_CACHE
+
+
+def make_other_parser():
+    """Return a parser whose signature differs from create_parser()'s."""
+    import mistune
+
+    return mistune.create_markdown(renderer="ast", plugins=["table"])
+
+
+class TestBackgroundParser(unittest.TestCase):
+    """Test worker parsing and main-thread handoff."""
+
+    def setUp(self):
+        """Start a thread-pool parser with an empty cache."""
+        parse_cache.install()
+        PARSE_CACHE.clear()
+        self.parser = BackgroundParser(max_workers=2)
+
+    def tearDown(self):
+        """Stop the pool and restore mistune."""
+        self.parser.shutdown()
+        parse_cache.uninstall()
+
+    def wait_until_ready(self, count, timeout=5):
+        """Wait until ``count`` callbacks are queued for the main thread."""
+        deadline = time.monotonic() + timeout
+        while len(self.parser._ready) < count:
+            if time.monotonic() > deadline:
+                self.fail("Background parse did not finish in time")
+            time.sleep(0.01)
+
+    def test_parsed_tokens_land_in_cache(self):
+        """Test that a label parser finds background-parsed tokens in the cache."""
+        text = "## Parsed in the background\n\nWith a paragraph."
+        self.parser.submit(text).result(timeout=5)
+
+        parse_cache.create_parser()(text)
+        self.assertEqual(PARSE_CACHE.stats()["hits"], 1, "Main-thread parse should hit the cache")
+
+    def test_identical_texts_share_one_parse(self):
+        """Test that concurrent requests for the same text reuse one future."""
+        text = "same text"
+        self.assertIs(self.parser.submit(text), self.parser.submit(text))
+
+    def test_slot_filled_on_main_thread_drain(self):
+        """Test that slots only receive their widget when the queue is drained."""
+        text = "# Title"
+        slot = self.parser.slot(text, lambda: Widget(size_hint_y=None, height=123))
+        self.wait_until_ready(1)
+
+        self.assertIsNone(slot.content, "Widget must not be built on the worker thread")
+        self.parser._drain()
+        self.assertIsNotNone(slot.content)
+        self.assertEqual(slot.height, 123, "Slot should take the widget's height")
+
+    def test_shutdown_cancels_queued_parses(self):
+        """Test that texts waiting for a worker are cancelled on shutdown."""
+        parser = BackgroundParser(max_workers=1)
+        release = threading.Event()
+        busy = parser._executor.submit(release.wait)
+        queued = parser.submit("queued text")
+
+        parser.shutdown()
+        release.set()
+
+        self.assertTrue(queued.cancelled())
+        self.assertTrue(busy.result(timeout=5))
+
+    def test_mismatched_label_parser_is_reported(self):
+        """Test that a label parsing unlike the guessed parser is reported and then used."""
+        early = "Parsed before any label existed."
+        self.parser.submit(early).result(timeout=5)
+        label_parser = make_other_parser()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            label_parser(early)
+            label_parser("Another text.")
+        self.assertEqual([warning.category for warning in caught], [RuntimeWarning], "Reported once")
+
+        late = "Parsed after the first label."
+        self.parser.submit(late).result(timeout=5)
+        hits = PARSE_CACHE.stats()["hits"]
+        label_parser(late)
+        self.assertEqual(PARSE_CACHE.stats()["hits"], hits + 1, "Later texts use the label's configuration")
+
+    def test_processes_fall_back_to_threads_on_mismatch(self):
+        """Test that process mode parses on threads once labels parse differently."""
+        parser = BackgroundParser(max_workers=1, use_processes=True)
+        try:
+            self.assertTrue(parser._processes_match())
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", RuntimeWarning)
+                make_other_parser()("label text")
+            self.assertFalse(parser._processes_match())
+
+            text = "Parsed on a thread."
+            parser.submit(text).result(timeout=5)
+            hits = PARSE_CACHE.stats()["hits"]
+            make_other_parser()(text)
+            self.assertEqual(PARSE_CACHE.stats()["hits"], hits + 1)
+        finally:
+            parser.shutdown()
+
+    def test_height_estimate_grows_with_text(self):
+        """Test that placeholder estimates scale with wrapped line count."""
+        short = estimate_markdown_height("one line")
+        long = estimate_markdown_height("word " * 2000)
+        self.assertGreater(long, short * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+"""Smoke test for the headless benchmark."""
+import importlib.util
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+HAS_MARKDOWNLABEL = importlib.util.find_spec("kivy_garden") is not None and \
+    importlib.util.find_spec("kivy_garden.markdownlabel") is not None
+
+REPORT_KEYS = {
+    "parameters",
+    "build_seconds",
+    "sections",
+    "first_frame_seconds",
+    "frames",
+    "widgets",
+    "peak_rss_bytes",
+    "versions",
+}
+
+
+@unittest.skipUnless(HAS_MARKDOWNLABEL, "kivy_garden.markdownlabel is not installed")
+class TestBenchSmoke(unittest.TestCase):
+    """Run bench.py for a few frames and check its report."""
+
+    def test_report_has_expected_keys(self):
+        """Test that a short run writes a complete JSON report."""
+        with tempfile.TemporaryDirectory() as directory:
+            output = Path(directory) / "bench.json"
+            subprocess.run(
+                [sys.executable, "bench.py", "--frames", "3", "-o", str(output)],
+                cwd=Path(__file__).parents[1],
+                check=True,
+                timeout=300,
+            )
+            report = json.loads(output.read_text(encoding="utf-8"))
+
+        self.assertEqual(set(report), REPORT_KEYS)
+        self.assertEqual(report["parameters"]["frames"], 3)
+        self.assertEqual(report["frames"]["count"], 3)
+        self.assertGreater(report["widgets"]["markdown_labels"], 0)
+        self.assertTrue(report["sections"], "Every built section should be timed")
+
+
+class TestPeakRss(unittest.TestCase):
+    """Test the peak RSS measurement."""
+
+    def test_missing_resource_module_reports_none(self):
+        """Test that platforms without ``resource`` (Windows) report no peak RSS."""
+        import bench
+
+        if bench.resource is not None:
+            self.assertGreater(bench.peak_rss_bytes(), 0)
+        with mock.patch.object(bench, "resource", None):
+            self.assertIsNone(bench.peak_rss_bytes())
+
+
+if __name__ == '__main__':
+    unittest.main()
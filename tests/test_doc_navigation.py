@@ -0,0 +1,161 @@
+"""Unit tests for navigation between linked Markdown files."""
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from kivy.clock import Clock
+
+import parse_cache
+
+from doc_navigation import DocumentCache, DocumentNavigator, local_links, resolve_link
+
+
+class TestLinks(unittest.TestCase):
+    """Test link resolution and extraction."""
+
+    def setUp(self):
+        """Create a document tree with a guide and another page."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name).resolve()
+        (self.root / "docs").mkdir()
+        (self.root / "docs" / "guide.md").write_text("# Guide\n", encoding="utf-8")
+        (self.root / "other.md").write_text("# Other\n", encoding="utf-8")
+        self.index = self.root / "index.md"
+
+    def tearDown(self):
+        """Remove the document tree."""
+        self.tmp.cleanup()
+
+    def test_relative_markdown_links_resolve_against_the_document(self):
+        """Test that relative .md targets resolve next to the linking file."""
+        self.assertEqual(resolve_link("docs/guide.md#setup", self.index), self.root / "docs" / "guide.md")
+        self.assertEqual(
+            resolve_link("../other.md", self.root / "docs" / "guide.md"), self.root / "other.md"
+        )
+
+    def test_urls_anchors_and_other_files_are_not_followed(self):
+        """Test that only local Markdown targets resolve."""
+        for ref in ("https://kivy.org/readme.md", "mailto:a@b.c", "#anchor", "", "image.png", "not-a-url"):
+            with self.subTest(ref=ref):
+                self.assertIsNone(resolve_link(ref, self.index))
+
+    def test_local_links_lists_existing_targets_once(self):
+        """Test that inline and reference links are collected without duplicates."""
+        text = (
+            "See [the guide](docs/guide.md) and [again](docs/guide.md#x).\n"
+            "[Kivy](https://kivy.org) [missing](missing.md)\n\n"
+            "[other]: other.md\n"
+        )
+        self.assertEqual(local_links(text, self.index), [self.root / "docs" / "guide.md", self.root / "other.md"])
+
+
+class TestDocumentCache(unittest.TestCase):
+    """Test LRU eviction and invalidation."""
+
+    def test_least_recently_used_document_is_evicted(self):
+        """Test that reading an entry protects it from eviction."""
+        evicted = []
+        cache = DocumentCache(maxsize=2, on_evict=evicted.append)
+        cache.put(Path("a.md"), "a")
+        cache.put(Path("b.md"), "b")
+        cache.get(Path("a.md"))
+        cache.put(Path("c.md"), "c")
+
+        self.assertEqual([entry.path for entry in evicted], [Path("b.md")])
+        self.assertIn(Path("a.md"), cache)
+
+    def test_changed_file_is_dropped(self):
+        """Test that an entry is invalid once its file's mtime changes."""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "doc.md"
+            path.write_text("old", encoding="utf-8")
+            cache = DocumentCache()
+            cache.put(path, "old", os.stat(path).st_mtime_ns)
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+            self.assertIsNone(cache.get(path))
+            self.assertNotIn(path, cache)
+
+
+class TestDocumentNavigator(unittest.TestCase):
+    """Test history and prefetching."""
+
+    def setUp(self):
+        """Start a navigator at an index linking to two documents."""
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name).resolve()
+        self.start = self.root / "index.md"
+        self.start.write_text("[a](a.md) [b](b.md)", encoding="utf-8")
+        for name in ("a", "b"):
+            (self.root / f"{name}.md").write_text(f"# {name}", encoding="utf-8")
+        self.navigator = DocumentNavigator(self.start, self.start.read_text(encoding="utf-8"))
+
+    def tearDown(self):
+        """Stop prefetching and remove the document tree."""
+        self.navigator.shutdown()
+        self.tmp.cleanup()
+
+    def test_back_and_forward_follow_the_history(self):
+        """Test browser-like history semantics."""
+        self.navigator.open(self.root / "a.md")
+        self.navigator.open(self.root / "b.md")
+
+        self.assertEqual(self.navigator.back().path, self.root / "a.md")
+        self.assertEqual(self.navigator.back().path, self.start)
+        self.assertIsNone(self.navigator.back())
+        self.assertEqual(self.navigator.forward().path, self.root / "a.md")
+
+        self.navigator.open(self.root / "index.md")
+        self.assertIsNone(self.navigator.forward(), "Opening a document should clear the forward history")
+
+    def test_revisited_documents_are_not_read_again(self):
+        """Test that a visited document comes from the cache."""
+        first = self.navigator.open(self.root / "a.md")
+        first.widget = object()
+        self.navigator.back()
+
+        self.assertIs(self.navigator.forward(), first)
+        self.assertEqual(self.navigator.cache.misses, 1)
+
+    def test_prefetch_caches_linked_documents(self):
+        """Test that linked files are read in the background and cached."""
+        self.navigator.prefetch_links(self.navigator.document())
+        deadline = time.monotonic() + 5
+        while self.navigator._prefetching and time.monotonic() < deadline:
+            Clock.tick()
+
+        self.assertIn(self.root / "a.md", self.navigator.cache)
+        self.assertIn(self.root / "b.md", self.navigator.cache)
+        self.assertEqual(self.navigator.prefetched, 2)
+
+    def test_prefetch_parses_the_rendered_texts(self):
+        """Test that prefetching warms the parse cache with ``render_texts``."""
+        parse_cache.install()
+        self.addCleanup(parse_cache.uninstall)
+        self.navigator.render_texts = lambda text: [text + " (chunk)"]
+        self.navigator.prefetch_links(self.navigator.document())
+        deadline = time.monotonic() + 5
+        while self.navigator._prefetching and time.monotonic() < deadline:
+            Clock.tick()
+
+        md = parse_cache.label_parsers()[0]
+        self.assertIsNotNone(parse_cache.PARSE_CACHE.get(parse_cache.cache_key(md, "# a (chunk)")))
+        self.assertIsNone(parse_cache.PARSE_CACHE.get(parse_cache.cache_key(md, "# a")))
+
+    def test_shutdown_cancels_pending_prefetches(self):
+        """Test that prefetches still waiting for a worker are cancelled."""
+        self.navigator.prefetch_links(self.navigator.document())
+        pending = list(self.navigator._prefetching.values())
+
+        self.navigator.shutdown()
+
+        self.assertEqual(self.navigator._prefetching, {})
+        for future in pending:
+            self.assertTrue(future.cancelled() or future.done())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+"""Unit tests for font preloading and glyph warm-up."""
+import time
+import unittest
+from kivy.clock import Clock
+from kivy.core.window import Window  # noqa: F401  (text rendering needs a GL context)
+
+from font_warmup import MONOSPACE_FONT, FontWarmup, document_glyphs, font_files
+
+
+class TestFontWarmup(unittest.TestCase):
+    """Test font resolution and the warm-up stages."""
+
+    def test_font_files_resolve_faces(self):
+        """Test that registered families resolve to every face's file."""
+        roboto = font_files("Roboto")
+        self.assertGreaterEqual(len(roboto), 4, "Regular, italic, bold and bold italic")
+        self.assertEqual(len(font_files("DejaVuSans")), 1)
+        self.assertEqual(len(font_files(MONOSPACE_FONT)), 1)
+        self.assertEqual(font_files("NoSuchFont"), [])
+
+    def test_document_glyphs(self):
+        """Test that document characters are added to the ASCII set."""
+        glyphs = document_glyphs("Größe ✓\n")
+        self.assertIn("ö", glyphs)
+        self.assertIn("✓", glyphs)
+        self.assertIn("A", glyphs)
+        self.assertNotIn("\n", glyphs)
+
+    def test_warmup_reads_and_renders(self):
+        """Test that fonts are read off the main thread and then prerendered."""
+        completed = []
+        warmup = FontWarmup(
+            ["Roboto", "DejaVuSans", "NoSuchFont"], [15, 15, 20], text="héllo", on_complete=completed.append
+        )
+        warmup.start()
+
+        deadline = time.time() + 10
+        while not completed and time.time() < deadline:
+            Clock.tick()
+
+        self.assertEqual(completed, [warmup])
+        self.assertTrue(warmup.done)
+        stats = warmup.stats()
+        self.assertGreater(stats["bytes_read"], 0)
+        # Two fonts, two sizes, four faces and one chunk of glyphs each
+        self.assertEqual(stats["renders"], 2 * 2 * 4)
+        self.assertEqual(stats["bytes_read"], sum(
+            len(open(path, "rb").read()) for path in font_files("Roboto") + font_files("DejaVuSans")
+        ))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Unit tests for the sample file watcher."""
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from hot_reload import FileWatcher
+
+
+class TestFileWatcher(unittest.TestCase):
+    """Test change detection of the polling watcher."""
+
+    def setUp(self):
+        """Create a watched temporary file."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmpdir.name) / "doc.md"
+        self.path.write_text("# Title\n", encoding="utf-8")
+        self.received = []
+        self.watcher = FileWatcher(self.path, self.received.append)
+        self.watcher.start()
+
+    def tearDown(self):
+        """Stop the watcher and remove the file."""
+        self.watcher.stop()
+        self.tmpdir.cleanup()
+
+    def test_unchanged_file_is_not_reported(self):
+        """Test that polling an unchanged file does not call back."""
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.received, [])
+
+    def test_change_is_reported_once(self):
+        """Test that a change calls back with the new text exactly once."""
+        self.path.write_text("# Title\n\nMore text\n", encoding="utf-8")
+        stat = self.path.stat()
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        self.assertTrue(self.watcher.check())
+        self.assertFalse(self.watcher.check())
+        self.assertEqual(self.received, ["# Title\n\nMore text\n"])
+
+    def test_missing_file_is_ignored(self):
+        """Test that a temporarily missing file does not raise."""
+        self.path.unlink()
+        self.assertFalse(self.watcher.check())
+
+
+if __name__ == '__main__':
+    unittest.main()
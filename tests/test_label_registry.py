@@ -0,0 +1,88 @@
+"""Unit tests for the MarkdownLabel registry."""
+import unittest
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from label_registry import LabelRegistry
+
+
+def is_label(widget):
+    """Stand-in for the app's MarkdownLabel check."""
+    return isinstance(widget, Label)
+
+
+class TestLabelRegistry(unittest.TestCase):
+    """Test indexing by section and properties."""
+
+    def setUp(self):
+        """Register three labels in two sections."""
+        self.registry = LabelRegistry(is_label)
+        self.left = Label()
+        self.center = Label()
+        self.colored = Label()
+        self.registry.register(self.left, "halign", {"halign": "left"})
+        self.registry.register(self.center, "halign", {"halign": "center"})
+        self.registry.register(self.colored, "color", {"color": [1, 0, 0, 1], "halign": "center"})
+
+    def test_lookup_by_section(self):
+        """Test labels are returned per section in registration order."""
+        self.assertEqual(self.registry.labels(section="halign"), [self.left, self.center])
+        self.assertEqual(self.registry.labels(section="missing"), [])
+        self.assertEqual(self.registry.sections(), ["halign", "color"])
+
+    def test_lookup_by_properties(self):
+        """Test property lookups intersect, with list values matched as given."""
+        self.assertEqual(self.registry.labels(halign="center"), [self.center, self.colored])
+        self.assertEqual(self.registry.labels(section="color", halign="center"), [self.colored])
+        self.assertEqual(self.registry.labels(color=[1, 0, 0, 1]), [self.colored])
+        self.assertEqual(self.registry.labels(halign="right"), [])
+
+    def test_without_criteria_returns_every_label(self):
+        """Test an unfiltered lookup lists all registered labels."""
+        self.assertEqual(self.registry.labels(), [self.left, self.center, self.colored])
+        self.assertEqual(len(self.registry), 3)
+
+    def test_register_again_replaces_entry(self):
+        """Test a recycled label moves to its new section and properties."""
+        self.registry.register(self.left, "color", {"color": [0, 1, 0, 1]})
+        self.assertEqual(self.registry.labels(section="halign"), [self.center])
+        self.assertEqual(self.registry.labels(halign="left"), [])
+        self.assertEqual(self.registry.section_of(self.left), "color")
+
+    def test_unregister_drops_empty_index_entries(self):
+        """Test forgetting labels removes them from every index."""
+        self.registry.unregister(self.left)
+        self.registry.unregister(self.center)
+        self.registry.unregister(Label())
+        self.assertNotIn(self.left, self.registry)
+        self.assertEqual(self.registry.sections(), ["color"])
+        self.assertIsNone(self.registry.section_of(self.left))
+
+    def test_tree_registration(self):
+        """Test subtrees are registered and unregistered as a whole."""
+        registry = LabelRegistry(is_label)
+        section = BoxLayout()
+        nested = BoxLayout()
+        labels = [Label(), Label()]
+        section.add_widget(labels[0])
+        nested.add_widget(labels[1])
+        section.add_widget(nested)
+
+        registry.register_tree(section, "document")
+        self.assertCountEqual(registry.labels(section="document"), labels)
+
+        registry.unregister_tree(nested)
+        self.assertEqual(registry.labels(section="document"), [labels[0]])
+
+    def test_lookup_cost_follows_matches(self):
+        """Test a section lookup among many labels only visits that section."""
+        registry = LabelRegistry(is_label)
+        for number in range(2000):
+            registry.register(Label(), f"section {number % 100}", {"font_size": number % 7})
+        self.assertEqual(len(registry.labels(section="section 3")), 20)
+        self.assertEqual(len(registry.labels(section="section 3", font_size=3)), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
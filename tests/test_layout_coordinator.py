@@ -0,0 +1,113 @@
+"""Unit tests for coalesced layout invalidation."""
+import unittest
+from kivy.graphics import Rectangle
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.widget import Widget
+
+from layout_coordinator import LayoutCoordinator, widget_depth
+
+
+class TestLayoutCoordinator(unittest.TestCase):
+    """Test deferred height and rectangle updates."""
+
+    def setUp(self):
+        """Create a coordinator and a two-level layout."""
+        self.coordinator = LayoutCoordinator()
+        self.outer = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.inner = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.leaf = Widget(size_hint_y=None, height=50)
+        self.inner.add_widget(self.leaf)
+        self.outer.add_widget(self.inner)
+        self.coordinator.track_height(self.inner)
+        self.coordinator.track_height(self.outer)
+        self.coordinator.flush()
+
+    def test_heights_wait_for_flush(self):
+        """Test that minimum_height changes are applied only when flushed."""
+        self.inner.do_layout()
+        self.assertEqual(self.inner.minimum_height, 50)
+        self.assertNotEqual(self.inner.height, 50, "Height should not follow before the flush")
+
+        self.coordinator.flush()
+        self.assertEqual(self.inner.height, 50)
+
+    def test_repeated_changes_apply_once(self):
+        """Test that several minimum_height changes in a frame cost one update."""
+        before = self.coordinator.height_updates
+        for height in (60, 70, 80):
+            self.leaf.height = height
+            self.inner.do_layout()
+        self.coordinator.flush()
+
+        self.assertEqual(self.inner.height, 80)
+        self.assertEqual(self.coordinator.height_updates - before, 1)
+
+    def test_cascade_resolves_to_outer_height(self):
+        """Test that parents pick up their children's new heights."""
+        self.inner.do_layout()
+        self.coordinator.flush()
+        self.outer.do_layout()
+        self.coordinator.flush()
+        self.assertEqual(self.outer.height, 50)
+
+    def test_background_updates_coalesce_pos_and_size(self):
+        """Test that a move and a resize in one frame update the rectangle once."""
+        widget = Widget()
+        rect = Rectangle()
+        self.coordinator.track_background(widget, rect)
+        self.coordinator.flush()
+        before = self.coordinator.rect_updates
+
+        widget.pos = (10, 20)
+        widget.size = (300, 40)
+        self.coordinator.flush()
+
+        self.assertEqual(self.coordinator.rect_updates - before, 1)
+        self.assertEqual(tuple(rect.pos), (10, 20))
+        self.assertEqual(tuple(rect.size), (300, 40))
+
+    def test_rect_updates_are_reported(self):
+        """Test that every moved rectangle is reported to ``on_rect_update``."""
+        moved = []
+        coordinator = LayoutCoordinator(on_rect_update=moved.append)
+        widget = Widget()
+        coordinator.track_background(widget, Rectangle())
+        coordinator.flush()
+        widget.pos = (5, 5)
+        coordinator.flush()
+        self.assertEqual(moved, [widget, widget])
+
+    def test_forget_unbinds_and_drops_references(self):
+        """Test that forgotten widgets are no longer updated or referenced."""
+        widget = Widget()
+        rect = Rectangle()
+        self.coordinator.track_background(widget, rect)
+        self.coordinator.flush()
+        self.coordinator.forget_tree(self.outer)
+        self.coordinator.forget(widget)
+        self.coordinator.forget(Widget())
+
+        self.inner.do_layout()
+        widget.pos = (10, 20)
+        self.coordinator.flush()
+        self.assertNotEqual(self.inner.height, 50)
+        self.assertEqual(tuple(rect.pos), (0, 0))
+        self.assertEqual(self.coordinator._heights, {})
+        self.assertEqual(self.coordinator._backgrounds, {})
+
+    def test_forget_tree_keeps_selected_widgets(self):
+        """Test that widgets matched by keep stay tracked."""
+        self.coordinator.forget_tree(self.outer, keep=lambda widget: widget is self.inner)
+        self.inner.do_layout()
+        self.coordinator.flush()
+        self.assertEqual(self.inner.height, 50)
+        self.assertEqual(list(self.coordinator._heights), [self.inner])
+
+    def test_widget_depth(self):
+        """Test that depth counts ancestors."""
+        self.assertEqual(widget_depth(self.outer), 0)
+        self.assertEqual(widget_depth(self.leaf), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Unit tests for layout and event-cascade counters."""
+import unittest
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from layout_metrics import UNSECTIONED, LayoutMetrics, section_of
+
+
+class TestLayoutMetrics(unittest.TestCase):
+    """Test per-section, per-frame counting."""
+
+    def setUp(self):
+        """Install metrics and build a titled section with one label."""
+        self.metrics = LayoutMetrics()
+        self.metrics.install()
+        self.section = BoxLayout(orientation='vertical')
+        self.section.section_title = "font_size"
+        self.label = Label(text="counted")
+        self.section.add_widget(self.label)
+        self.metrics.watch_tree(self.section)
+
+    def tearDown(self):
+        """Restore the layout classes."""
+        self.metrics.uninstall()
+
+    def test_section_of(self):
+        """Test that widgets resolve to the nearest section title."""
+        self.assertEqual(section_of(self.label), "font_size")
+        self.assertEqual(section_of(Label()), UNSECTIONED)
+
+    def test_property_dispatches_grouped_by_section(self):
+        """Test that dispatches are counted under the section title."""
+        self.label.size = (300, 40)
+        self.label.text_size = (300, None)
+        self.metrics.end_frame()
+
+        totals = self.metrics.report()["sections"]["font_size"]["totals"]
+        self.assertEqual(totals["size"], 1)
+        self.assertEqual(totals["text_size"], 1)
+
+    def test_layout_passes_counted(self):
+        """Test that do_layout calls of layouts are counted."""
+        self.section.do_layout()
+        self.section.do_layout()
+        self.metrics.end_frame()
+
+        section = self.metrics.report()["sections"]["font_size"]
+        self.assertEqual(section["totals"]["layout_passes"], 2)
+
+    def test_busiest_frame_and_reset(self):
+        """Test that the busiest frame is kept and reports start a new period."""
+        for height in (10, 20, 30):
+            self.label.height = height
+        self.metrics.end_frame()
+        self.label.height = 40
+        self.metrics.end_frame()
+
+        section = self.metrics.report()["sections"]["font_size"]
+        self.assertEqual(section["totals"]["height"], 4)
+        self.assertEqual(section["max_per_frame"]["height"], 3)
+        self.assertEqual(section["frames_active"], 2)
+        self.assertEqual(self.metrics.report()["sections"], {})
+
+    def test_watch_is_idempotent(self):
+        """Test that watching a widget twice does not double its counts."""
+        self.metrics.watch(self.label)
+        self.label.height = 55
+        self.metrics.end_frame()
+        self.assertEqual(self.metrics.report()["sections"]["font_size"]["totals"]["height"], 1)
+
+    def test_uninstall_restores_layouts(self):
+        """Test that layout passes stop being counted after uninstall."""
+        self.metrics.uninstall()
+        layout = BoxLayout()
+        layout.section_title = "after"
+        layout.do_layout()
+        self.metrics.end_frame()
+        self.assertNotIn("after", self.metrics.report()["sections"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,182 @@
+"""Unit tests for block splitting and progressive rendering."""
+import time
+import unittest
+from pathlib import Path
+from kivy.uix.label import Label
+
+from markdown_blocks import (
+    BlockMarkdownView,
+    chunk_texts,
+    diff_blocks,
+    iter_chunks,
+    iter_lines,
+    reference_definitions,
+    split_blocks,
+)
+
+
+class TestSplitBlocks(unittest.TestCase):
+    """Test top-level block boundary detection."""
+
+    def test_blank_lines_separate_blocks(self):
+        """Test that paragraphs and headings become separate blocks."""
+        text = "# Title\n\nFirst paragraph\nstill first.\n\n\nSecond paragraph."
+        self.assertEqual(
+            split_blocks(text),
+            ["# Title", "First paragraph\nstill first.", "Second paragraph."],
+        )
+
+    def test_fenced_code_kept_whole(self):
+        """Test that blank lines inside fenced code do not split the block."""
+        text = "```python\ndef f():\n\n    return 1\n```\n\nAfter"
+        self.assertEqual(split_blocks(text), ["```python\ndef f():\n\n    return 1\n```", "After"])
+
+    def test_indented_continuation_kept_with_list(self):
+        """Test that indented lines after a blank line continue the list item."""
+        text = "- item\n\n  continued\n- next\n\nParagraph"
+        self.assertEqual(split_blocks(text), ["- item\n\n  continued\n- next", "Paragraph"])
+
+    def test_blocks_roundtrip_sample_content(self):
+        """Test that splitting sample_markdown.md loses no non-blank lines."""
+        sample = (Path(__file__).parents[1] / "sample_markdown.md").read_text(encoding="utf-8")
+        rejoined = "\n".join(split_blocks(sample))
+        original_lines = [line for line in sample.splitlines() if line.strip()]
+        self.assertEqual([line for line in rejoined.splitlines() if line.strip()], original_lines)
+
+    def test_chunks_group_small_blocks(self):
+        """Test that small blocks are grouped up to the chunk size."""
+        blocks = ["a" * 10] * 5
+        self.assertEqual(len(list(iter_chunks(blocks, chunk_chars=25))), 2)
+        self.assertEqual(len(list(iter_chunks(blocks, chunk_chars=0))), 5)
+
+    def test_reference_definitions(self):
+        """Test that link reference definitions are collected."""
+        text = "See [docs][d].\n\n[d]: https://example.com\n"
+        self.assertEqual(reference_definitions(text), ["[d]: https://example.com"])
+
+
+class TestBlockMarkdownView(unittest.TestCase):
+    """Test chunk rendering with a plain Label factory."""
+
+    def make_view(self, **kwargs):
+        """Create a view whose chunks render as plain labels."""
+        return BlockMarkdownView(lambda text: Label(text=text, size_hint_y=None), **kwargs)
+
+    def test_eager_render_creates_all_chunks(self):
+        """Test that non-progressive mode renders every chunk at once."""
+        view = self.make_view(chunk_chars=0)
+        view.set_text("one\n\ntwo\n\nthree")
+        self.assertEqual(view.blocks, ["one", "two", "three"])
+        self.assertEqual(len(view.children), 3)
+
+    def test_progressive_render_is_budgeted(self):
+        """Test that progressive mode renders a first slice and shows a loader."""
+        view = self.make_view(progressive=True, chunk_chars=0, frame_budget=0)
+        view.set_text("\n\n".join(f"block {i}" for i in range(20)))
+
+        self.assertTrue(view.loading, "View should still be loading after the first slice")
+        self.assertEqual(len(view.blocks), 1, "Zero budget should render exactly one chunk per frame")
+        self.assertEqual(view.children[0].text, "Loading…", "Loading label should stay at the bottom")
+
+        while view.loading:
+            view._render_slice()
+        self.assertEqual(len(view.blocks), 20)
+        self.assertNotIn("Loading…", [child.text for child in view.children])
+
+    def test_update_text_rerenders_only_changed_blocks(self):
+        """Test that a one-block edit replaces exactly one widget."""
+        view = self.make_view(chunk_chars=0)
+        view.set_text("one\n\ntwo\n\nthree")
+        first, second, third = view.block_widgets
+
+        created = view.update_text("one\n\ntwo, edited\n\nthree")
+
+        self.assertEqual(created, 1)
+        self.assertIs(view.block_widgets[0], first)
+        self.assertIsNot(view.block_widgets[1], second)
+        self.assertIs(view.block_widgets[2], third)
+        self.assertEqual([child.text for child in reversed(view.children)], ["one", "two, edited", "three"])
+
+    def test_update_text_handles_inserts_and_deletes(self):
+        """Test that inserted and deleted blocks end up in document order."""
+        view = self.make_view(chunk_chars=0)
+        view.set_text("a\n\nb\n\nc\n\nd")
+        view.update_text("new\n\na\n\nc\n\nd\n\ne")
+
+        self.assertEqual(view.blocks, ["new", "a", "c", "d", "e"])
+        self.assertEqual([child.text for child in reversed(view.children)], view.blocks)
+
+    def test_replaced_chunks_are_reported(self):
+        """Test that on_discard receives every removed chunk widget."""
+        discarded = []
+        view = self.make_view(chunk_chars=0, on_discard=discarded.append)
+        view.set_text("a\n\nb\n\nc")
+        second = view.block_widgets[1]
+        view.update_text("a\n\nx\n\nc")
+        self.assertEqual(discarded, [second])
+
+        old = list(view.block_widgets)
+        view.set_text("other")
+        self.assertEqual(discarded[1:], old)
+
+    def test_first_chunk_cost_does_not_grow_with_document(self):
+        """Test that the first progressive slice does not scan the whole document."""
+        view = self.make_view(progressive=True, chunk_chars=0, frame_budget=0)
+        text = "A paragraph of text.\n\n" * 1_000_000
+
+        started = time.perf_counter()
+        view.set_text(text)
+        elapsed = time.perf_counter() - started
+
+        self.assertEqual(len(view.blocks), 1)
+        self.assertLess(elapsed, 0.02)
+
+    def test_late_reference_definitions_rerender_users(self):
+        """Test that chunks using a later-defined reference get the definition."""
+        view = self.make_view(progressive=True, chunk_chars=0, frame_budget=0)
+        text = "See [the docs][Docs].\n\nPlain block.\n\n[docs]: https://example.com"
+        view.set_text(text)
+        first = view.block_widgets[0]
+        view._render_slice()
+        plain = view.block_widgets[1]
+        while view.loading:
+            view._render_slice()
+
+        self.assertIsNot(view.block_widgets[0], first, "The referencing chunk should be re-rendered")
+        self.assertIn("[docs]: https://example.com", view.block_widgets[0].text)
+        self.assertIs(view.block_widgets[1], plain, "Chunks without the label keep their widget")
+        self.assertEqual(
+            [child.text.split("\n")[0] for child in reversed(view.children)],
+            ["See [the docs][Docs].", "Plain block.", "[docs]: https://example.com"],
+        )
+        self.assertEqual(view.update_text(text), 0, "Collected definitions should match the whole document's")
+
+    def test_chunk_texts_match_rendered_texts(self):
+        """Test that chunk_texts lists exactly the texts the view renders."""
+        text = "See [the docs][Docs].\n\nPlain block.\n\n[docs]: https://example.com\n\nMore [docs]."
+        for progressive in (False, True):
+            with self.subTest(progressive=progressive):
+                rendered = []
+                view = BlockMarkdownView(
+                    lambda chunk: rendered.append(chunk) or Label(text=chunk),
+                    progressive=progressive, chunk_chars=0, frame_budget=0,
+                )
+                view.set_text(text)
+                while view.loading:
+                    view._render_slice()
+
+                self.assertEqual(list(chunk_texts(text, chunk_chars=0, progressive=progressive)), rendered)
+
+    def test_iter_lines_matches_splitlines(self):
+        """Test that lazy line splitting agrees with str.splitlines."""
+        for text in ("", "a", "a\n", "a\n\nb", "a\r\nb\r\n", "\n\nx\n"):
+            self.assertEqual(list(iter_lines(text)), text.splitlines(), repr(text))
+
+    def test_diff_blocks_reports_changed_range(self):
+        """Test that diff_blocks isolates the changed block."""
+        opcodes = diff_blocks(["a", "b", "c"], ["a", "x", "c"])
+        self.assertIn(('replace', 1, 2, 1, 2), opcodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
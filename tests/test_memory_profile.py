@@ -0,0 +1,99 @@
+"""Unit tests for per-section memory accounting."""
+import tracemalloc
+import unittest
+from kivy.core.window import Window  # noqa: F401  (textures need a GL context)
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from memory_profile import MemoryProfiler, texture_bytes, texture_report
+
+
+class TestMemoryProfiler(unittest.TestCase):
+    """Test allocation tracking around section construction."""
+
+    def setUp(self):
+        """Start tracing."""
+        self.profiler = MemoryProfiler(top=3)
+        self.profiler.start()
+
+    def tearDown(self):
+        """Stop tracing."""
+        self.profiler.stop()
+
+    def test_allocations_grouped_by_section(self):
+        """Test that allocations inside the hook are attributed to the section."""
+        kept = []
+        with self.profiler.section_hook("big"):
+            kept.append(bytearray(2_000_000))
+        with self.profiler.section_hook("small"):
+            kept.append(bytearray(1_000))
+
+        report = self.profiler.report()
+        self.assertEqual(list(report), ["big", "small"], "Largest section first")
+        self.assertGreaterEqual(report["big"]["net_bytes"], 2_000_000)
+        site, size = report["big"]["top_sites"][0]
+        self.assertIn("test_memory_profile.py", site)
+        self.assertGreaterEqual(size, 2_000_000)
+        self.assertIn("big", self.profiler.format_report())
+
+    def test_freed_memory_is_net_and_not_a_site(self):
+        """Test that memory freed in a section lowers its net size but not its sites."""
+        garbage = bytearray(2_000_000)
+        with self.profiler.section_hook("frees"):
+            del garbage
+            temporary = bytearray(500_000)
+            del temporary
+
+        entry = self.profiler.report()["frees"]
+        self.assertLess(entry["net_bytes"], -1_000_000)
+        self.assertTrue(all(size > 0 for _, size in entry["top_sites"]))
+        if entry["peak_bytes"] is not None:
+            self.assertGreaterEqual(entry["peak_bytes"], 0)
+
+    def test_nested_sections_keep_the_outer_peak(self):
+        """Test that a nested build does not hide the outer build's peak."""
+        with self.profiler.section_hook("outer"):
+            temporary = bytearray(3_000_000)
+            del temporary
+            with self.profiler.section_hook("inner"):
+                pass
+
+        peak = self.profiler.report()["outer"]["peak_bytes"]
+        if peak is None:
+            self.skipTest("tracemalloc.reset_peak needs Python 3.9")
+        self.assertGreaterEqual(peak, 3_000_000)
+
+    def test_stop_leaves_foreign_tracing_running(self):
+        """Test that stop() does not end tracing the profiler did not start."""
+        other = MemoryProfiler()
+        other.start()
+        other.stop()
+        self.assertTrue(tracemalloc.is_tracing())
+
+
+class TestTextureReport(unittest.TestCase):
+    """Test texture memory estimates."""
+
+    def test_textures_counted_per_section_and_label(self):
+        """Test that label textures are summed per section."""
+        root = BoxLayout()
+        section = BoxLayout()
+        section.section_title = "font_size"
+        labels = [Label(text="one"), Label(text="a longer label")]
+        for label in labels:
+            label.texture_update()
+            section.add_widget(label)
+        root.add_widget(section)
+
+        report = texture_report(root, lambda widget: isinstance(widget, Label))
+        expected = sum(texture_bytes(label.texture) for label in labels)
+        self.assertEqual(report["font_size"]["labels"], 2)
+        self.assertEqual(report["font_size"]["texture_bytes"], expected)
+        self.assertEqual(report["font_size"]["largest_label_bytes"], texture_bytes(labels[1].texture))
+
+        indexed = texture_report(root, lambda widget: False, labels_of=lambda title: labels[:1])
+        self.assertEqual(indexed["font_size"]["labels"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
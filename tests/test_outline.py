@@ -0,0 +1,152 @@
+"""Unit tests for the heading outline."""
+import time
+import unittest
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.widget import Widget
+
+from markdown_blocks import split_blocks
+from outline import OutlineEntry, OutlineIndex, OutlineSidebar, document_headings, plain_title
+from stress import generate_markdown
+
+DOCUMENT = """# Guide
+
+Intro paragraph.
+
+## Install *the* flower
+Run `pip install`.
+
+```
+# not a heading
+```
+
+Setext title
+------------
+
+### Closing ###"""
+
+
+class TestDocumentHeadings(unittest.TestCase):
+    """Test heading extraction from document blocks."""
+
+    def test_levels_and_titles(self):
+        """Test ATX and setext headings are found and code fences skipped."""
+        headings = document_headings(split_blocks(DOCUMENT))
+        self.assertEqual(
+            [(heading.level, heading.title) for heading in headings],
+            [(1, "Guide"), (2, "Install the flower"), (2, "Setext title"), (3, "Closing")],
+        )
+
+    def test_positions_point_at_heading_lines(self):
+        """Test blocks and character offsets locate each heading."""
+        blocks = split_blocks(DOCUMENT)
+        text = "".join(blocks)
+        for heading in document_headings(blocks):
+            block = blocks[heading.block]
+            line = block[round(heading.within * len(block)):].split("\n")[0]
+            self.assertIn(heading.title.split()[0], line)
+            self.assertTrue(text.startswith(line, heading.offset))
+
+    def test_heading_inside_a_block(self):
+        """Test a heading that follows a paragraph line is still found."""
+        headings = document_headings(["Paragraph\n## Follows"])
+        self.assertEqual(headings[0].title, "Follows")
+        self.assertGreater(headings[0].within, 0)
+
+    def test_plain_title_strips_markup(self):
+        """Test emphasis, code and link markup are removed."""
+        self.assertEqual(plain_title("**Bold** `code` [link](a.md)"), "Bold code link")
+
+    def test_thousands_of_headings_are_fast(self):
+        """Test extraction over a document with thousands of headings."""
+        sections = (f"{'#' * (i % 6 + 1)} Heading {i}\n\n{generate_markdown(200, seed=i)}" for i in range(5000))
+        blocks = split_blocks("\n\n".join(sections))
+        started = time.perf_counter()
+        headings = document_headings(blocks)
+        elapsed = time.perf_counter() - started
+        self.assertGreaterEqual(len(headings), 5000)
+        self.assertLess(elapsed, 1.0)
+
+
+class TestOutlineIndex(unittest.TestCase):
+    """Test offset computation and scroll positions."""
+
+    def setUp(self):
+        """Lay out two widgets of 400 and 600 pixels in a column."""
+        self.layout = BoxLayout(orientation='vertical', size_hint_y=None, height=1000, width=400)
+        self.first = Widget(size_hint_y=None, height=400)
+        self.second = Widget(size_hint_y=None, height=600)
+        self.layout.add_widget(self.first)
+        self.layout.add_widget(self.second)
+        self.layout.do_layout()
+        self.widgets = {"first": self.first, "second": self.second}
+
+    def locate(self, entry):
+        """Resolve entries whose key is (widget name, fraction)."""
+        return self.widgets[entry.key[0]], entry.key[1]
+
+    def test_offsets_measure_from_content_top(self):
+        """Test each entry's offset is its widget's top plus the fraction."""
+        index = OutlineIndex(self.layout, self.locate)
+        index.set_entries([
+            OutlineEntry("a", 1, "section", ("first", 0.0)),
+            OutlineEntry("b", 2, "heading", ("second", 0.5)),
+        ])
+        self.assertEqual(list(index.offsets), [0.0, 700.0])
+
+    def test_scroll_y_for_entry(self):
+        """Test jumping puts the entry at the top of the view."""
+        index = OutlineIndex(self.layout, self.locate)
+        index.set_entries([OutlineEntry("b", 1, "section", ("second", 0.0))])
+        scroll_y = index.scroll_y_for(0, view_height=200)
+        scrollable = 1000 - 200
+        self.assertAlmostEqual(scroll_y, 1 - (400 - 10) / scrollable)
+
+    def test_scroll_y_without_scrollable_content(self):
+        """Test content shorter than the view stays at the top."""
+        index = OutlineIndex(self.layout, self.locate)
+        index.set_entries([OutlineEntry("a", 1, "section", ("first", 0.0))])
+        self.assertEqual(index.scroll_y_for(0, view_height=2000), 1.0)
+
+    def test_layout_change_recomputes_offsets(self):
+        """Test offsets follow height changes after the layout settles."""
+        index = OutlineIndex(self.layout, self.locate)
+        index.set_entries([OutlineEntry("b", 1, "section", ("second", 0.0))])
+        self.first.height = 500
+        self.layout.height = 1100
+        self.layout.do_layout()
+        index.refresh()
+        self.assertEqual(list(index.offsets), [500.0])
+        self.assertEqual(index.refreshes, 2)
+
+    def test_widget_positions_are_measured_once(self):
+        """Test entries sharing a widget do not convert coordinates again."""
+        index = OutlineIndex(self.layout, self.locate)
+        entries = [OutlineEntry(str(i), 2, "heading", ("second", i / 5000)) for i in range(5000)]
+        started = time.perf_counter()
+        index.set_entries(entries)
+        elapsed = time.perf_counter() - started
+        self.assertEqual(len(index.offsets), 5000)
+        self.assertAlmostEqual(index.offsets[-1], 400 + 600 * 4999 / 5000)
+        self.assertLess(elapsed, 0.5)
+
+
+class TestOutlineSidebar(unittest.TestCase):
+    """Test the sidebar's rows."""
+
+    def test_entries_are_indented_and_selectable(self):
+        """Test row data reflects levels and selection reports the index."""
+        selected = []
+        sidebar = OutlineSidebar(selected.append)
+        sidebar.show_entries([
+            OutlineEntry("Section", 1, "section", "Section"),
+            OutlineEntry("Heading", 3, "heading", None),
+        ])
+        self.assertEqual(sidebar.data[1]["text"], "        Heading")
+        self.assertTrue(sidebar.data[0]["bold"])
+        sidebar.select(1)
+        self.assertEqual(selected, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
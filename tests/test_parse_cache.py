@@ -0,0 +1,164 @@
+"""Unit tests for the shared parse cache."""
+import marshal
+import os
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+import mistune
+
+import parse_cache
+from parse_cache import DiskCache, ParseCache, PARSE_CACHE
+
+
+def make_parser(plugins=parse_cache.MARKDOWNLABEL_PLUGINS):
+    """Create an AST parser configured like MarkdownLabel's."""
+    return mistune.create_markdown(renderer='ast', plugins=list(plugins))
+
+
+class TestParseCache(unittest.TestCase):
+    """Test the LRU cache and the mistune parse hook."""
+
+    def setUp(self):
+        """Install the hook with an empty cache."""
+        parse_cache.install()
+        PARSE_CACHE.clear()
+
+    def tearDown(self):
+        """Restore mistune's parse method."""
+        parse_cache.uninstall()
+
+    def test_identical_text_parsed_once(self):
+        """Test that parsers with the same options share one entry."""
+        text = "## Heading\n\nSome `code` here."
+        first = make_parser()(text)
+        second = make_parser()(text)
+
+        self.assertEqual(first, second, "Cached tokens should match a fresh parse")
+        self.assertEqual(PARSE_CACHE.stats()["misses"], 1)
+        self.assertEqual(PARSE_CACHE.stats()["hits"], 1)
+
+    def test_different_options_do_not_share_entries(self):
+        """Test that the parser signature is part of the key."""
+        text = "~~struck~~"
+        with_plugin = make_parser()(text)
+        without_plugin = make_parser(plugins=())(text)
+
+        self.assertNotEqual(with_plugin, without_plugin)
+        self.assertEqual(len(PARSE_CACHE), 2)
+
+    def test_cached_tokens_are_isolated_from_mutation(self):
+        """Test that mutating returned tokens does not alter later results."""
+        text = "Paragraph text"
+        tokens = make_parser()(text)
+        tokens[0]["children"].clear()
+
+        self.assertTrue(make_parser()(text)[0]["children"], "Cache should hold its own copy")
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted."""
+        cache = ParseCache(maxsize=2)
+        cache.put("a", [], None)
+        cache.put("b", [], None)
+        cache.get("a")
+        cache.put("c", [], None)
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"), "Oldest unused entry should be evicted")
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_uninstall_restores_parse(self):
+        """Test that uninstall() removes the hook."""
+        parse_cache.uninstall()
+        self.assertFalse(parse_cache.is_installed())
+        make_parser()("text")
+        self.assertEqual(len(PARSE_CACHE), 0)
+
+
+class TestDiskCache(unittest.TestCase):
+    """Test the persistent cache layer."""
+
+    def setUp(self):
+        """Install the hook with an empty disk cache directory."""
+        self.directory = tempfile.TemporaryDirectory()
+        parse_cache.install(disk_cache_dir=self.directory.name)
+        PARSE_CACHE.clear()
+
+    def tearDown(self):
+        """Restore mistune's parse method and remove the directory."""
+        parse_cache.uninstall()
+        self.directory.cleanup()
+
+    def test_warm_start_skips_parsing(self):
+        """Test that a fresh process-level cache is filled from disk."""
+        text = "# Title\n\nText with a [link][ref].\n\n[ref]: https://example.com"
+        first = make_parser()(text)
+        PARSE_CACHE.clear()
+
+        original = parse_cache._original_parse
+        parse_cache._original_parse = None  # parsing would fail now
+        try:
+            second = make_parser()(text)
+        finally:
+            parse_cache._original_parse = original
+        self.assertEqual(first, second)
+        self.assertEqual(parse_cache.DISK_CACHE.stats()["hits"], 1)
+
+    def test_versions_are_part_of_the_key(self):
+        """Test that another parser version does not read old entries."""
+        cache = DiskCache(self.directory.name)
+        cache.put("key", [{"type": "paragraph"}])
+        other = DiskCache(self.directory.name)
+        other.versions = ("0.0", None)
+        self.assertIsNone(other.get("key"))
+        self.assertEqual(cache.get("key"), ([{"type": "paragraph"}], None))
+
+    def test_corrupt_entry_is_a_miss(self):
+        """Test that unreadable files are dropped instead of raising."""
+        cache = DiskCache(self.directory.name)
+        cache.path_for("key").write_bytes(b"not zlib")
+        self.assertIsNone(cache.get("key"))
+        self.assertFalse(cache.path_for("key").exists())
+
+    def test_eviction_keeps_recent_entries(self):
+        """Test that the least recently used files go first."""
+        cache = DiskCache(self.directory.name, max_bytes=10 ** 9)
+        for key in ("old", "new"):
+            cache.put(key, ["x" * 2000])
+        past = time.time() - 100
+        os.utime(cache.path_for("old"), (past, past))
+        cache.max_bytes = cache.path_for("new").stat().st_size
+        cache.evict()
+
+        self.assertFalse(cache.path_for("old").exists())
+        self.assertTrue(cache.path_for("new").exists())
+        self.assertFalse(list(Path(self.directory.name).glob("*.tmp")), "No temporary files left behind")
+
+    def test_writes_below_the_bound_do_not_scan(self):
+        """Test that the directory is only rescanned once the size bound is passed."""
+        cache = DiskCache(self.directory.name, max_bytes=10 ** 9)
+        cache.put("first", ["x" * 2000])
+        scans = []
+        original_scan = cache._scan
+        cache._scan = lambda: scans.append(1) or original_scan()
+
+        for number in range(20):
+            cache.put(f"key {number}", ["x" * 2000])
+        self.assertEqual(scans, [])
+
+        cache.max_bytes = cache._total_bytes
+        cache.put("over", ["y" * 2000])
+        self.assertEqual(scans, [1])
+        self.assertLessEqual(cache._total_bytes, cache.max_bytes)
+
+    def test_python_version_is_part_of_the_key(self):
+        """Test that marshal data from another Python version is not read."""
+        cache = DiskCache(self.directory.name)
+        self.assertIn(marshal.version, cache.versions)
+        self.assertIn(tuple(sys.version_info[:2]), cache.versions)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Unit tests for the performance overlay."""
+import unittest
+from kivy.graphics import Color, InstructionGroup
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from perf_hud import FrameTimeRing, PerfHUD, count_instructions
+
+
+class TestFrameTimeRing(unittest.TestCase):
+    """Test the fixed-size frame-time history."""
+
+    def test_wraps_and_keeps_order(self):
+        """Test that old entries are overwritten and values stay oldest first."""
+        ring = FrameTimeRing(capacity=3)
+        for value in (1.0, 2.0, 3.0, 4.0):
+            ring.append(value)
+        self.assertEqual(list(ring.values()), [2.0, 3.0, 4.0])
+        self.assertEqual(ring.count, 3)
+
+    def test_percentiles(self):
+        """Test nearest-rank percentiles."""
+        ring = FrameTimeRing(capacity=101)
+        for value in range(1, 102):
+            ring.append(value / 1000)
+        p50, p99 = ring.percentiles(50, 99)
+        self.assertAlmostEqual(p50, 0.051)
+        self.assertAlmostEqual(p99, 0.100)
+        self.assertEqual(FrameTimeRing().percentiles(50), [0.0])
+
+    def test_dropped_frames(self):
+        """Test that long frames count the refreshes they missed."""
+        ring = FrameTimeRing()
+        for value in (1 / 60, 1 / 60, 3 / 60, 2 / 60):
+            ring.append(value)
+        self.assertEqual(ring.dropped_frames(), 3)
+
+
+class TestPerfHUD(unittest.TestCase):
+    """Test draw-call counting and the overlay text."""
+
+    def test_count_instructions_recurses_into_groups(self):
+        """Test that nested instruction groups are counted."""
+        group = InstructionGroup()
+        inner = InstructionGroup()
+        inner.add(Color(1, 1, 1, 1))
+        inner.add(Color(0, 0, 0, 1))
+        group.add(inner)
+        self.assertEqual(count_instructions(group), 3)
+
+    def test_refresh_shows_statistics(self):
+        """Test that the overlay text reports frames and label counts."""
+        root = BoxLayout()
+        root.add_widget(Label(text="one"))
+        hud = PerfHUD(root, lambda widget: isinstance(widget, Label))
+        hud.record_frame(0.016)
+        hud.record_frame(0.050)
+        hud.refresh()
+
+        self.assertIn("dropped frames: 2 / 2", hud.text)
+        self.assertEqual(hud.visible_labels, 1)
+        self.assertFalse(hud.active)
+
+    def test_visible_labels_from_index(self):
+        """Test that a label index replaces the tree walk."""
+        hud = PerfHUD(BoxLayout(), lambda widget: False, find_visible_labels=lambda: [Label(), Label()])
+        hud.refresh()
+        self.assertEqual(hud.visible_labels, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
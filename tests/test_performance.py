@@ -0,0 +1,185 @@
+"""Performance regression tests against baselines stored in the repository.
+
+Each test measures the median time of several runs and the traced peak
+memory, and fails when either exceeds tests/perf_baselines.json by more than
+the configured tolerance. Measurements without a baseline fail (or are
+skipped with PERF_ALLOW_MISSING=1), and times are only compared on the
+machine the baselines were recorded on (a warning is shown elsewhere).
+Record (or refresh) the baselines on the machine that runs the suite with:
+
+    PERF_RECORD=1 python -m pytest tests/test_performance.py
+
+The build and section baselines need kivy_garden.markdownlabel, so record
+them where it is installed.
+
+See perf_baseline.py for the PERF_* variables (repetitions, tolerances,
+baseline file).
+"""
+import importlib.util
+import os
+import tempfile
+import unittest
+import warnings
+from pathlib import Path
+from unittest import mock
+
+import parse_cache
+from perf_baseline import (
+    DEFAULT_MEMORY_TOLERANCE,
+    DEFAULT_REPEAT,
+    DEFAULT_TIME_TOLERANCE,
+    BaselineStore,
+    compare,
+    env_flag,
+    env_number,
+    measure,
+)
+from stress import generate_markdown, parse_size
+
+DOCUMENT_SIZES = ("10KB", "100KB", "500KB")
+
+HAS_MARKDOWNLABEL = importlib.util.find_spec("kivy_garden") is not None and \
+    importlib.util.find_spec("kivy_garden.markdownlabel") is not None
+
+
+class PerformanceTestCase(unittest.TestCase):
+    """Base class comparing measurements with the stored baselines."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Load the baselines and the PERF_* settings."""
+        cls.store = BaselineStore.from_environment()
+        cls.record = env_flag("PERF_RECORD")
+        cls.allow_missing = env_flag("PERF_ALLOW_MISSING")
+        cls.repeat = env_number("PERF_REPEAT", DEFAULT_REPEAT, int)
+        cls.time_tolerance = env_number("PERF_TIME_TOLERANCE", DEFAULT_TIME_TOLERANCE)
+        cls.memory_tolerance = env_number("PERF_MEMORY_TOLERANCE", DEFAULT_MEMORY_TOLERANCE)
+
+    def check_performance(self, name, function, setup=None):
+        """Measure ``function`` and compare it with (or record) baseline ``name``."""
+        baseline = self.store.get(name)
+        if baseline is None and not self.record:
+            message = f"no baseline for {name!r} in {self.store.path} (record with PERF_RECORD=1)"
+            if self.allow_missing:
+                self.skipTest(message)
+            self.fail(message)
+        measurement = measure(function, repeat=self.repeat, setup=setup)
+        if self.record:
+            self.store.record(name, measurement)
+            return
+        check_time = self.store.same_machine()
+        if not check_time:
+            warnings.warn(f"{name}: baselines were recorded on another machine; only memory is compared")
+        problems = compare(measurement, baseline, self.time_tolerance, self.memory_tolerance, check_time)
+        if problems:
+            self.fail(f"{name}: " + "; ".join(problems))
+
+
+class TestBaselineComparison(unittest.TestCase):
+    """Test the tolerance checks and the baseline file."""
+
+    def test_within_tolerance_passes(self):
+        """Test a measurement inside both tolerances has no problems."""
+        baseline = {"seconds": 0.1, "peak_bytes": 1000}
+        self.assertEqual(compare({"seconds": 0.14, "peak_bytes": 1200}, baseline, 0.5, 0.25), [])
+
+    def test_regressions_are_reported(self):
+        """Test slower runs and larger peaks are both reported."""
+        baseline = {"seconds": 0.1, "peak_bytes": 1000}
+        problems = compare({"seconds": 0.2, "peak_bytes": 2000}, baseline, 0.5, 0.25)
+        self.assertEqual(len(problems), 2)
+        self.assertIn("median", problems[0])
+        self.assertIn("peak memory", problems[1])
+
+    def test_tiny_baselines_allow_jitter(self):
+        """Test sub-millisecond baselines are not failed by scheduling noise."""
+        self.assertEqual(compare({"seconds": 0.0015, "peak_bytes": 0}, {"seconds": 0.0005}), [])
+
+    def test_time_check_can_be_disabled(self):
+        """Test baselines from another machine only fail on memory."""
+        baseline = {"seconds": 0.001, "peak_bytes": 1000}
+        self.assertEqual(compare({"seconds": 1.0, "peak_bytes": 1000}, baseline, check_time=False), [])
+        self.assertEqual(len(compare({"seconds": 1.0, "peak_bytes": 5000}, baseline, check_time=False)), 1)
+
+    def test_store_knows_its_machine(self):
+        """Test recorded baselines remember the machine they came from."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = BaselineStore(Path(directory) / "baselines.json")
+            self.assertFalse(store.same_machine())
+            store.record("parse", {"seconds": 0.5, "peak_bytes": 10, "repeat": 5})
+            self.assertTrue(store.same_machine())
+            self.assertIn("cpu", store.machine)
+
+    def test_machine_id_is_part_of_the_fingerprint(self):
+        """Test PERF_MACHINE distinguishes machines with the same hardware."""
+        with tempfile.TemporaryDirectory() as directory:
+            store = BaselineStore(Path(directory) / "baselines.json")
+            with mock.patch.dict(os.environ, {"PERF_MACHINE": "runner-a"}):
+                store.record("parse", {"seconds": 0.5, "peak_bytes": 10, "repeat": 5})
+                self.assertTrue(store.same_machine())
+            with mock.patch.dict(os.environ, {"PERF_MACHINE": "runner-b"}):
+                self.assertFalse(store.same_machine())
+
+    def test_measure_reports_median_and_peak(self):
+        """Test measure runs the function repeatedly and traces its allocations."""
+        calls = []
+        result = measure(lambda: calls.append(bytearray(100_000)), repeat=3)
+        self.assertEqual(len(calls), 5, "warm-up, three timed runs and one traced run")
+        self.assertEqual(result["repeat"], 3)
+        self.assertGreaterEqual(result["peak_bytes"], 100_000)
+
+    def test_store_round_trip(self):
+        """Test recorded baselines are saved and loaded again."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "baselines.json"
+            store = BaselineStore(path)
+            store.record("parse", {"seconds": 0.5, "peak_bytes": 10, "repeat": 5})
+            loaded = BaselineStore(path)
+            self.assertEqual(loaded.get("parse")["seconds"], 0.5)
+            self.assertIsNotNone(loaded.machine)
+            self.assertIsNone(loaded.get("missing"))
+
+
+class TestParsePerformance(PerformanceTestCase):
+    """Parsing generated documents of several sizes (no parse cache)."""
+
+    def setUp(self):
+        """Measure mistune itself rather than cache lookups."""
+        if parse_cache.is_installed():
+            parse_cache.uninstall()
+
+    def test_parse_documents(self):
+        """Test parse time and memory per document size."""
+        for size in DOCUMENT_SIZES:
+            with self.subTest(size=size):
+                text = generate_markdown(parse_size(size), seed=1)
+                parser = parse_cache.create_parser()
+                self.check_performance(f"parse {size}", lambda: parser(text))
+
+
+@unittest.skipUnless(HAS_MARKDOWNLABEL, "kivy_garden.markdownlabel is not installed")
+class TestAppPerformance(PerformanceTestCase):
+    """Building the demo app and each of its sections."""
+
+    def test_build(self):
+        """Test the time and memory of MarkdownDemoApp.build()."""
+        from main import MarkdownDemoApp
+
+        self.check_performance("build", lambda: MarkdownDemoApp().build())
+
+    def test_sections(self):
+        """Test the construction of every property section."""
+        from main import MarkdownDemoApp
+
+        app = MarkdownDemoApp()
+        app.build()
+        for title, variations, show_background in app.section_specs():
+            with self.subTest(section=title):
+                self.check_performance(
+                    f"section {title}",
+                    lambda: app.create_section(title, variations, show_background=show_background),
+                )
+
+
+if __name__ == '__main__':
+    unittest.main()
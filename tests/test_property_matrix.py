@@ -0,0 +1,53 @@
+"""Unit tests for property matrix generation."""
+import unittest
+from kivy.uix.label import Label
+
+from property_matrix import PropertyMatrix, axes_from_specs
+
+SPECS = [
+    ("font_size", [("font_size=14", {"font_size": 14}), ("font_size=20", {"font_size": 20})], False),
+    ("color", [
+        ("color=[1,1,1,1] (white)", {"color": [1, 1, 1, 1]}),
+        ("color=[1,1,0,1] (yellow)", {"color": [1, 1, 0, 1]}),
+        ("color (default)", {}),
+    ], False),
+    ("padding", [("padding=[0,0,0,0]", {"padding": [0, 0, 0, 0]})], True),
+]
+
+
+class TestPropertyMatrix(unittest.TestCase):
+    """Test combination, deduplication and paging."""
+
+    def test_cartesian_product_merges_properties(self):
+        """Test that each combination merges one variation per axis."""
+        matrix = PropertyMatrix(axes_from_specs(SPECS, ["font_size", "color"]))
+        combinations = list(matrix)
+        self.assertEqual(matrix.total_combinations, 6)
+        self.assertEqual(len(combinations), 6)
+        self.assertEqual(combinations[1], ("font_size=14, color=[1,1,0,1] (yellow)", {"font_size": 14, "color": [1, 1, 0, 1]}))
+
+    def test_identical_effective_styles_deduplicated(self):
+        """Test that default-valued variations collapse into one combination."""
+        matrix = PropertyMatrix(axes_from_specs(SPECS, ["font_size", "color"]), Label)
+        combinations = list(matrix)
+        self.assertEqual(len(combinations), 4, "White is Label's default color")
+        self.assertEqual(matrix.duplicates, 2)
+
+    def test_pages_are_lazy_and_bounded(self):
+        """Test that pages hold at most page_size combinations."""
+        matrix = PropertyMatrix(axes_from_specs(SPECS, ["font_size", "color"]))
+        pages = matrix.pages(4)
+        self.assertEqual(len(next(pages)), 4)
+        self.assertEqual(len(next(pages)), 2)
+        self.assertIsNone(next(pages, None))
+
+    def test_background_and_unknown_axes(self):
+        """Test the background flag and unknown axis names."""
+        self.assertTrue(PropertyMatrix(axes_from_specs(SPECS, ["font_size", "padding"])).show_background)
+        self.assertFalse(PropertyMatrix(axes_from_specs(SPECS, ["font_size"])).show_background)
+        with self.assertRaises(ValueError):
+            axes_from_specs(SPECS, ["font_size", "weight"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Unit tests for render deduplication."""
+import unittest
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from render_dedup import RenderShareRegistry, SharedRenderView, effective_style, render_key
+
+
+class TestRenderKeys(unittest.TestCase):
+    """Test effective-style normalization."""
+
+    def test_default_values_are_dropped(self):
+        """Test that properties equal to class defaults do not affect the style."""
+        self.assertEqual(effective_style({"color": [1, 1, 1, 1], "text_size": [None, None]}, Label), ())
+        self.assertEqual(effective_style({"color": [1, 1, 0, 1]}, Label), (("color", (1, 1, 0, 1)),))
+
+    def test_identical_renderings_share_a_key(self):
+        """Test that default-valued variations map to the plain rendering's key."""
+        plain = render_key("text", {}, False, Label)
+        self.assertEqual(render_key("text", {"color": [1, 1, 1, 1]}, False, Label), plain)
+        self.assertNotEqual(render_key("text", {"font_size": 28}, False, Label), plain)
+        self.assertNotEqual(render_key("text", {}, True, Label), plain, "Backgrounds render differently")
+        self.assertNotEqual(render_key("other", {}, False, Label), plain)
+
+
+class TestRenderShareRegistry(unittest.TestCase):
+    """Test that repeated renderings reuse the first label."""
+
+    def make_label(self):
+        """Build a real label and count how many were built."""
+        self.built += 1
+        return Label(text="shared", size_hint_y=None, height=40)
+
+    def setUp(self):
+        """Create an empty registry."""
+        self.built = 0
+        self.registry = RenderShareRegistry()
+
+    def test_second_acquire_returns_shared_view(self):
+        """Test that only one real label is built per key."""
+        first = self.registry.acquire("key", self.make_label)
+        second = self.registry.acquire("key", self.make_label)
+
+        self.assertIsInstance(first, Label)
+        self.assertIsInstance(second, SharedRenderView)
+        self.assertEqual(self.built, 1)
+        self.assertEqual(self.registry.stats(), {"renderings": 1, "shared_views": 1})
+
+    def test_shared_view_follows_primary_height(self):
+        """Test that the shared view keeps the rendered label's height."""
+        primary = self.registry.acquire("key", self.make_label)
+        view = self.registry.acquire("key", self.make_label)
+        primary.height = 75
+        self.assertEqual(view.height, 75)
+
+    def test_refresh_snapshots_primary(self):
+        """Test that a refresh hands the primary's snapshot to every view."""
+        primary = self.registry.acquire("key", self.make_label)
+        view = self.registry.acquire("key", self.make_label)
+        primary.size = view.size = (200, 40)
+
+        share = self.registry.shares["key"]
+        share.refresh()
+        self.assertIsNotNone(share.texture)
+        self.assertEqual(tuple(share.texture.size), (200, 40))
+        self.assertIs(view._rect.texture, share.texture)
+
+    def test_style_change_refreshes_snapshot(self):
+        """Test that a color change without a resize re-snapshots the primary."""
+        primary = self.registry.acquire("key", self.make_label)
+        view = self.registry.acquire("key", self.make_label)
+        primary.size = view.size = (200, 40)
+        Clock.tick()
+        before = view._rect.texture
+        self.assertIsNotNone(before)
+
+        primary.color = [1, 0, 0, 1]
+        Clock.tick()
+        self.assertIsNot(view._rect.texture, before)
+        self.assertIs(view._rect.texture, self.registry.shares["key"].texture)
+
+    def test_released_primary_is_handed_to_a_live_view(self):
+        """Test that a live view takes over when the primary's section is released."""
+        released_section, live_section = BoxLayout(), BoxLayout()
+        primary = self.registry.acquire("key", self.make_label)
+        released_view = self.registry.acquire("key", self.make_label)
+        live_view = self.registry.acquire("key", self.make_label)
+        released_section.add_widget(primary)
+        released_section.add_widget(released_view)
+        live_section.add_widget(live_view)
+
+        self.registry.release_tree(released_section)
+
+        share = self.registry.shares["key"]
+        self.assertIs(share.primary, live_view.fallback, "The live view should render a label of its own")
+        self.assertEqual(share.views, [])
+        self.assertEqual(self.built, 2)
+
+        # A rematerialized section shares the new primary's rendering
+        view = self.registry.acquire("key", self.make_label)
+        self.assertIsInstance(view, SharedRenderView)
+        live_view.fallback.height = 90
+        self.assertEqual(view.height, 90)
+
+    def test_fully_released_share_is_rebuilt(self):
+        """Test that a share without live widgets is forgotten and built again."""
+        section = BoxLayout()
+        section.add_widget(self.registry.acquire("key", self.make_label))
+        section.add_widget(self.registry.acquire("key", self.make_label))
+
+        self.registry.release_tree(section)
+        self.assertEqual(self.registry.stats(), {"renderings": 0, "shared_views": 0})
+
+        self.assertIsInstance(self.registry.acquire("key", self.make_label), Label)
+        self.assertEqual(self.built, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+"""Unit tests for the incremental search index."""
+import time
+import unittest
+
+from markdown_blocks import split_blocks
+from search_index import FindBar, Match, SearchIndex, tokenize
+from stress import generate_markdown
+
+DOCUMENT = """# Installation
+
+Install the flower with pip.
+
+## Usage
+
+Create a MarkdownLabel and set its text.
+
+Reinstall when the flower changes."""
+
+
+class TestSearchIndex(unittest.TestCase):
+    """Test indexing, querying and incremental updates."""
+
+    def setUp(self):
+        """Index a small document."""
+        self.index = SearchIndex()
+        self.index.update_blocks("doc", split_blocks(DOCUMENT))
+
+    def test_tokenize_lowercases_words(self):
+        """Test that punctuation separates words and case is ignored."""
+        self.assertEqual(tokenize("Create a MarkdownLabel, then: pip!"), ["create", "a", "markdownlabel", "then", "pip"])
+
+    def test_phrase_matches_map_to_blocks_and_offsets(self):
+        """Test that a phrase match reports its block position and offset."""
+        matches = self.index.search("the flower")
+        self.assertEqual(matches, [Match("doc", 1, 8, 10), Match("doc", 4, 15, 10)])
+
+    def test_last_word_matches_as_prefix(self):
+        """Test that results update while the last word is being typed."""
+        self.assertEqual([match.block for match in self.index.search("install")], [0, 1])
+        self.assertEqual([match.block for match in self.index.search("markdownl")], [3])
+
+    def test_matches_start_at_word_boundaries(self):
+        """Test that a word inside another word is not matched."""
+        self.assertEqual(self.index.search("stall"), [])
+
+    def test_results_follow_source_and_block_order(self):
+        """Test that matches are ordered by source, then position."""
+        self.index.update_blocks("section", ["font_size", "the flower at 20"])
+        sources = [(match.source, match.block) for match in self.index.search("flower")]
+        self.assertEqual(sources, [("doc", 1), ("doc", 4), ("section", 1)])
+
+    def test_update_only_reindexes_changed_blocks(self):
+        """Test that unchanged blocks keep their postings."""
+        blocks = split_blocks(DOCUMENT)
+        blocks[3] = "Create a Label instead."
+        blocks.insert(0, "Preface")
+        before = self.index.tokenized_blocks
+
+        indexed = self.index.update_blocks("doc", blocks)
+
+        self.assertEqual(indexed, 2)
+        self.assertEqual(self.index.tokenized_blocks - before, 2)
+        self.assertEqual(self.index.search("markdownlabel"), [])
+        self.assertEqual([match.block for match in self.index.search("usage")], [3], "Positions should shift")
+        self.assertEqual(len(self.index), len(blocks))
+
+    def test_remove_source(self):
+        """Test that removing a source drops its blocks and words."""
+        self.index.remove_source("doc")
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.search("flower"), [])
+
+    def test_block_span_reports_character_position(self):
+        """Test that block spans add up to the indexed text length."""
+        blocks = split_blocks(DOCUMENT)
+        start, length, total = self.index.block_span("doc", 2)
+        self.assertEqual(start, len(blocks[0]) + len(blocks[1]))
+        self.assertEqual(length, len(blocks[2]))
+        self.assertEqual(total, sum(len(block) for block in blocks))
+
+    def test_limit(self):
+        """Test that at most ``limit`` matches are returned."""
+        self.assertEqual(len(self.index.search("the", limit=1)), 1)
+
+    def test_search_in_large_document_is_fast(self):
+        """Test that a query over a multi-megabyte document stays within a frame budget."""
+        blocks = split_blocks(generate_markdown(2_000_000))
+        index = SearchIndex()
+        index.update_blocks("large", blocks)
+        heading = [block for block in blocks if block.startswith("#")][-1]
+        query = heading.lstrip("# ").split(":")[0]
+
+        started = time.perf_counter()
+        matches = index.search(query)
+        elapsed = time.perf_counter() - started
+
+        self.assertTrue(matches)
+        self.assertLess(elapsed, 0.05)
+
+
+class TestFindBar(unittest.TestCase):
+    """Test the find bar's selection of matches."""
+
+    def test_typing_selects_first_match_and_steps_wrap(self):
+        """Test that typing jumps to the first match and next/previous cycle."""
+        index = SearchIndex()
+        index.update_blocks("doc", split_blocks(DOCUMENT))
+        selected = []
+        bar = FindBar(index.search, selected.append)
+
+        bar.field.text = "flower"
+        bar.step(1)
+        bar.step(1)
+        bar.step(-1)
+
+        self.assertEqual([match.block for match in selected], [1, 4, 1, 4])
+        self.assertEqual(bar.status.text, "2 / 2")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for snapshot export job planning."""
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from kivy.clock import Clock
+from kivy.uix.widget import Widget
+
+from main import MarkdownDemoApp
+import snapshot_export
+from snapshot_export import build_jobs, render_job, settle, slugify
+
+
+class TestBuildJobs(unittest.TestCase):
+    """Test which snapshots are planned and how they are named."""
+
+    def setUp(self):
+        """Create an app that is never run."""
+        self.app = MarkdownDemoApp()
+
+    def test_one_job_per_variation_plus_full_sample(self):
+        """Test that every variation and the full sample get a job."""
+        jobs = build_jobs(self.app)
+        variations = sum(len(spec[1]) for spec in self.app.section_specs())
+        self.assertEqual(len(jobs), variations + 1)
+        self.assertEqual(jobs[-1]["kind"], "full_sample")
+        self.assertEqual(len({job["file"] for job in jobs}), len(jobs), "File names must be unique")
+
+    def test_background_flag_follows_section(self):
+        """Test that padding variations are exported with their background."""
+        jobs = build_jobs(self.app, include_full_sample=False)
+        padding = [job for job in jobs if job["section"] == "padding"]
+        self.assertTrue(padding)
+        self.assertTrue(all(job["show_background"] for job in padding))
+
+    def test_matrix_jobs(self):
+        """Test that matrix mode exports every combination."""
+        jobs = build_jobs(self.app, matrix_axes=["font_size", "halign"], include_full_sample=False)
+        self.assertEqual(len(jobs), 3 * 5)
+        self.assertEqual(jobs[0]["section"], "font_size x halign")
+        self.assertEqual(jobs[0]["properties"], {"font_size": 14, "halign": "left"})
+
+    def test_slugify(self):
+        """Test that descriptions become safe file names."""
+        self.assertEqual(slugify("color=[1,1,0,1] (yellow)"), "color-1-1-0-1-yellow")
+
+
+class TestSettle(unittest.TestCase):
+    """Test waiting for a widget's layout to stop changing."""
+
+    def test_waits_for_late_height_changes(self):
+        """Test that a height change a few ticks later is still picked up."""
+        widget = Widget(size_hint_y=None, height=10)
+
+        def grow(*args):
+            """Change the height like a late layout pass."""
+            widget.height = 50
+
+        # Resolves two ticks after settling starts, like nested layout triggers
+        Clock.schedule_once(lambda dt: Clock.schedule_once(lambda dt: Clock.schedule_once(grow, 0), 0), 0)
+        settle(widget, 200)
+
+        self.assertEqual(widget.width, 200)
+        self.assertEqual(widget.height, 50)
+
+
+class TestRenderJob(unittest.TestCase):
+    """Test rendering a job in a worker."""
+
+    def test_rendered_widget_is_recycled(self):
+        """Test that the worker app gets every exported widget back."""
+        widget = Widget(size_hint_y=None, height=20)
+        app = mock.Mock()
+        app.create_variation.return_value = widget
+        job = {"kind": "variation", "file": "one.png", "section": "font_size",
+               "description": "font_size=12", "properties": {"font_size": 12}, "show_background": False}
+
+        with tempfile.TemporaryDirectory() as directory, mock.patch.object(snapshot_export, "_worker_app", app):
+            entry = render_job(job, directory, 100)
+            self.assertTrue((Path(directory) / "one.png").is_file())
+
+        app.recycle.assert_called_once_with(widget)
+        self.assertEqual((entry["width"], entry["height"]), (100, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Unit tests for startup profiling."""
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from startup_profile import ImportProfiler, StartupProfile
+
+# Imported by main.py only when their feature is enabled
+OPTIONAL_FEATURE_MODULES = ("async_parse", "memory_profile", "outline", "search_index", "style_controls")
+
+
+class TestImportProfiler(unittest.TestCase):
+    """Test per-module import timing."""
+
+    def setUp(self):
+        """Create two throwaway modules where one imports the other."""
+        self.tmpdir = tempfile.TemporaryDirectory()
+        root = Path(self.tmpdir.name)
+        (root / "profiled_outer.py").write_text("import profiled_inner\n", encoding="utf-8")
+        (root / "profiled_inner.py").write_text("import time\ntime.sleep(0.01)\n", encoding="utf-8")
+        sys.path.insert(0, self.tmpdir.name)
+        self.profiler = ImportProfiler()
+
+    def tearDown(self):
+        """Remove the profiler and the throwaway modules."""
+        self.profiler.uninstall()
+        sys.path.remove(self.tmpdir.name)
+        for name in ("profiled_outer", "profiled_inner"):
+            sys.modules.pop(name, None)
+        self.tmpdir.cleanup()
+
+    def test_records_cumulative_and_self_time(self):
+        """Test that nested import time counts toward the parent's cumulative time only."""
+        self.profiler.install()
+        import profiled_outer  # noqa: F401
+        self.profiler.uninstall()
+
+        outer_cumulative, outer_self = self.profiler.timings["profiled_outer"]
+        inner_cumulative, _ = self.profiler.timings["profiled_inner"]
+        self.assertGreaterEqual(inner_cumulative, 0.01)
+        self.assertGreaterEqual(outer_cumulative, inner_cumulative)
+        self.assertLess(outer_self, inner_cumulative, "Self time should exclude the nested import")
+        self.assertEqual(self.profiler.top(1)[0][0], "profiled_outer")
+
+    def test_report_lists_milestones_and_imports(self):
+        """Test that the printable report contains milestones and modules."""
+        self.profiler.install()
+        import profiled_outer  # noqa: F401
+        self.profiler.uninstall()
+
+        profile = StartupProfile(profiler=self.profiler)
+        profile.mark("first frame")
+        report = profile.report()
+        self.assertIn("first frame", report)
+        self.assertIn("profiled_inner", report)
+
+
+class TestStartupImports(unittest.TestCase):
+    """Test that optional features stay off the default startup path."""
+
+    def test_main_does_not_import_optional_features(self):
+        """Test that importing main leaves the optional feature modules unloaded."""
+        script = (
+            "import sys, main; "
+            f"print('loaded:', [name for name in {OPTIONAL_FEATURE_MODULES!r} if name in sys.modules])"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).parents[1],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        self.assertIn("loaded: []", result.stdout)
+
+
+if __name__ == '__main__':
+    unittest.main()
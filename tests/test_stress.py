@@ -0,0 +1,60 @@
+"""Unit tests for synthetic stress documents."""
+import unittest
+
+from markdown_blocks import split_blocks
+from stress import BLOCK_TYPES, generate_markdown, parse_mix, parse_size
+
+
+class TestGenerateMarkdown(unittest.TestCase):
+    """Test size, mix and reproducibility of generated documents."""
+
+    def test_reaches_requested_size(self):
+        """Test that the document is at least the requested size."""
+        for size in (1, 10_000, 200_000):
+            self.assertGreaterEqual(len(generate_markdown(size).encode("utf-8")), size)
+
+    def test_same_seed_same_text(self):
+        """Test that generation is reproducible."""
+        self.assertEqual(generate_markdown(20_000, seed=7), generate_markdown(20_000, seed=7))
+        self.assertNotEqual(generate_markdown(20_000, seed=7), generate_markdown(20_000, seed=8))
+
+    def test_mix_limits_block_types(self):
+        """Test that only weighted block types are generated."""
+        tables = generate_markdown(20_000, mix={"table": 1})
+        self.assertTrue(all(block.startswith("|") for block in split_blocks(tables)))
+
+        code = generate_markdown(20_000, mix={"code": 1})
+        self.assertTrue(all(block.startswith("```") for block in split_blocks(code)))
+
+    def test_lists_start_at_top_level(self):
+        """Test that generated lists are not mistaken for indented code."""
+        for block in split_blocks(generate_markdown(20_000, mix={"list": 1})):
+            self.assertTrue(block.startswith("- "), block[:40])
+
+
+class TestOptionParsing(unittest.TestCase):
+    """Test parsing of the --stress-size and --stress-mix values."""
+
+    def test_parse_size(self):
+        """Test sizes with and without units."""
+        self.assertEqual(parse_size("1000"), 1000)
+        self.assertEqual(parse_size("10KB"), 10_000)
+        self.assertEqual(parse_size("2.5mb"), 2_500_000)
+        with self.assertRaises(ValueError):
+            parse_size("ten")
+
+    def test_parse_mix(self):
+        """Test that unlisted types get weight 0 and bad input is rejected."""
+        mix = parse_mix("paragraph=4,table")
+        self.assertEqual(mix["paragraph"], 4)
+        self.assertEqual(mix["table"], 1)
+        self.assertEqual(set(mix), set(BLOCK_TYPES))
+        self.assertEqual(mix["code"], 0)
+        with self.assertRaises(ValueError):
+            parse_mix("images=1")
+        with self.assertRaises(ValueError):
+            parse_mix("paragraph=0")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""Unit tests for the live style controls."""
+import unittest
+from kivy.uix.label import Label
+
+from style_controls import COLOR_PRESETS, StyleBatcher, StyleControlPanel
+
+
+class TestStyleBatcher(unittest.TestCase):
+    """Test coalescing and ordering of restyles."""
+
+    def setUp(self):
+        """Create four labels of which the first two are visible."""
+        self.labels = [Label(text=f"label {i}") for i in range(4)]
+        self.batcher = StyleBatcher(lambda: self.labels, visible=lambda: self.labels[:2])
+
+    def test_changes_within_a_frame_are_applied_once(self):
+        """Test that repeated slider ticks collapse into the latest value."""
+        for size in (16, 18, 20, 22):
+            self.batcher.set("font_size", size)
+        self.assertEqual(self.labels[0].font_size, Label().font_size, "Nothing should apply before the flush")
+
+        self.batcher.flush()
+
+        self.assertEqual(self.batcher.flushes, 1)
+        self.assertEqual(self.labels[0].font_size, 22)
+
+    def test_style_only_changes_reach_every_label_in_the_flush(self):
+        """Test that color is applied to off-screen labels without queueing."""
+        self.batcher.set("color", [1, 1, 0, 1])
+        self.batcher.flush()
+
+        self.assertTrue(all(list(label.color) == [1, 1, 0, 1] for label in self.labels))
+        self.assertFalse(self.batcher.busy)
+
+    def test_layout_changes_restyle_visible_labels_first(self):
+        """Test that off-screen labels are restyled in later slices."""
+        self.batcher.set("line_height", 1.5)
+        self.batcher.flush()
+
+        self.assertEqual([label.line_height for label in self.labels[:2]], [1.5, 1.5])
+        self.assertEqual([label.line_height for label in self.labels[2:]], [1.0, 1.0])
+        self.assertTrue(self.batcher.busy)
+
+        self.batcher._restyle_slice()
+
+        self.assertEqual([label.line_height for label in self.labels[2:]], [1.5, 1.5])
+        self.assertFalse(self.batcher.busy)
+
+    def test_queued_labels_get_latest_values(self):
+        """Test that a change during a slow restyle is not lost for queued labels."""
+        self.batcher.set("line_height", 1.5)
+        self.batcher.flush()
+        self.batcher.set("font_size", 30)
+        self.batcher.flush()
+        self.batcher._restyle_slice()
+
+        self.assertEqual(self.labels[3].line_height, 1.5)
+        self.assertEqual(self.labels[3].font_size, 30)
+
+    def test_unchanged_values_are_not_set(self):
+        """Test that labels already showing a value are skipped."""
+        self.batcher.set("font_size", Label().font_size)
+        self.batcher.flush()
+        self.batcher._restyle_slice()
+
+        self.assertEqual(self.batcher.updates, 0)
+
+
+class TestStyleControlPanel(unittest.TestCase):
+    """Test that controls feed the batcher."""
+
+    def test_controls_request_changes(self):
+        """Test that slider and picker changes become pending overrides."""
+        batcher = StyleBatcher(lambda: [])
+        panel = StyleControlPanel(batcher)
+
+        panel.controls["font_size"].value = 24
+        panel.controls["color"].text = "cyan"
+        panel.controls["disabled"].state = "down"
+
+        self.assertEqual(
+            batcher.overrides,
+            {"font_size": 24, "color": COLOR_PRESETS["cyan"], "disabled": True},
+        )
+
+
+if __name__ == '__main__':
+    unittest.main()
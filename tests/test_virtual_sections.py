@@ -0,0 +1,82 @@
+"""Unit tests for viewport-virtualized sections."""
+import unittest
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.scrollview import ScrollView
+from kivy.uix.widget import Widget
+
+from virtual_sections import SectionPlaceholder, ViewportManager
+
+
+def make_section(height=100):
+    """Create a fixed-height stand-in section widget."""
+    return Widget(size_hint_y=None, height=height)
+
+
+class TestViewportManager(unittest.TestCase):
+    """Test materialization and release of placeholders."""
+
+    def setUp(self):
+        """Create a 300px viewport over 50 sections of 100px each."""
+        self.scroll_view = ScrollView(do_scroll_x=False, size=(400, 300), size_hint=(None, None))
+        self.container = BoxLayout(orientation='vertical', size_hint_y=None)
+        self.container.bind(minimum_height=self.container.setter('height'))
+        self.scroll_view.add_widget(self.container)
+        self.manager = ViewportManager(self.scroll_view, self.container, preload=0.5, release=1.0)
+        for index in range(50):
+            self.manager.add_section(f"section {index}", make_section, estimated_height=100)
+
+    def relayout(self):
+        """Lay out the container and update the manager."""
+        self.container.do_layout()
+        self.manager.update()
+        self.container.do_layout()
+
+    def test_only_sections_near_viewport_are_built(self):
+        """Test that sections far from the viewport stay placeholders."""
+        self.scroll_view.scroll_y = 1
+        self.relayout()
+
+        built = [p.section_title for p in self.manager.placeholders if p.is_materialized]
+        self.assertIn("section 0", built, "Top section should be built when scrolled to top")
+        self.assertNotIn("section 49", built, "Bottom section should not be built")
+        self.assertLessEqual(len(built), 6, "Only the viewport plus preload margin should be built")
+
+    def test_sections_are_released_when_scrolled_away(self):
+        """Test that built sections are released after scrolling far away."""
+        self.scroll_view.scroll_y = 1
+        self.relayout()
+        self.scroll_view.scroll_y = 0
+        self.relayout()
+
+        self.assertFalse(self.manager.placeholders[0].is_materialized)
+        self.assertTrue(self.manager.placeholders[-1].is_materialized)
+
+    def test_placeholder_keeps_measured_height_after_release(self):
+        """Test that releasing a section keeps its measured height."""
+        placeholder = SectionPlaceholder("tall", lambda: make_section(250), estimated_height=100)
+        placeholder.materialize()
+        self.assertEqual(placeholder.height, 250)
+
+        placeholder.release()
+        self.assertFalse(placeholder.is_materialized)
+        self.assertEqual(placeholder.height, 250, "Released placeholder should keep measured height")
+        self.assertEqual(placeholder.section_title, "tall")
+
+    def test_released_section_is_passed_to_release_hook(self):
+        """Test that on_release receives the detached section widget."""
+        released = []
+        placeholder = SectionPlaceholder("hooked", make_section, estimated_height=100, on_release=released.append)
+        section = placeholder.materialize()
+        placeholder.release()
+
+        self.assertEqual(released, [section])
+        self.assertIsNone(section.parent)
+
+    def test_release_must_not_be_below_preload(self):
+        """Test that an inverted hysteresis window is rejected."""
+        with self.assertRaises(ValueError):
+            ViewportManager(self.scroll_view, self.container, preload=2.0, release=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+"""Unit tests for snapshot comparison."""
+import tempfile
+import unittest
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from visual_diff import (
+    changed_regions,
+    compare_batch,
+    compare_images,
+    decode_png,
+    read_png,
+    record_baselines,
+    write_png,
+)
+
+
+def solid(height=40, width=60, color=(20, 40, 60, 255)):
+    """Return an RGBA image filled with ``color``."""
+    return np.tile(np.array(color, dtype=np.uint8), (height, width, 1))
+
+
+class TestPng(unittest.TestCase):
+    """Test the PNG readers and the zlib writer."""
+
+    def test_roundtrip(self):
+        """Test that written PNGs decode to the same pixels with either reader."""
+        image = np.random.default_rng(1).integers(0, 256, (17, 23, 4), dtype=np.uint8)
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "image.png"
+            write_png(path, image)
+            for reader in (read_png, decode_png):
+                with self.subTest(reader=reader.__name__):
+                    np.testing.assert_array_equal(reader(path), image)
+
+    def test_filtered_rows(self):
+        """Test decoding of Sub, Up, Average and Paeth filtered rows."""
+        image = np.random.default_rng(2).integers(0, 256, (4, 5, 3), dtype=np.uint8)
+        rows = image.reshape(4, -1).astype(np.int32)
+        filtered = []
+        for y, filter_type in enumerate((1, 2, 3, 4)):
+            row = rows[y]
+            up = rows[y - 1] if y else np.zeros_like(row)
+            left = np.concatenate([np.zeros(3, dtype=np.int32), row[:-3]])
+            upper_left = np.concatenate([np.zeros(3, dtype=np.int32), up[:-3]])
+            if filter_type == 1:
+                predictor = left
+            elif filter_type == 2:
+                predictor = up
+            elif filter_type == 3:
+                predictor = (left + up) // 2
+            else:
+                estimate = left + up - upper_left
+                pa, pb, pc = abs(estimate - left), abs(estimate - up), abs(estimate - upper_left)
+                predictor = np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, upper_left))
+            filtered.append(bytes([filter_type]) + ((row - predictor) % 256).astype(np.uint8).tobytes())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / "filtered.png"
+            write_png(path, image)
+            data = path.read_bytes()
+            # Replace the IDAT chunk of the unfiltered file with the filtered rows
+            header = data[:33]
+            body = zlib.compress(b"".join(filtered))
+            chunk = len(body).to_bytes(4, "big") + b"IDAT" + body + zlib.crc32(b"IDAT" + body).to_bytes(4, "big")
+            path.write_bytes(header + chunk + b"\x00\x00\x00\x00IEND\xaeB`\x82")
+            for reader in (read_png, decode_png):
+                with self.subTest(reader=reader.__name__):
+                    decoded = reader(path)
+                    np.testing.assert_array_equal(decoded[..., :3], image)
+                    self.assertTrue((decoded[..., 3] == 255).all())
+
+
+class TestCompareImages(unittest.TestCase):
+    """Test tolerance, thresholds and changed regions."""
+
+    def test_identical_and_tolerated(self):
+        """Test that differences within the tolerance are ignored."""
+        baseline = solid()
+        candidate = baseline.copy()
+        candidate[5, 5, 0] += 2
+        self.assertTrue(compare_images(baseline, candidate)["equal"])
+        self.assertFalse(compare_images(baseline, candidate, tolerance=0, threshold=0)["equal"])
+
+    def test_changed_region_bounding_box(self):
+        """Test that the changed region is reported with its bounding box."""
+        baseline = solid()
+        candidate = baseline.copy()
+        candidate[10:14, 30:41] = (255, 255, 255, 255)
+        result = compare_images(baseline, candidate)
+        self.assertFalse(result["equal"])
+        self.assertEqual(result["changed_pixels"], 4 * 11)
+        self.assertEqual(result["regions"], [(30, 10, 11, 4)])
+
+    def test_separate_regions(self):
+        """Test that distant changes produce separate boxes."""
+        mask = np.zeros((64, 64), dtype=bool)
+        mask[1, 1] = mask[60, 60] = True
+        self.assertEqual(sorted(changed_regions(mask)), [(1, 1, 1, 1), (60, 60, 1, 1)])
+
+    def test_size_mismatch(self):
+        """Test that images of different sizes are reported as such."""
+        result = compare_images(solid(height=40), solid(height=41))
+        self.assertEqual(result["reason"], "size")
+
+    def test_transparent_pixels_match(self):
+        """Test that color changes of fully transparent pixels are not perceptible."""
+        self.assertTrue(compare_images(solid(color=(0, 0, 0, 0)), solid(color=(255, 0, 0, 0)))["equal"])
+
+
+class TestBatch(unittest.TestCase):
+    """Test recording baselines and comparing directories."""
+
+    def test_record_and_compare(self):
+        """Test that changed snapshots are listed and get heatmaps."""
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            snapshots, baselines, candidates = root / "snapshots", root / "baselines", root / "candidates"
+            for path in (snapshots, candidates):
+                path.mkdir()
+            write_png(snapshots / "a.png", solid())
+            np.save(snapshots / "b.npy", solid())
+            self.assertEqual(record_baselines(snapshots, baselines), 2)
+
+            changed = solid()
+            changed[0:3, 0:3] = (255, 0, 0, 255)
+            np.save(candidates / "a.npy", solid())
+            np.save(candidates / "b.npy", changed)
+            report = compare_batch(baselines, candidates, heatmap_dir=root / "heatmaps")
+
+            self.assertEqual(report["compared"], 2)
+            self.assertEqual(report["changed"], ["b"])
+            self.assertTrue((root / "heatmaps" / "b.png").exists())
+            self.assertFalse((root / "heatmaps" / "a.png").exists())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+"""Unit tests for widget pooling."""
+import unittest
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.label import Label
+
+from widget_pool import WidgetPool
+
+
+def make_label(**properties):
+    """Create a label and count how often the factory ran."""
+    make_label.calls += 1
+    return Label(size_hint_y=None, **properties)
+
+
+class TestWidgetPool(unittest.TestCase):
+    """Test acquiring, releasing and resetting pooled widgets."""
+
+    def setUp(self):
+        """Create a pool whose "box" widgets are containers."""
+        make_label.calls = 0
+        self.pool = WidgetPool(container_kinds=["box"])
+
+    def test_released_widget_is_reused_with_new_properties(self):
+        """Test that a released widget is handed out again instead of created."""
+        label = self.pool.acquire("label", make_label, text="first")
+        self.pool.release(label)
+        reused = self.pool.acquire("label", make_label, text="second")
+
+        self.assertIs(reused, label)
+        self.assertEqual(reused.text, "second")
+        self.assertEqual(make_label.calls, 1)
+        self.assertEqual(self.pool.stats()["reused"], 1)
+
+    def test_properties_not_set_again_are_reset_to_defaults(self):
+        """Test that a reused widget does not keep a previous caller's style."""
+        label = self.pool.acquire("label", make_label, text="big", font_size=40, color=[1, 0, 0, 1])
+        self.pool.release(label)
+        reused = self.pool.acquire("label", make_label, text="plain")
+
+        fresh = Label()
+        self.assertEqual(reused.font_size, fresh.font_size)
+        self.assertEqual(list(reused.color), list(fresh.color))
+        self.assertIsNone(reused.size_hint_y, "Constant options from the factory should be kept")
+
+    def test_kinds_are_pooled_separately(self):
+        """Test that a widget is only reused for its own kind."""
+        self.pool.release(self.pool.acquire("label", make_label, text="a"))
+        other = self.pool.acquire("header", make_label, text="b")
+
+        self.assertEqual(make_label.calls, 2)
+        self.assertEqual(len(self.pool), 1)
+        self.assertIsNot(other, None)
+
+    def test_release_recycles_nested_widgets(self):
+        """Test that releasing a container returns its pooled children detached."""
+        root = BoxLayout()
+        container = self.pool.acquire("box", BoxLayout)
+        child = self.pool.acquire("label", make_label, text="child")
+        container.add_widget(child)
+        root.add_widget(container)
+
+        self.pool.release(container)
+
+        self.assertIsNone(container.parent)
+        self.assertIsNone(child.parent)
+        self.assertEqual(container.children, [])
+        self.assertIs(self.pool.acquire("label", make_label, text="again"), child)
+        self.assertIs(self.pool.acquire("box", BoxLayout), container)
+
+    def test_release_keeps_children_of_non_container_kinds(self):
+        """Test that a pooled leaf widget keeps the children it built itself."""
+        def make_composite(**properties):
+            """Build a layout that adds its own child."""
+            composite = BoxLayout(**properties)
+            composite.add_widget(Label(text="internal"))
+            return composite
+
+        composite = self.pool.acquire("composite", make_composite)
+        self.pool.release(composite)
+
+        self.assertEqual(len(composite.children), 1)
+
+    def test_unpooled_widgets_are_not_kept(self):
+        """Test that widgets not created by the pool are detached but not kept."""
+        container = self.pool.acquire("box", BoxLayout)
+        stranger = Label()
+        container.add_widget(stranger)
+
+        self.pool.release(container)
+
+        self.assertEqual(len(self.pool), 1)
+        self.assertIsNone(stranger.parent)
+
+    def test_pool_size_is_capped_per_kind(self):
+        """Test that releases beyond max_per_kind are dropped."""
+        pool = WidgetPool(max_per_kind=2)
+        labels = [pool.acquire("label", make_label, text=str(i)) for i in range(3)]
+        for label in labels:
+            pool.release(label)
+
+        self.assertEqual(len(pool), 2)
+
+    def test_dropped_widgets_are_reported(self):
+        """Test that on_drop receives the widgets beyond max_per_kind."""
+        dropped = []
+        pool = WidgetPool(max_per_kind=1, on_drop=dropped.append)
+        labels = [pool.acquire("label", make_label, text=str(i)) for i in range(2)]
+        for label in labels:
+            pool.release(label)
+
+        self.assertEqual(dropped, [labels[1]])
+        self.assertTrue(pool.is_pooled(labels[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+"""Viewport virtualization for the demo's section list.
+
+In virtualized mode every section in the main ``BoxLayout`` starts out as a
+``SectionPlaceholder``: an empty, fixed-height box that reserves the
+section's space in the scrollable content. ``ViewportManager`` watches the
+``ScrollView`` and builds a placeholder's section only once it comes within
+``preload`` viewport heights of the visible area, then releases it again when
+it drifts more than ``release`` viewport heights away. Released placeholders
+keep the last measured height so the scroll extent does not jump.
+
+First paint and memory therefore depend on the viewport size, not on the
+number of sections.
+"""
+
+from kivy.clock import Clock
+from kivy.uix.boxlayout import BoxLayout
+
+
+class SectionPlaceholder(BoxLayout):
+    """Height-reserving stand-in that hosts a section while it is built."""
+
+    def __init__(self, title, factory, estimated_height, on_release=None, **kwargs):
+        """Create an empty placeholder.
+
+        Args:
+            title: Section title, exposed as ``section_title`` like real sections
+            factory: Callable returning the section widget when materialized
+            estimated_height: Height reserved until the section is measured
+            on_release: Optional callable receiving the section widget after
+                it was released (e.g. to recycle its widgets)
+        """
+        kwargs.setdefault('orientation', 'vertical')
+        super().__init__(size_hint_y=None, height=estimated_height, **kwargs)
+        self.section_title = title
+        self.factory = factory
+        self.on_release = on_release
+        self.section = None
+
+    @property
+    def is_materialized(self):
+        """True while the real section widget is attached."""
+        return self.section is not None
+
+    def materialize(self):
+        """Build the section and let the placeholder follow its height."""
+        if self.section is not None:
+            return self.section
+        section = self.factory()
+        self.section = section
+        self.add_widget(section)
+        self.height = section.height
+        section.bind(height=self._on_section_height)
+        return section
+
+    def release(self):
+        """Drop the section, keeping its last height as the reserved space."""
+        section = self.section
+        if section is None:
+            return
+        section.unbind(height=self._on_section_height)
+        self.remove_widget(section)
+        self.section = None
+        if self.on_release is not None:
+            self.on_release(section)
+
+    def _on_section_height(self, instance, value):
+        """Mirror the section's height so the main layout reflows."""
+        self.height = value
+
+
+class ViewportManager:
+    """Materialize placeholders near the viewport and release distant ones."""
+
+    def __init__(self, scroll_view, container, preload=1.0, release=3.0, on_release=None):
+        """Attach to a ScrollView and the vertical layout it scrolls.
+
+        Args:
+            scroll_view: The ScrollView showing ``container``
+            container: Vertical layout holding the placeholders
+            preload: Build sections within this many viewport heights
+            release: Release sections beyond this many viewport heights
+            on_release: Optional callable receiving every released section widget
+        """
+        if release < preload:
+            raise ValueError("release distance must not be smaller than preload distance")
+        self.scroll_view = scroll_view
+        self.container = container
+        self.preload = preload
+        self.release = release
+        self.on_release = on_release
+        self.placeholders = []
+        self._trigger = Clock.create_trigger(self.update)
+        scroll_view.bind(scroll_y=self._trigger, height=self._trigger)
+        container.bind(height=self._trigger)
+        self._trigger()
+
+    def add_section(self, title, factory, estimated_height):
+        """Append a placeholder for a lazily built section.
+
+        Args:
+            title: Section title
+            factory: Callable returning the section widget
+            estimated_height: Reserved height before the section is measured
+
+        Returns:
+            The SectionPlaceholder added to the container
+        """
+        placeholder = SectionPlaceholder(title, factory, estimated_height, on_release=self.on_release)
+        self.placeholders.append(placeholder)
+        self.container.add_widget(placeholder)
+        self._trigger()
+        return placeholder
+
+    def detach(self):
+        """Stop following the ScrollView (before its placeholders are discarded)."""
+        self._trigger.cancel()
+        self.scroll_view.unbind(scroll_y=self._trigger, height=self._trigger)
+        self.container.unbind(height=self._trigger)
+
+    def viewport_range(self):
+        """Return the visible (bottom, top) span in container coordinates."""
+        content_height = self.container.height
+        view_height = self.scroll_view.height
+        scrollable = max(content_height - view_height, 0)
+        bottom = self.scroll_view.scroll_y * scrollable
+        return bottom, bottom + view_height
+
+    def update(self, *args):
+        """Materialize or release placeholders for the current scroll position."""
+        view_height = max(self.scroll_view.height, 1)
+        bottom, top = self.viewport_range()
+        near = self.preload * view_height
+        far = self.release * view_height
+        origin = self.container.y
+
+        for placeholder in self.placeholders:
+            low = placeholder.y - origin
+            high = low + placeholder.height
+            if high < bottom:
+                distance = bottom - high
+            elif low > top:
+                distance = low - top
+            else:
+                distance = 0
+
+            if distance <= near:
+                placeholder.materialize()
+            elif distance > far:
+                placeholder.release()
+
+    def materialized_count(self):
+        """Return how many sections are currently built."""
+        return sum(1 for placeholder in self.placeholders if placeholder.is_materialized)
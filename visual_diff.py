@@ -0,0 +1,459 @@
+"""Vectorized comparison of rendered variation snapshots.
+
+Usage (after activating the venv):
+    python3 snapshot_export.py --raw -o snapshots
+    python3 visual_diff.py record snapshots baselines
+    python3 snapshot_export.py --raw -o candidate      # e.g. with another markdownlabel
+    python3 visual_diff.py compare baselines candidate --heatmaps diffs -o diff.json
+
+``compare_images`` treats two RGBA snapshots as NumPy arrays. A pixel counts
+as changed when any channel differs by more than the per-channel tolerance
+and its perceptual (luma-weighted) difference reaches the threshold. The
+result lists the bounding boxes of the changed regions, and ``heatmap``
+paints the differences in red over a dimmed copy of the baseline.
+
+Baselines are stored as ``.npy`` files and memory-mapped when loaded, so a
+batch over thousands of snapshots only reads the pages it compares. PNG files
+are decoded by Kivy's image providers (native code) when Kivy is available,
+otherwise by a NumPy decoder whose Average and Paeth filters run per byte in
+Python; ``.npy`` snapshots (``snapshot_export.py --raw``) skip decoding
+entirely.
+"""
+
+import argparse
+import json
+import os
+import struct
+import sys
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+CHANNELS_BY_COLOR_TYPE = {0: 1, 2: 3, 4: 2, 6: 4}
+# Channel order of Kivy image data formats as gray(+alpha) or RGB(A)
+CHANNELS_BY_KIVY_FORMAT = {
+    "rgba": [0, 1, 2, 3],
+    "rgb": [0, 1, 2],
+    "bgra": [2, 1, 0, 3],
+    "bgr": [2, 1, 0],
+    "luminance": [0],
+    "luminance_alpha": [0, 1],
+}
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+DEFAULT_TOLERANCE = 2  # per channel, 0-255
+DEFAULT_THRESHOLD = 0.02  # perceptual difference, 0-1
+TILE_SIZE = 16  # granularity of changed-region bounding boxes
+
+
+def _unfilter_row(filter_type, row, previous, bpp):
+    """Undo the PNG filter of one scanline (all arithmetic modulo 256)."""
+    if filter_type == 0:
+        return row
+    if filter_type == 1:
+        # Sub: running sum of the previous pixel's bytes, per channel
+        return np.cumsum(row.reshape(-1, bpp), axis=0, dtype=np.uint8).reshape(-1)
+    if filter_type == 2:
+        return row + previous
+    # Average and Paeth depend on the reconstructed left pixel and decode
+    # sequentially; .npy snapshots avoid this path
+    out = bytearray(row.tobytes())
+    up = previous.tobytes()
+    for i in range(len(out)):
+        left = out[i - bpp] if i >= bpp else 0
+        if filter_type == 3:
+            out[i] = (out[i] + ((left + up[i]) >> 1)) & 0xFF
+        elif filter_type == 4:
+            upper_left = up[i - bpp] if i >= bpp else 0
+            estimate = left + up[i] - upper_left
+            pa, pb, pc = abs(estimate - left), abs(estimate - up[i]), abs(estimate - upper_left)
+            if pa <= pb and pa <= pc:
+                predictor = left
+            elif pb <= pc:
+                predictor = up[i]
+            else:
+                predictor = upper_left
+            out[i] = (out[i] + predictor) & 0xFF
+        else:
+            raise ValueError(f"Unknown PNG filter type {filter_type}")
+    return np.frombuffer(bytes(out), dtype=np.uint8)
+
+
+_image_loader = None
+
+
+def kivy_image_loader():
+    """Return Kivy's ImageLoader, or None if Kivy is not installed."""
+    global _image_loader
+    if _image_loader is None:
+        # Our own command line must not be parsed by Kivy
+        os.environ.setdefault("KIVY_NO_ARGS", "1")
+        try:
+            from kivy.core.image import ImageLoader
+        except ImportError:
+            ImageLoader = False
+        _image_loader = ImageLoader
+    return _image_loader or None
+
+
+def load_png_with_kivy(path):
+    """Decode a PNG with Kivy's image providers into an RGBA uint8 array.
+
+    Returns:
+        Array of shape (height, width, 4), top row first, or None if Kivy is
+        not installed or could not decode the file
+    """
+    loader = kivy_image_loader()
+    if loader is None:
+        return None
+    try:
+        # Providers raise plain Exceptions for files they cannot read
+        image = loader.load(str(path), keep_data=True, nocache=True)
+    except Exception:
+        return None
+    # Loaders keep the decoded ImageData here (keep_data=True); there is no public accessor
+    data = image._data[0]
+    order = CHANNELS_BY_KIVY_FORMAT.get(data.fmt)
+    if order is None or isinstance(data.data, str):
+        return None
+    channels = len(order)
+    # Rows may be padded (ImageData.rowlength)
+    rows = np.frombuffer(data.data, dtype=np.uint8).reshape(data.height, -1)
+    pixels = rows[:, :data.width * channels].reshape(data.height, data.width, channels)[..., order]
+    if not data.flip_vertical:
+        # Bottom row first
+        pixels = pixels[::-1]
+    return to_rgba(np.ascontiguousarray(pixels))
+
+
+def read_png(path):
+    """Decode a PNG into an RGBA uint8 array, top row first.
+
+    Kivy's image providers are used when available; otherwise the file is
+    decoded with ``decode_png``.
+    """
+    pixels = load_png_with_kivy(path)
+    return pixels if pixels is not None else decode_png(path)
+
+
+def decode_png(path):
+    """Decode an 8-bit, non-interlaced PNG into an RGBA uint8 array with NumPy.
+
+    Args:
+        path: PNG file
+
+    Returns:
+        Array of shape (height, width, 4), top row first
+
+    Raises:
+        ValueError: For files that are not PNGs or use unsupported features
+    """
+    data = Path(path).read_bytes()
+    if not data.startswith(PNG_SIGNATURE):
+        raise ValueError(f"{path} is not a PNG file")
+    offset = len(PNG_SIGNATURE)
+    compressed = []
+    width = height = channels = None
+    while offset < len(data):
+        length, chunk_type = struct.unpack(">I4s", data[offset:offset + 8])
+        body = data[offset + 8:offset + 8 + length]
+        offset += 12 + length
+        if chunk_type == b"IHDR":
+            width, height, depth, color_type, _, _, interlace = struct.unpack(">IIBBBBB", body)
+            if depth != 8 or interlace or color_type not in CHANNELS_BY_COLOR_TYPE:
+                raise ValueError(f"{path}: only 8-bit non-interlaced gray/RGB(A) PNGs are supported")
+            channels = CHANNELS_BY_COLOR_TYPE[color_type]
+        elif chunk_type == b"IDAT":
+            compressed.append(body)
+        elif chunk_type == b"IEND":
+            break
+    if channels is None:
+        raise ValueError(f"{path} has no IHDR chunk")
+
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(compressed)), dtype=np.uint8)
+    raw = raw.reshape(height, stride + 1)
+    pixels = np.empty((height, stride), dtype=np.uint8)
+    previous = np.zeros(stride, dtype=np.uint8)
+    for y in range(height):
+        previous = pixels[y] = _unfilter_row(raw[y, 0], raw[y, 1:], previous, channels)
+    return to_rgba(pixels.reshape(height, width, channels))
+
+
+def write_png(path, image):
+    """Encode an (height, width, 3 or 4) uint8 array as PNG."""
+    image = np.ascontiguousarray(image, dtype=np.uint8)
+    height, width, channels = image.shape
+    color_type = {3: 2, 4: 6}[channels]
+    # Filter type 0 on every row
+    rows = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    rows[:, 1:] = image.reshape(height, -1)
+
+    def chunk(chunk_type, body):
+        """Return a PNG chunk: length, type, body and CRC."""
+        return struct.pack(">I", len(body)) + chunk_type + body + struct.pack(">I", zlib.crc32(chunk_type + body))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    Path(path).write_bytes(
+        PNG_SIGNATURE + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(rows.tobytes(), 6)) + chunk(b"IEND", b"")
+    )
+
+
+def to_rgba(image):
+    """Return ``image`` (gray, gray+alpha, RGB or RGBA) as RGBA."""
+    channels = image.shape[2]
+    if channels == 4:
+        return image
+    alpha = np.full(image.shape[:2] + (1,), 255, dtype=np.uint8)
+    if channels == 3:
+        return np.concatenate([image, alpha], axis=2)
+    gray = image[..., :1]
+    if channels == 2:
+        alpha = image[..., 1:]
+    return np.concatenate([gray, gray, gray, alpha], axis=2)
+
+
+def load_image(path, mmap=True):
+    """Load a ``.npy`` (memory-mapped by default) or PNG snapshot as RGBA."""
+    path = Path(path)
+    if path.suffix == ".npy":
+        return np.load(path, mmap_mode="r" if mmap else None)
+    return read_png(path)
+
+
+def perceptual_difference(baseline, candidate):
+    """Return the per-pixel perceptual difference (0-1) of two RGBA arrays.
+
+    The luma-weighted RGB difference is combined with the alpha difference.
+    """
+    a = baseline.astype(np.float32) / 255
+    b = candidate.astype(np.float32) / 255
+    # Compare premultiplied colors so fully transparent pixels match
+    luma = np.abs((a[..., :3] * a[..., 3:] - b[..., :3] * b[..., 3:]) @ LUMA_WEIGHTS)
+    return np.maximum(luma, np.abs(a[..., 3] - b[..., 3]))
+
+
+def changed_regions(mask, tile=TILE_SIZE):
+    """Return bounding boxes (x, y, width, height) of changed regions.
+
+    Changed pixels are grouped into tiles and touching tiles are merged, so
+    the boxes are accurate to ``tile`` pixels.
+    """
+    height, width = mask.shape
+    rows, cols = -(-height // tile), -(-width // tile)
+    padded = np.zeros((rows * tile, cols * tile), dtype=bool)
+    padded[:height, :width] = mask
+    tiles = padded.reshape(rows, tile, cols, tile).any(axis=(1, 3))
+
+    boxes = []
+    seen = np.zeros_like(tiles)
+    for start in zip(*np.nonzero(tiles)):
+        if seen[start]:
+            continue
+        seen[start] = True
+        stack = [start]
+        top, left, bottom, right = start[0], start[1], start[0], start[1]
+        while stack:
+            row, col = stack.pop()
+            top, bottom = min(top, row), max(bottom, row)
+            left, right = min(left, col), max(right, col)
+            for next_row, next_col in ((row - 1, col), (row + 1, col), (row, col - 1), (row, col + 1)):
+                if 0 <= next_row < rows and 0 <= next_col < cols and tiles[next_row, next_col] and not seen[next_row, next_col]:
+                    seen[next_row, next_col] = True
+                    stack.append((next_row, next_col))
+        # Shrink the tile box to the changed pixels inside it
+        region = mask[top * tile:(bottom + 1) * tile, left * tile:(right + 1) * tile]
+        ys, xs = np.nonzero(region)
+        boxes.append((
+            int(left * tile + xs.min()),
+            int(top * tile + ys.min()),
+            int(xs.max() - xs.min() + 1),
+            int(ys.max() - ys.min() + 1),
+        ))
+    return boxes
+
+
+def compare_images(baseline, candidate, tolerance=DEFAULT_TOLERANCE, threshold=DEFAULT_THRESHOLD):
+    """Compare two RGBA snapshots.
+
+    Args:
+        baseline: Expected image, (height, width, 4) uint8
+        candidate: Rendered image of the same shape
+        tolerance: Allowed difference per channel; an int or four values for R, G, B, A
+        threshold: Minimum perceptual difference (0-1) of a changed pixel
+
+    Returns:
+        Dict with ``equal``, ``changed_pixels``, ``changed_ratio``,
+        ``max_difference`` and ``regions``; images of different sizes are
+        reported with ``reason`` "size"
+    """
+    if baseline.shape != candidate.shape:
+        return {
+            "equal": False,
+            "reason": "size",
+            "baseline_size": list(baseline.shape[:2]),
+            "candidate_size": list(candidate.shape[:2]),
+        }
+    if np.array_equal(baseline, candidate):
+        # Most snapshots are unchanged; skip the widened arrays for them
+        return {"equal": True, "changed_pixels": 0, "changed_ratio": 0.0, "max_difference": 0.0, "regions": []}
+    tolerance = np.broadcast_to(np.asarray(tolerance, dtype=np.int16), (4,))
+    delta = np.abs(baseline.astype(np.int16) - candidate.astype(np.int16))
+    mask = (delta > tolerance).any(axis=2)
+    if mask.any():
+        difference = perceptual_difference(baseline, candidate)
+        mask &= difference >= threshold
+        max_difference = float(difference.max())
+    else:
+        max_difference = 0.0
+    changed = int(mask.sum())
+    return {
+        "equal": changed == 0,
+        "changed_pixels": changed,
+        "changed_ratio": changed / mask.size if mask.size else 0.0,
+        "max_difference": max_difference,
+        "regions": changed_regions(mask) if changed else [],
+    }
+
+
+def heatmap(baseline, candidate):
+    """Return an RGB image highlighting differences in red over the dimmed baseline."""
+    difference = perceptual_difference(baseline, candidate)
+    gray = (baseline[..., :3].astype(np.float32) @ LUMA_WEIGHTS) * 0.3
+    image = np.repeat(gray[..., None], 3, axis=2)
+    image[..., 0] = np.maximum(image[..., 0], np.sqrt(difference) * 255)
+    return image.clip(0, 255).astype(np.uint8)
+
+
+def snapshot_files(directory):
+    """Return {name: path} of the ``.npy`` and PNG snapshots in ``directory``.
+
+    ``.npy`` files win over PNGs with the same name.
+    """
+    files = {}
+    for path in sorted(Path(directory).glob("*.png")) + sorted(Path(directory).glob("*.npy")):
+        files[path.stem] = path
+    return files
+
+
+def record_baselines(snapshot_dir, baseline_dir):
+    """Store every snapshot in ``snapshot_dir`` as a ``.npy`` baseline.
+
+    Returns:
+        Number of baselines written
+    """
+    baseline_dir = Path(baseline_dir)
+    baseline_dir.mkdir(parents=True, exist_ok=True)
+    files = snapshot_files(snapshot_dir)
+    for name, path in files.items():
+        np.save(baseline_dir / f"{name}.npy", load_image(path, mmap=False))
+    return len(files)
+
+
+def compare_batch(
+    baseline_dir,
+    candidate_dir,
+    tolerance=DEFAULT_TOLERANCE,
+    threshold=DEFAULT_THRESHOLD,
+    heatmap_dir=None,
+    workers=None,
+):
+    """Compare every candidate snapshot with the baseline of the same name.
+
+    NumPy releases the GIL for the heavy array operations, so the images
+    are compared on a thread pool.
+
+    Args:
+        baseline_dir: Directory of ``.npy`` (or PNG) baselines
+        candidate_dir: Directory of ``.npy`` or PNG snapshots
+        tolerance: Allowed difference per channel
+        threshold: Minimum perceptual difference of a changed pixel
+        heatmap_dir: If given, a heatmap PNG is written for every changed image
+        workers: Number of comparison threads (None lets the executor decide)
+
+    Returns:
+        Dict with per-image results, names missing on either side and counts
+    """
+    baselines = snapshot_files(baseline_dir)
+    candidates = snapshot_files(candidate_dir)
+    names = sorted(set(baselines) & set(candidates))
+    if heatmap_dir is not None:
+        Path(heatmap_dir).mkdir(parents=True, exist_ok=True)
+
+    def compare_one(name):
+        """Compare the snapshots called ``name``, writing a heatmap if they differ."""
+        baseline = load_image(baselines[name])
+        candidate = load_image(candidates[name])
+        result = compare_images(baseline, candidate, tolerance, threshold)
+        if heatmap_dir is not None and not result["equal"] and result.get("reason") != "size":
+            write_png(Path(heatmap_dir) / f"{name}.png", heatmap(baseline, candidate))
+        return result
+
+    # Import Kivy's image providers here rather than concurrently in the workers
+    kivy_image_loader()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = dict(zip(names, pool.map(compare_one, names)))
+    return {
+        "compared": len(names),
+        "changed": sorted(name for name, result in results.items() if not result["equal"]),
+        "missing_candidates": sorted(set(baselines) - set(candidates)),
+        "missing_baselines": sorted(set(candidates) - set(baselines)),
+        "results": results,
+    }
+
+
+def parse_args(argv=None):
+    """Parse the record/compare command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="Store snapshots as .npy baselines")
+    record.add_argument("snapshots", help="Directory of exported snapshots")
+    record.add_argument("baselines", help="Baseline directory")
+
+    compare = commands.add_parser("compare", help="Compare snapshots with baselines")
+    compare.add_argument("baselines", help="Baseline directory")
+    compare.add_argument("snapshots", help="Directory of exported snapshots")
+    compare.add_argument(
+        "--tolerance",
+        type=lambda value: [int(part) for part in value.split(",")],
+        default=[DEFAULT_TOLERANCE],
+        help="Allowed difference per channel, one value or R,G,B,A",
+    )
+    compare.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="Perceptual threshold (0-1)")
+    compare.add_argument("--heatmaps", help="Write heatmaps of changed snapshots to this directory")
+    compare.add_argument("--workers", type=int, help="Comparison threads")
+    compare.add_argument("--output", "-o", default="-", help="JSON report path, '-' for stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    """Record baselines or compare snapshots; return the exit status."""
+    args = parse_args(argv)
+    if args.command == "record":
+        count = record_baselines(args.snapshots, args.baselines)
+        print(f"Recorded {count} baselines in {args.baselines}")
+        return 0
+
+    tolerance = args.tolerance[0] if len(args.tolerance) == 1 else args.tolerance
+    report = compare_batch(
+        args.baselines,
+        args.snapshots,
+        tolerance=tolerance,
+        threshold=args.threshold,
+        heatmap_dir=args.heatmaps,
+        workers=args.workers,
+    )
+    output = json.dumps(report, indent=2)
+    if args.output == "-":
+        print(output)
+    else:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    return 1 if report["changed"] or report["missing_candidates"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
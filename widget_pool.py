@@ -0,0 +1,112 @@
+"""Recycling of demo widgets.
+
+Sections are built from a handful of widget kinds (section layouts,
+headers, variation layouts, description labels and MarkdownLabels), each
+always created with the same constant options and bindings. ``WidgetPool``
+keeps widgets that left the tree per kind and hands them out again, so
+rebuilding a view only sets the properties that differ (text, style
+properties) instead of constructing widgets and binding them again.
+
+Properties set through ``acquire`` are remembered per widget; when the
+widget is reused, the ones the new caller does not set go back to their
+class default, so a recycled label never keeps a previous variation's style.
+Widgets of container kinds lose the children callers added to them when
+they are released; other pooled widgets (labels) keep their own children.
+"""
+
+from collections import defaultdict
+
+DEFAULT_MAX_PER_KIND = 256
+
+
+class WidgetPool:
+    """Free lists of released widgets, keyed by kind."""
+
+    def __init__(self, container_kinds=(), max_per_kind=DEFAULT_MAX_PER_KIND, on_drop=None):
+        """Create an empty pool.
+
+        Args:
+            container_kinds: Kinds whose children are added by callers and
+                are detached (and recycled) on release
+            max_per_kind: Released widgets kept per kind; further ones are dropped
+            on_drop: Optional callable receiving each released widget that is
+                dropped because its kind's free list is full
+        """
+        self.container_kinds = frozenset(container_kinds)
+        self.max_per_kind = max_per_kind
+        self.on_drop = on_drop
+        self.created = 0
+        self.reused = 0
+        self.released = 0
+        self._free = defaultdict(list)
+
+    def acquire(self, kind, create, **properties):
+        """Return a widget of ``kind`` showing ``properties``.
+
+        Args:
+            kind: Pool key; widgets of one kind must be built by the same ``create``
+            create: Callable building (and binding) a new widget from ``properties``
+            **properties: Properties that differ between uses of the kind
+
+        Returns:
+            A recycled widget with ``properties`` applied, or a new one
+        """
+        free = self._free.get(kind)
+        if free:
+            widget = free.pop()
+            for name in widget._pool_properties.difference(properties):
+                setattr(widget, name, widget.property(name).defaultvalue)
+            for name, value in properties.items():
+                setattr(widget, name, value)
+            self.reused += 1
+        else:
+            widget = create(**properties)
+            widget._pool_kind = kind
+            self.created += 1
+        widget._pool_properties = set(properties)
+        return widget
+
+    @staticmethod
+    def is_pooled(widget):
+        """Return True if ``widget`` was created by a pool."""
+        return hasattr(widget, '_pool_kind')
+
+    def release(self, widget):
+        """Return ``widget`` and every pooled widget below it to the pool.
+
+        Pooled widgets are detached from their parents. Widgets that were
+        not created by the pool (slots, shared views) are searched for pooled
+        children but otherwise left to the garbage collector.
+        """
+        if widget.parent is not None:
+            widget.parent.remove_widget(widget)
+        self._collect(widget)
+
+    def _collect(self, widget):
+        """Detach and keep the pooled widgets of a detached subtree."""
+        kind = getattr(widget, '_pool_kind', None)
+        if kind is None or kind in self.container_kinds:
+            for child in list(widget.children):
+                if kind is not None or self.is_pooled(child):
+                    widget.remove_widget(child)
+                self._collect(child)
+        if kind is not None:
+            free = self._free[kind]
+            if len(free) < self.max_per_kind:
+                free.append(widget)
+                self.released += 1
+            elif self.on_drop is not None:
+                self.on_drop(widget)
+
+    def __len__(self):
+        """Return the number of widgets waiting in the pool."""
+        return sum(len(free) for free in self._free.values())
+
+    def stats(self):
+        """Return counters of created, reused and released widgets."""
+        return {
+            "created": self.created,
+            "reused": self.reused,
+            "released": self.released,
+            "available": len(self),
+        }